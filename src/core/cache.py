@@ -0,0 +1,54 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+class TranslationCache:
+    """Thread-safe in-memory translation memory with least-recently-used eviction.
+
+    Keys cover everything that changes the output: model, languages, field,
+    prompt template and source text, so switching any of them never serves a
+    stale entry.
+    """
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, current_lang: str, target_lang: str, field: str,
+                 prompt_template: str, text: str) -> str:
+        raw = "\x1f".join((model, current_lang, target_lang, field or "", prompt_template, text))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def prefetch(self, keys):
+        """Load entries for the given keys ahead of use; only shared caches need to."""
+
+    def flush(self):
+        """Deliver buffered writes; only shared caches buffer any."""
+
+    def __contains__(self, key: str) -> bool:
+        """Check for an entry without counting a hit or miss or refreshing it."""
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
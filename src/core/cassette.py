@@ -0,0 +1,140 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import logging
+from collections import defaultdict, deque
+from pathlib import Path
+from types import SimpleNamespace
+
+logger = logging.getLogger(__name__)
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+REDACTED = "[REDACTED]"
+# API keys and bearer tokens that might end up in messages or error texts
+SECRET_PATTERN = re.compile(r"sk-[A-Za-z0-9_\-]{8,}|Bearer\s+[A-Za-z0-9_\-\.]+")
+
+class CassetteMiss(Exception):
+    """Raised on replay when a request was never recorded (or all its recordings were used)."""
+
+class ReplayedAPIError(Exception):
+    """An API error that was recorded and is raised again on replay."""
+    def __init__(self, error_type: str, message: str):
+        super().__init__(f"{error_type}: {message}")
+        self.error_type = error_type
+
+def request_key(model: str, messages: list) -> str:
+    raw = json.dumps({'model': model, 'messages': messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class RecordingClient:
+    """Passes requests to a real client and appends each interaction to a cassette file.
+
+    The cassette is JSON lines: the request, the response text and token usage
+    (or the error), and the latency. Secrets are redacted before anything is
+    written. The client mimics client.chat.completions.
+    """
+    def __init__(self, client, path, secrets=()):
+        self.client = client
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.secrets = [secret for secret in secrets if secret]
+        self.chat = SimpleNamespace(completions=self)
+        self._lock = threading.Lock()
+
+    def _redact(self, text):
+        if not isinstance(text, str):
+            return text
+        for secret in self.secrets:
+            text = text.replace(secret, REDACTED)
+        return SECRET_PATTERN.sub(REDACTED, text)
+
+    def create(self, model, messages, **kwargs):
+        start = time.monotonic()
+        interaction = {
+            'key': request_key(model, messages),
+            'request': {
+                'model': model,
+                'messages': [dict(message, content=self._redact(message['content'])) for message in messages]
+            },
+            'recorded_at': time.time()
+        }
+        try:
+            response = self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+        except Exception as e:
+            interaction['latency'] = time.monotonic() - start
+            interaction['error'] = {'type': type(e).__name__, 'message': self._redact(str(e))}
+            self._append(interaction)
+            raise
+        interaction['latency'] = time.monotonic() - start
+        usage = getattr(response, 'usage', None)
+        interaction['response'] = {
+            'content': self._redact(response.choices[0].message.content),
+            'prompt_tokens': getattr(usage, 'prompt_tokens', 0) or 0,
+            'completion_tokens': getattr(usage, 'completion_tokens', 0) or 0,
+            'cached_tokens': getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', 0) or 0
+        }
+        self._append(interaction)
+        return response
+
+    def _append(self, interaction: dict):
+        line = json.dumps(interaction, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+class ReplayClient:
+    """Answers requests from a recorded cassette, without any network access.
+
+    Requests are matched on model and messages. Repeated identical requests get
+    their recordings in the order they were made, so retry paths replay the
+    same way. With a latency_scale above 0, each answer is delayed by its
+    recorded latency times the scale, so timings can be compared across runs.
+    """
+    def __init__(self, path, latency_scale: float = 0.0):
+        self.path = Path(path)
+        self.latency_scale = latency_scale
+        self.chat = SimpleNamespace(completions=self)
+        self._lock = threading.Lock()
+        self._interactions = defaultdict(deque)
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    interaction = json.loads(line)
+                    self._interactions[interaction['key']].append(interaction)
+
+    def create(self, model, messages, **kwargs):
+        key = request_key(model, messages)
+        with self._lock:
+            recordings = self._interactions.get(key)
+            if not recordings:
+                raise CassetteMiss(f"No recorded response for a {model} request in {self.path.name}")
+            interaction = recordings.popleft() if len(recordings) > 1 else recordings[0]
+        if self.latency_scale > 0:
+            time.sleep(interaction.get('latency', 0.0) * self.latency_scale)
+        if 'error' in interaction:
+            raise ReplayedAPIError(interaction['error']['type'], interaction['error']['message'])
+        recorded = interaction['response']
+        usage = SimpleNamespace(
+            prompt_tokens=recorded['prompt_tokens'],
+            completion_tokens=recorded['completion_tokens'],
+            prompt_tokens_details=SimpleNamespace(cached_tokens=recorded.get('cached_tokens', 0))
+        )
+        message = SimpleNamespace(content=recorded['content'])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+def wrap_client(config, client):
+    """Put the configured cassette layer in front of the API client, if any."""
+    if config.cassette_mode == MODE_REPLAY:
+        logger.info("Replaying API responses from %s", config.cassette_path)
+        return ReplayClient(config.cassette_path, config.cassette_latency_scale)
+    if config.cassette_mode == MODE_RECORD:
+        if client is None:
+            raise ValueError("Recording a cassette needs an API key")
+        logger.info("Recording API responses to %s", config.cassette_path)
+        secrets = [config.get_api_key()] + [endpoint.get('api_key') for endpoint in config.api_endpoints]
+        return RecordingClient(client, config.cassette_path, secrets)
+    return client
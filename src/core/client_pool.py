@@ -0,0 +1,149 @@
+import threading
+import time
+import logging
+from types import SimpleNamespace
+import openai
+from openai import OpenAI
+from .task_control import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses that point at the endpoint or key rather than at the request itself
+MEMBER_FAILURE_STATUSES = (401, 403, 408, 409, 429)
+
+def is_member_failure(error: Exception) -> bool:
+    """Return whether an error should count against the pool member that raised it.
+
+    Requests the API rejects as invalid (400, 404, 422, ...) would fail on every
+    member, so they are raised straight away instead of failing over.
+    """
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in MEMBER_FAILURE_STATUSES or error.status_code >= 500
+    return True
+
+class PoolMember:
+    """One API key / endpoint with its own weight, rate budget and circuit breaker."""
+    def __init__(self, name: str, client, weight: int = 1, requests_per_minute: float = 0,
+                 failure_threshold: int = 3, cooldown: float = 30.0):
+        self.name = name
+        self.client = client
+        self.weight = max(1, weight)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.open_until = 0.0  # circuit is open (member skipped) until this monotonic time
+        self.requests = 0
+        self.failures = 0
+        self.current_weight = 0  # smooth weighted round-robin state
+
+    @classmethod
+    def from_dict(cls, data: dict, default_api_key: str = "", failure_threshold: int = 3,
+                  cooldown: float = 30.0) -> "PoolMember":
+        client = OpenAI(api_key=data.get('api_key') or default_api_key, base_url=data.get('base_url'))
+        return cls(
+            name=data.get('name') or data.get('base_url') or "default",
+            client=client,
+            weight=data.get('weight', 1),
+            requests_per_minute=data.get('requests_per_minute', 0),
+            failure_threshold=failure_threshold,
+            cooldown=cooldown
+        )
+
+    def is_available(self, now: float) -> bool:
+        return self.open_until <= now
+
+class ClientPool:
+    """Balances chat completion requests across several API keys or compatible endpoints.
+
+    Healthy members are picked by smooth weighted round-robin. A member that fails
+    failure_threshold times in a row is skipped for its cooldown and then given
+    one trial request. A failed request moves on to the next member, so callers
+    only see an error once every member has failed it.
+
+    The pool mimics client.chat.completions, so it stands in for a single client.
+    """
+    def __init__(self, members: list):
+        if not members:
+            raise ValueError("At least one API client is required")
+        self.members = members
+        self.chat = SimpleNamespace(completions=self)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the pool from config.api_endpoints, or from the single API key. Returns None without any key."""
+        endpoints = config.api_endpoints or ([{'name': "default"}] if config.get_api_key() else [])
+        members = [
+            PoolMember.from_dict(endpoint, config.get_api_key(), config.pool_failure_threshold, config.pool_cooldown)
+            for endpoint in endpoints
+        ]
+        return cls(members) if members else None
+
+    def _pick(self, tried: set) -> PoolMember:
+        with self._lock:
+            candidates = [member for member in self.members if member not in tried]
+            if not candidates:
+                return None
+            now = time.monotonic()
+            healthy = [member for member in candidates if member.is_available(now)]
+            if not healthy:
+                # Everything left is circuit-broken: probe the one that recovers first
+                return min(candidates, key=lambda member: member.open_until)
+            total = sum(member.weight for member in healthy)
+            for member in healthy:
+                member.current_weight += member.weight
+            chosen = max(healthy, key=lambda member: member.current_weight)
+            chosen.current_weight -= total
+            return chosen
+
+    def _record(self, member: PoolMember, error: Exception = None):
+        with self._lock:
+            member.requests += 1
+            if error is None:
+                member.consecutive_failures = 0
+                member.open_until = 0.0
+                return
+            member.failures += 1
+            member.consecutive_failures += 1
+            if member.consecutive_failures >= member.failure_threshold:
+                member.open_until = time.monotonic() + member.cooldown
+                logger.warning(
+                    "API client %s failed %d times in a row; skipping it for %.0fs",
+                    member.name, member.consecutive_failures, member.cooldown
+                )
+
+    def create(self, control=None, **kwargs):
+        """Send one chat completion request, failing over between members."""
+        tried = set()
+        last_error = None
+        while True:
+            member = self._pick(tried)
+            if member is None:
+                raise last_error
+            tried.add(member)
+            member.rate_limiter.acquire(control)
+            try:
+                response = member.client.chat.completions.create(**kwargs)
+            except Exception as e:
+                if not is_member_failure(e):
+                    self._record(member)
+                    raise
+                self._record(member, e)
+                last_error = e
+                logger.warning("API client %s failed (%s: %s), trying the next one", member.name, type(e).__name__, e)
+                continue
+            self._record(member)
+            return response
+
+    def status(self) -> list:
+        """Per-member request and health summary."""
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                'name': member.name,
+                'weight': member.weight,
+                'requests': member.requests,
+                'failures': member.failures,
+                'available': member.is_available(now)
+            } for member in self.members]
@@ -1,6 +1,7 @@
 import os
+import json
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import load_dotenv, set_key
 
 class Config:
     def __init__(self):
@@ -11,6 +12,70 @@ class Config:
         
         # Default settings
         self.api_key = os.getenv("OPENAI_API_KEY", "")
+        # Shared by all routes; matches the largest route budget below so that one can be used in full
+        self.max_concurrent_requests = int(os.getenv("MAX_CONCURRENT_REQUESTS", "8"))
+        self.cancel_deadline = float(os.getenv("CANCEL_DEADLINE_SECONDS", "10"))
+        self.progress_interval = float(os.getenv("PROGRESS_INTERVAL_SECONDS", "0.1"))
+        self.mask_retries = int(os.getenv("MASK_RETRIES", "2"))
+        # Translated workbooks waiting to be saved in the background (each is held in memory)
+        self.max_pending_writes = int(os.getenv("MAX_PENDING_WRITES", "2"))
+        
+        # Model routes, tried in order: short cells go to the first route whose max_chars
+        # they fit, everything else (and high-risk fields) to the last one. Prices are per 1K tokens.
+        self.model_routes = json.loads(os.getenv("MODEL_ROUTES", "null")) or [
+            {
+                "name": "fast", "model": "gpt-3.5-turbo", "max_chars": 200,
+                "max_concurrency": 8, "requests_per_minute": 3500,
+                "prompt_price": 0.0005, "completion_price": 0.0015, "expected_latency": 1.0
+            },
+            {
+                "name": "strong", "model": "gpt-4o",
+                "max_concurrency": 4, "requests_per_minute": 500,
+                "prompt_price": 0.0025, "cached_prompt_price": 0.00125, "completion_price": 0.01,
+                "expected_latency": 3.0
+            }
+        ]
+        
+        # Extra API keys and/or OpenAI-compatible endpoints to balance requests across, e.g.
+        # [{"name": "eu", "api_key": "...", "base_url": "https://...", "weight": 2, "requests_per_minute": 500}].
+        # Entries without api_key use OPENAI_API_KEY; when unset the single API key is used.
+        self.api_endpoints = json.loads(os.getenv("API_ENDPOINTS", "null")) or []
+        # An endpoint failing this many requests in a row is skipped for the cooldown
+        self.pool_failure_threshold = int(os.getenv("POOL_FAILURE_THRESHOLD", "3"))
+        self.pool_cooldown = float(os.getenv("POOL_COOLDOWN_SECONDS", "30"))
+        
+        # Team-shared translation memory service (src/memory_server.py); empty disables it
+        self.shared_memory_url = os.getenv("SHARED_MEMORY_URL", "")
+        self.shared_memory_timeout = float(os.getenv("SHARED_MEMORY_TIMEOUT_SECONDS", "2"))
+        self.shared_memory_batch_size = int(os.getenv("SHARED_MEMORY_BATCH_SIZE", "200"))
+        # Shared secret of the service, sent with every request when set
+        self.shared_memory_token = os.getenv("SHARED_MEMORY_TOKEN", "")
+        
+        # API cassette: "record" appends every request/response to CASSETTE_PATH, "replay"
+        # answers from it offline. A latency scale above 0 replays recorded latencies.
+        self.cassette_mode = os.getenv("CASSETTE_MODE", "").lower()
+        self.cassette_path = os.getenv("CASSETTE_PATH", str(self.config_dir / "cassette.jsonl"))
+        self.cassette_latency_scale = float(os.getenv("CASSETTE_LATENCY_SCALE", "0"))
+        
+        # Translate the strings of queued tasks ahead of time, using only spare API capacity
+        self.cache_prewarm = os.getenv("CACHE_PREWARM", "").lower() in ("1", "true", "yes")
+        self.prewarm_workers = int(os.getenv("PREWARM_WORKERS", "1"))
+        self.high_risk_fields = os.getenv("HIGH_RISK_FIELDS", "Legal,Medical").split(",")
+        
+        # Per-task metrics (JSON and Prometheus text) are written here when set
+        self.metrics_dir = os.getenv("METRICS_DIR", "")
+        self.log_level = os.getenv("LOG_LEVEL", "INFO")
+        
+        # Chrome trace files (and cProfile dumps) are written here when set; tracing is off otherwise
+        self.trace_dir = os.getenv("TRACE_DIR", "")
+        self.profile_tasks = os.getenv("PROFILE_TASKS", "").lower() in ("1", "true", "yes")
+        
+        # Hot-folder service (src/service.py): persistent job queue, worker count,
+        # folder poll interval and the local status endpoint port (0 disables it)
+        self.service_queue_path = os.getenv("SERVICE_QUEUE_PATH", str(self.config_dir / "jobs.sqlite3"))
+        self.service_workers = int(os.getenv("SERVICE_WORKERS", "2"))
+        self.service_poll_interval = float(os.getenv("SERVICE_POLL_SECONDS", "5"))
+        self.service_status_port = int(os.getenv("SERVICE_STATUS_PORT", "8765"))
         self.default_languages = [
             "English", "Spanish", "French", "German", "Chinese",
             "Japanese", "Korean", "Russian", "Arabic", "Portuguese"
@@ -32,8 +97,8 @@ class Config:
     
     def save_api_key(self, api_key: str):
         """Save the OpenAI API key to the configuration file."""
-        with open(self.config_file, "w") as f:
-            f.write(f"OPENAI_API_KEY={api_key}\n")
+        # Only the key is replaced, other settings in the file are kept
+        set_key(str(self.config_file), "OPENAI_API_KEY", api_key, quote_mode="never")
         self.api_key = api_key
     
     def get_api_key(self) -> str:
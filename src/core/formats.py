@@ -0,0 +1,170 @@
+import csv
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import get_column_letter, column_index_from_string
+
+try:
+    import xlrd
+except ImportError:  # optional dependency, only needed for legacy .xls workbooks
+    xlrd = None
+
+# Rows of a CSV file translated together; bounds memory independently of the file size
+CSV_CHUNK_ROWS = 1000
+
+SUPPORTED_SUFFIXES = (".xlsx", ".xls", ".csv")
+
+def is_csv_file(file_path) -> bool:
+    return Path(file_path).suffix.lower() == ".csv"
+
+def is_xls_file(file_path) -> bool:
+    return Path(file_path).suffix.lower() == ".xls"
+
+def output_suffix(file_path) -> str:
+    """Suffix of translated files: legacy .xls workbooks are written as .xlsx."""
+    return ".xlsx" if is_xls_file(file_path) else Path(file_path).suffix
+
+def _require_xlrd():
+    if xlrd is None:
+        raise ValueError("Reading .xls files requires the xlrd package (pip install xlrd)")
+
+def open_workbook(file_path, read_only: bool = False):
+    """Open an xlsx workbook with openpyxl, or convert a legacy .xls workbook into one.
+
+    Converted workbooks keep cell values only; formatting of .xls files is not carried over.
+    """
+    if not is_xls_file(file_path):
+        return load_workbook(file_path, read_only=read_only)
+    _require_xlrd()
+    book = xlrd.open_workbook(str(file_path), on_demand=True)
+    wb = Workbook()
+    wb.remove(wb.active)
+    try:
+        for index in range(book.nsheets):
+            source = book.sheet_by_index(index)
+            sheet = wb.create_sheet(source.name)
+            for row in range(source.nrows):
+                for column, cell in enumerate(source.row(row), start=1):
+                    value = _xls_value(cell, book.datemode)
+                    if value is not None:
+                        sheet.cell(row=row + 1, column=column, value=value)
+            book.unload_sheet(index)
+    finally:
+        book.release_resources()
+    return wb
+
+def _xls_value(cell, datemode):
+    """Convert an xlrd cell to the value openpyxl would have read from the same cell in an xlsx file."""
+    if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    if cell.ctype == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate_as_datetime(cell.value, datemode)
+        except (ValueError, OverflowError):
+            return cell.value
+    if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(cell.value)
+    if cell.ctype == xlrd.XL_CELL_ERROR:
+        return xlrd.error_text_from_code.get(cell.value)
+    if cell.ctype == xlrd.XL_CELL_NUMBER and float(cell.value).is_integer():
+        # xls stores every number as a float
+        return int(cell.value)
+    return cell.value
+
+def xls_sheet_names(file_path) -> list:
+    _require_xlrd()
+    book = xlrd.open_workbook(str(file_path), on_demand=True)
+    try:
+        return book.sheet_names()
+    finally:
+        book.release_resources()
+
+class CsvCell:
+    """A CSV field with the cell attributes the translation pipeline uses."""
+    __slots__ = ("value", "row", "column", "index")
+    data_type = "s"
+
+    def __init__(self, value, row: int, column: int, index: int = None):
+        self.value = value
+        self.row = row  # 1-based line number in the file
+        self.column = column  # 1-based field index
+        self.index = index  # position of the row within its chunk
+
+    @property
+    def coordinate(self) -> str:
+        return f"{get_column_letter(self.column)}{self.row}"
+
+class CsvTable:
+    """Streams a CSV file in chunks of rows, exposing the selected columns as cells.
+
+    Columns are given by header name, or by letter (A, B, ...) for files
+    without a header row. The dialect is sniffed from the start of the file.
+    """
+    def __init__(self, file_path, columns, has_header: bool = True, encoding: str = "utf-8-sig"):
+        if not columns:
+            raise ValueError("Columns are required for CSV files. Please list them, e.g. 'Title, Description'")
+        self.file_path = Path(file_path)
+        self.has_header = has_header
+        self.encoding = encoding
+        with open(self.file_path, newline="", encoding=encoding) as f:
+            sample = f.read(64 * 1024)
+        try:
+            self.dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            self.dialect = csv.excel
+        self.header = None
+        if has_header:
+            with open(self.file_path, newline="", encoding=encoding) as f:
+                self.header = next(csv.reader(f, self.dialect), [])
+        self.column_indexes = [self._resolve_column(column) for column in columns]
+
+    def _resolve_column(self, column) -> int:
+        """Return the 0-based index of a column given by header name or letter."""
+        column = str(column).strip()
+        if self.header and column in self.header:
+            return self.header.index(column)
+        if column.isalpha() and column.isupper():
+            return column_index_from_string(column) - 1
+        raise ValueError(f"Column '{column}' not found in {self.file_path.name}")
+
+    def column_names(self) -> list:
+        if self.header:
+            return [self.header[index] if index < len(self.header) else get_column_letter(index + 1)
+                    for index in self.column_indexes]
+        return [get_column_letter(index + 1) for index in self.column_indexes]
+
+    def _rows(self):
+        """Yield (line number, row) pairs of the data rows."""
+        with open(self.file_path, newline="", encoding=self.encoding) as f:
+            reader = csv.reader(f, self.dialect)
+            if self.has_header:
+                next(reader, None)
+            for row in reader:
+                yield reader.line_num, row
+
+    def cells(self):
+        """Yield the cells of the selected columns, row by row."""
+        for line, row in self._rows():
+            for index in self.column_indexes:
+                if index < len(row):
+                    yield CsvCell(row[index], line, index + 1)
+
+    def chunks(self, size: int = CSV_CHUNK_ROWS):
+        """Yield (rows, cells) for consecutive blocks of at most size rows."""
+        rows = []
+        cells = []
+        for line, row in self._rows():
+            rows.append(row)
+            for index in self.column_indexes:
+                if index < len(row):
+                    cells.append(CsvCell(row[index], line, index + 1, len(rows) - 1))
+            if len(rows) >= size:
+                yield rows, cells
+                rows, cells = [], []
+        if rows:
+            yield rows, cells
+
+    def writer(self, output_path):
+        """Open an output file and return (file, csv writer) using the input's dialect."""
+        # With a byte order mark, as Excel needs to open non-ASCII text correctly
+        f = open(output_path, "w", newline="", encoding="utf-8-sig")
+        return f, csv.writer(f, self.dialect)
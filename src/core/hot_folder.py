@@ -0,0 +1,279 @@
+import fnmatch
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from .job_queue import JobQueue
+from .task_control import TaskControl, TaskCancelled, RequestSlots
+from .routing import ModelRouter
+from .shared_memory import create_translation_cache
+from .client_pool import ClientPool
+from .workbook_index import WorkbookIndex
+from .translator import Translator, OUTPUT_FILES
+from .formats import is_csv_file
+
+logger = logging.getLogger(__name__)
+
+# Range rule that picks the bounding box of the sheet's text cells
+RANGE_AUTO = "auto"
+
+class WatchedFolder:
+    """An input directory together with the task template applied to every file dropped in it."""
+    def __init__(self, path, current_language: str, target_languages: list, name: str = None,
+                 pattern: str = "*.xlsx", sheet: str = None, cell_range: str = RANGE_AUTO,
+                 field: str = "", output_mode: str = OUTPUT_FILES, comparison_mode: bool = False,
+                 skip_target_language: bool = True, skip_other_languages: bool = False, prompt: str = None,
+                 columns: list = None, has_header: bool = True, glossary: dict = None):
+        self.path = Path(path)
+        self.name = name or self.path.name
+        self.pattern = pattern
+        self.current_language = current_language
+        self.target_languages = list(target_languages)
+        self.sheet = sheet
+        self.cell_range = cell_range
+        self.field = field
+        self.output_mode = output_mode
+        self.comparison_mode = comparison_mode
+        self.skip_target_language = skip_target_language
+        self.skip_other_languages = skip_other_languages
+        self.prompt = prompt
+        # CSV files select columns (header names or letters) instead of a range
+        self.columns = columns or []
+        self.has_header = has_header
+        # Fixed term translations, added to the static prompt prefix
+        self.glossary = glossary or {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WatchedFolder":
+        return cls(**data)
+
+    def is_output(self, file_path: Path) -> bool:
+        """Translated files are written next to the inputs; never pick them up again."""
+        suffixes = ["translated"] + self.target_languages
+        return any(file_path.stem.endswith(f"_{suffix}") for suffix in suffixes)
+
+    def candidates(self) -> list:
+        if not self.path.is_dir():
+            return []
+        return sorted(
+            entry for entry in self.path.iterdir()
+            if entry.is_file()
+            and fnmatch.fnmatch(entry.name, self.pattern)
+            and not entry.name.startswith(("~$", "."))  # Excel lock files and hidden files
+            and not self.is_output(entry)
+        )
+
+    def task_data(self, file_path, config, workbook_index: WorkbookIndex) -> dict:
+        """Build the task for one file, resolving the sheet and range rules against the workbook."""
+        task = {
+            'file': str(file_path),
+            'current_language': self.current_language,
+            'target_languages': self.target_languages,
+            'output_mode': self.output_mode,
+            'comparison_mode': self.comparison_mode,
+            'skip_target_language': self.skip_target_language,
+            'skip_other_languages': self.skip_other_languages,
+            'prompt': self.prompt or config.get_default_prompt(),
+            'field': self.field,
+            'glossary': self.glossary
+        }
+        if is_csv_file(file_path):
+            task.update(columns=self.columns, has_header=self.has_header)
+            return task
+        sheets = workbook_index.get(file_path)
+        if not sheets:
+            raise ValueError(f"No worksheets found in {file_path}")
+        sheet = next((info for info in sheets if info.name == self.sheet), None) if self.sheet else sheets[0]
+        if sheet is None:
+            raise ValueError(f"Sheet '{self.sheet}' not found in {file_path}")
+        cell_range = self.cell_range
+        if cell_range == RANGE_AUTO:
+            cell_range = sheet.text_range
+            if not cell_range:
+                raise ValueError(f"Sheet '{sheet.name}' has no text cells")
+        task.update(sheet=sheet.name, cell_range=cell_range)
+        return task
+
+def file_fingerprint(file_path) -> str:
+    stat = os.stat(file_path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+class HotFolderService:
+    """Headless service: watches folders, queues new or changed files and translates them.
+
+    The watcher polls the folders and queues a file once its size and mtime are
+    unchanged between two polls, so files still being copied are not picked up.
+    A fixed number of worker threads process the persistent queue, and a local
+    HTTP endpoint reports job status.
+    """
+    def __init__(self, config, folders: list, queue: JobQueue, workers: int = 2,
+                 poll_interval: float = 5.0, status_port: int = None):
+        self.config = config
+        self.folders = {folder.name: folder for folder in folders}
+        self.queue = queue
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.status_port = status_port
+        # Shared by every job, as in the GUI
+        self.request_slots = RequestSlots(config.max_concurrent_requests)
+        self.router = ModelRouter.from_config(config)
+        self.translation_cache = create_translation_cache(config)
+        self.client_pool = ClientPool.from_config(config)
+        self.workbook_index = WorkbookIndex()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._controls = {}  # job id -> TaskControl of running jobs
+        self._controls_lock = threading.Lock()
+        self._seen = {}  # path -> fingerprint from the previous poll
+        self.http_server = None
+
+    def start(self):
+        self._threads.append(threading.Thread(target=self._watch_loop, name="hot-folder-watcher", daemon=True))
+        for index in range(self.workers):
+            self._threads.append(threading.Thread(target=self._worker_loop, name=f"hot-folder-worker-{index}", daemon=True))
+        if self.status_port is not None:
+            self.http_server = ThreadingHTTPServer(("127.0.0.1", self.status_port), _status_handler(self))
+            self._threads.append(threading.Thread(target=self.http_server.serve_forever, name="hot-folder-status", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        logger.info("Watching %d folder(s) with %d worker(s)", len(self.folders), self.workers)
+
+    def stop(self, timeout: float = None):
+        """Stop watching and cancel running jobs; they are queued again for the next start."""
+        self._stop.set()
+        self._wakeup.set()
+        with self._controls_lock:
+            for control in self._controls.values():
+                control.cancel()
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+        for thread in self._threads:
+            thread.join(timeout if timeout is not None else self.config.cancel_deadline)
+        self._threads = []
+
+    def request_stop(self):
+        """Ask wait() to return; safe to call from a signal handler."""
+        self._stop.set()
+        self._wakeup.set()
+
+    def wait(self):
+        """Block until request_stop() or stop() is called."""
+        while not self._stop.wait(1.0):
+            pass
+
+    def scan(self) -> int:
+        """Poll every folder once and queue files that are new or changed; returns the number queued."""
+        queued = 0
+        seen = {}
+        for folder in self.folders.values():
+            for file_path in folder.candidates():
+                key = str(file_path.resolve())
+                try:
+                    fingerprint = file_fingerprint(file_path)
+                except OSError:
+                    continue
+                seen[key] = fingerprint
+                # Only queue files that stopped changing since the previous poll
+                if self._seen.get(key) != fingerprint:
+                    continue
+                job_id = self.queue.enqueue(key, folder.name, fingerprint)
+                if job_id is not None:
+                    logger.info("Queued job %d for %s", job_id, key)
+                    queued += 1
+        self._seen = seen
+        if queued:
+            self._wakeup.set()
+        return queued
+
+    def _watch_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.scan()
+            except Exception as e:
+                logger.error("Folder scan failed: %s", e)
+            self._stop.wait(self.poll_interval)
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self.process(job)
+
+    def process(self, job: dict):
+        """Run one claimed job and record its outcome in the queue."""
+        folder = self.folders.get(job['folder'])
+        if folder is None:
+            self.queue.fail(job['id'], f"Folder '{job['folder']}' is no longer configured")
+            return
+        control = TaskControl()
+        with self._controls_lock:
+            self._controls[job['id']] = control
+        if self._stop.is_set():
+            control.cancel()
+        try:
+            translator = Translator(
+                self.config, self.request_slots, self.router, self.translation_cache, self.client_pool
+            )
+            task_data = folder.task_data(job['path'], self.config, self.workbook_index)
+            logger.info("Starting job %d for %s", job['id'], job['path'])
+            translator.translate_excel(task_data, control)
+            self.queue.finish(job['id'], [str(path) for path in translator.output_paths(task_data)])
+            logger.info("Job %d completed", job['id'])
+        except TaskCancelled:
+            logger.info("Job %d interrupted, queued again", job['id'])
+            self.queue.requeue(job['id'])
+        except Exception as e:
+            logger.error("Job %d failed: %s", job['id'], e)
+            self.queue.fail(job['id'], str(e))
+        finally:
+            with self._controls_lock:
+                self._controls.pop(job['id'], None)
+
+    def status(self) -> dict:
+        return {
+            'folders': {name: str(folder.path) for name, folder in self.folders.items()},
+            'workers': self.workers,
+            'jobs': self.queue.counts()
+        }
+
+def _status_handler(service: HotFolderService):
+    """Build the request handler for the read-only status endpoint.
+
+    GET /status, GET /jobs[?status=queued&limit=50] and GET /jobs/<id> return JSON.
+    """
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            query = parse_qs(url.query)
+            if parts == ["status"]:
+                self._send(200, service.status())
+            elif parts == ["jobs"]:
+                limit = int(query.get("limit", ["100"])[0])
+                self._send(200, service.queue.list(query.get("status", [None])[0], limit))
+            elif len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+                job = service.queue.get(int(parts[1]))
+                self._send(200 if job else 404, job or {'error': "job not found"})
+            else:
+                self._send(404, {'error': "not found"})
+
+        def _send(self, code: int, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("Status request: " + format, *args)
+
+    return StatusHandler
@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    outputs TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    UNIQUE (path, fingerprint)
+)
+"""
+
+class JobQueue:
+    """Persistent job queue in a SQLite file, shared by the watcher and the workers.
+
+    A file version (path plus fingerprint) is queued at most once. Jobs that
+    were running when the process stopped are queued again on start.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(SCHEMA)
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE status = ?",
+                (STATUS_QUEUED, time.time(), STATUS_RUNNING)
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def enqueue(self, path: str, folder: str, fingerprint: str):
+        """Queue a file version; returns the job id, or None if that version was queued before."""
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO jobs (path, folder, fingerprint, status, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, folder, fingerprint, STATUS_QUEUED, now, now)
+            )
+            return cursor.lastrowid if cursor.rowcount else None
+
+    def claim(self):
+        """Mark the oldest queued job as running and return it, or None if the queue is empty."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (STATUS_QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, updated = ? WHERE id = ?",
+                        (STATUS_RUNNING, time.time(), row['id'])
+                    )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        return self.get(row['id']) if row is not None else None
+
+    def _set_status(self, job_id: int, status: str, error: str = None, outputs: list = None):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, outputs = ?, updated = ? WHERE id = ?",
+                (status, error, json.dumps(outputs) if outputs is not None else None, time.time(), job_id)
+            )
+
+    def finish(self, job_id: int, outputs: list = None):
+        self._set_status(job_id, STATUS_DONE, outputs=outputs or [])
+
+    def fail(self, job_id: int, error: str):
+        self._set_status(job_id, STATUS_FAILED, error=error)
+
+    def requeue(self, job_id: int):
+        """Put an interrupted job back in the queue."""
+        self._set_status(job_id, STATUS_QUEUED)
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        job = dict(row)
+        job['outputs'] = json.loads(job['outputs']) if job['outputs'] else []
+        return job
+
+    def get(self, job_id: int):
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def list(self, status: str = None, limit: int = 100) -> list:
+        """Return the most recent jobs first, optionally only those with the given status."""
+        query = "SELECT * FROM jobs"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._connection.execute(query, params + (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys((STATUS_QUEUED, STATUS_RUNNING, STATUS_DONE, STATUS_FAILED), 0)
+        counts.update({status: count for status, count in rows})
+        return counts
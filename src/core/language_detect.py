@@ -0,0 +1,171 @@
+import re
+
+# Minimum number of letters before a guess is made; shorter cells are left to the API
+MIN_LETTERS = 3
+MIN_NON_LATIN_LETTERS = 2
+
+# Share of letters a script needs before the cell is attributed to it
+SCRIPT_THRESHOLD = 0.6
+
+# Minimum stopword/diacritic score and lead over the runner-up for Latin-script languages
+MIN_LATIN_SCORE = 2
+MIN_LATIN_MARGIN = 2
+
+# Minimum stopword/letter score before Cyrillic or Arabic-script text is attributed
+MIN_SCRIPT_SCORE = 2
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+_STOPWORDS = {
+    "English": {
+        "the", "and", "of", "to", "in", "is", "are", "for", "with", "on", "this", "that",
+        "be", "by", "from", "it", "not", "or", "you", "your", "we", "our", "will", "can",
+        "have", "has", "was", "were", "an", "at", "as", "all", "please", "if", "which"
+    },
+    "Spanish": {
+        "el", "la", "los", "las", "de", "del", "y", "en", "que", "es", "por", "para", "con",
+        "un", "una", "su", "al", "lo", "como", "más", "pero", "sus", "le", "ya", "o", "este",
+        "esta", "son", "está", "también", "se", "no"
+    },
+    "French": {
+        "le", "la", "les", "de", "des", "du", "et", "en", "un", "une", "est", "que", "qui",
+        "dans", "pour", "pas", "sur", "au", "aux", "avec", "ce", "cette", "sont", "par",
+        "plus", "ne", "nous", "vous", "il", "elle", "d'un", "d'une"
+    },
+    "German": {
+        "der", "die", "das", "und", "ist", "nicht", "mit", "den", "dem", "ein", "eine",
+        "einen", "zu", "von", "auf", "für", "im", "sich", "auch", "es", "sie", "wir", "ich",
+        "des", "werden", "wird", "oder", "bei", "nach", "aus"
+    },
+    "Portuguese": {
+        "o", "a", "os", "as", "de", "do", "da", "dos", "das", "e", "em", "no", "na", "um",
+        "uma", "que", "é", "para", "com", "não", "por", "mais", "se", "seu", "sua", "ao",
+        "também", "são", "está", "pelo", "pela"
+    },
+}
+
+_DIACRITICS = {
+    "Spanish": set("ñ¿¡"),
+    "French": set("çèêëîïôœûùÿ"),
+    "German": set("äöüß"),
+    "Portuguese": set("ãõç"),
+}
+
+# Cyrillic and Arabic script are shared by several languages, of which only one is
+# supported. It is only returned for text with none of the other languages' letters
+# and enough of its own stopwords (chosen to not be words of the others) and letters.
+_SCRIPT_LANGUAGES = {
+    "cyrillic": (
+        "Russian",
+        {
+            "что", "это", "этот", "эта", "эти", "вы", "мы", "он", "она", "они", "его", "был",
+            "была", "было", "быть", "есть", "уже", "если", "только", "также", "будет", "можно",
+            "нет", "вашего", "вашей", "спасибо", "пожалуйста"
+        },
+        set("ыэё"),
+        # Ukrainian, Belarusian, Serbian and Macedonian letters
+        set("іїєґўђјљњћџѓѕќ")
+    ),
+    "arabic": (
+        "Arabic",
+        {
+            "في", "من", "على", "إلى", "عن", "مع", "هذا", "هذه", "ذلك", "التي", "الذي", "أن",
+            "إن", "كان", "كانت", "لا", "ما", "هو", "هي", "قد", "لم", "لن", "أو", "كل", "شكرا"
+        },
+        set("ةىي"),
+        # Persian and Urdu letters
+        set("پچژگکیہےٹڈڑں")
+    ),
+}
+
+def _classify_char(code: int) -> str:
+    """Return the script bucket of a character code, or '' for non-letters."""
+    if code < 0x250:
+        return "latin"
+    if 0x0400 <= code <= 0x04FF:
+        return "cyrillic"
+    if 0x0600 <= code <= 0x06FF or 0x0750 <= code <= 0x077F:
+        return "arabic"
+    if 0x3040 <= code <= 0x30FF:
+        return "kana"
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+        return "han"
+    if 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return "hangul"
+    return ""
+
+def _count_scripts(text: str) -> dict:
+    counts = {}
+    for char in text:
+        if not char.isalpha():
+            continue
+        script = _classify_char(ord(char))
+        if script:
+            counts[script] = counts.get(script, 0) + 1
+    return counts
+
+def _detect_latin(text: str):
+    """Score Latin-script text against the stopword and diacritic tables."""
+    lowered = text.lower()
+    words = _WORD_RE.findall(lowered)
+    if len(words) < 2:
+        return None
+
+    scores = {}
+    for language, stopwords in _STOPWORDS.items():
+        scores[language] = sum(1 for word in words if word in stopwords)
+    if not lowered.isascii():
+        chars = set(lowered)
+        for language, marks in _DIACRITICS.items():
+            scores[language] += 2 * len(chars & marks)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, best_score), (_, runner_up) = ranked[0], ranked[1]
+    if best_score >= MIN_LATIN_SCORE and best_score - runner_up >= MIN_LATIN_MARGIN:
+        return best
+    return None
+
+def _detect_script_language(text: str, script: str):
+    """Return the supported language of a Cyrillic or Arabic-script text once it is confirmed."""
+    language, stopwords, letters, foreign_letters = _SCRIPT_LANGUAGES[script]
+    lowered = text.lower()
+    chars = set(lowered)
+    if chars & foreign_letters:
+        return None
+    score = sum(1 for word in _WORD_RE.findall(lowered) if word in stopwords)
+    score += 2 * len(chars & letters)
+    return language if score >= MIN_SCRIPT_SCORE else None
+
+def detect_language(text: str):
+    """Guess the language of a cell using only local script and stopword statistics.
+
+    Returns one of the supported language names, or None when the text is too
+    short or ambiguous to decide. Callers should treat None as "translate it".
+    """
+    if text.isascii():
+        letters = sum(1 for char in text if char.isalpha())
+        if letters < MIN_LETTERS:
+            return None
+        return _detect_latin(text)
+
+    counts = _count_scripts(text)
+    total = sum(counts.values())
+    if total < MIN_NON_LATIN_LETTERS:
+        return None
+
+    cjk = counts.get("han", 0) + counts.get("kana", 0)
+    if counts.get("kana", 0) and cjk / total >= SCRIPT_THRESHOLD:
+        return "Japanese"
+    if counts.get("han", 0) / total >= SCRIPT_THRESHOLD:
+        # Han characters without kana are Chinese or Japanese written in kanji only
+        # (e.g. 会社概要); either way the cell must not be skipped as already translated
+        return None
+    if counts.get("hangul", 0) / total >= SCRIPT_THRESHOLD:
+        return "Korean"
+    for script in _SCRIPT_LANGUAGES:
+        if counts.get(script, 0) / total >= SCRIPT_THRESHOLD:
+            # e.g. Ukrainian or Bulgarian text is not Russian, Persian or Urdu not Arabic
+            return _detect_script_language(text, script)
+    if counts.get("latin", 0) / total >= SCRIPT_THRESHOLD:
+        return _detect_latin(text)
+    return None
@@ -0,0 +1,64 @@
+import re
+
+PLACEHOLDER_OPEN = "⟦"
+PLACEHOLDER_CLOSE = "⟧"
+
+# Spans that must reach the output unchanged. Earlier alternatives win on overlap.
+_PROTECTED_PATTERNS = [
+    r"`[^`\n]+`",                                           # inline code
+    r"</?[A-Za-z][\w:-]*(?:\s[^<>]*)?/?>",                  # HTML/XML tags
+    r"\{\{.*?\}\}",                                         # {{template}} variables
+    r"\$\{[^}\s]+\}",                                       # ${variable}
+    r"\{[A-Za-z_][\w.]*\}",                                 # {name} format fields
+    r"%\(\w+\)[sd]",                                        # %(name)s
+    r"\b(?:https?|ftp)://[^\s<>\"']*[^\s<>\"'.,;:!?)]",     # URLs
+    r"\bwww\.[^\s<>\"']*[^\s<>\"'.,;:!?)]",                 # bare www. URLs
+    r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+",                        # email addresses
+    r"\b[A-Za-z]:\\[^\s<>\"']+",                            # Windows paths
+    r"\\\\[^\s<>\"']+",                                     # UNC paths
+    r"(?<![\w/])(?:~|\.{1,2})?/(?:[\w.-]+/)+[\w.-]*",       # POSIX paths with 2+ segments
+]
+_PROTECTED_RE = re.compile("|".join(f"(?:{pattern})" for pattern in _PROTECTED_PATTERNS))
+_PLACEHOLDER_RE = re.compile(f"{PLACEHOLDER_OPEN}(\\d+){PLACEHOLDER_CLOSE}")
+
+class MaskedText:
+    """Cell text with protected spans replaced by numbered placeholders."""
+    __slots__ = ("text", "spans")
+
+    def __init__(self, text: str, spans: list):
+        self.text = text
+        self.spans = spans
+
+def placeholder(index: int) -> str:
+    return f"{PLACEHOLDER_OPEN}{index}{PLACEHOLDER_CLOSE}"
+
+def mask_text(text: str) -> MaskedText:
+    """Replace URLs, emails, paths, template variables, markup and code with placeholders."""
+    if PLACEHOLDER_OPEN in text:
+        # Text that already looks like a placeholder cannot be restored unambiguously
+        return MaskedText(text, [])
+
+    spans = []
+
+    def replace(match):
+        spans.append(match.group(0))
+        return placeholder(len(spans) - 1)
+
+    return MaskedText(_PROTECTED_RE.sub(replace, text), spans)
+
+def placeholders_intact(translated: str, count: int) -> bool:
+    """Check that each of the placeholders 0..count-1 appears exactly once and no others do."""
+    found = _PLACEHOLDER_RE.findall(translated)
+    return sorted(int(index) for index in found) == list(range(count))
+
+def unmask_text(translated: str, spans: list) -> str:
+    """Put the original spans back in place of their placeholders."""
+    return _PLACEHOLDER_RE.sub(lambda match: spans[int(match.group(1))], translated)
+
+def is_fully_protected(text: str) -> bool:
+    """True if the text holds nothing worth translating besides protected spans."""
+    masked = mask_text(text)
+    if not masked.spans:
+        return False
+    remainder = _PLACEHOLDER_RE.sub("", masked.text)
+    return not any(char.isalpha() for char in remainder)
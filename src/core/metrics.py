@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "excel_translator"
+
+COUNTERS = (
+    'requests', 'request_errors', 'retries', 'prompt_tokens', 'cached_prompt_tokens', 'completion_tokens',
+    'cache_hits', 'cache_misses', 'cells_translated', 'cells_skipped'
+)
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """Return (upper bound, cumulative count) pairs, ending with +Inf."""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            'buckets': {("+Inf" if bound == float("inf") else str(bound)): count
+                        for bound, count in self.cumulative()},
+            'sum': self.sum,
+            'count': self.count
+        }
+
+class TaskMetrics:
+    """Counters and per-route request latency histograms for one translation task."""
+    def __init__(self, task_name: str = ""):
+        self.task_name = task_name
+        self.started = time.time()
+        self._start_clock = time.monotonic()
+        self._end_clock = None
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.latency = {}  # route name -> Histogram
+        self.routes = {}  # route name -> RouteStats summary
+        self.language = {}  # language pre-pass statistics
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe_request(self, route: str, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+                        cached_prompt_tokens: int = 0):
+        with self._lock:
+            histogram = self.latency.get(route)
+            if histogram is None:
+                histogram = self.latency[route] = Histogram()
+            histogram.observe(latency)
+            self.counters['requests'] += 1
+            self.counters['prompt_tokens'] += prompt_tokens
+            self.counters['completion_tokens'] += completion_tokens
+            self.counters['cached_prompt_tokens'] += cached_prompt_tokens
+
+    def finish(self):
+        self._end_clock = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        end = self._end_clock if self._end_clock is not None else time.monotonic()
+        return end - self._start_clock
+
+    @property
+    def cells_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.counters['cells_translated'] / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                'task': self.task_name,
+                'started': self.started,
+                'elapsed_seconds': self.elapsed,
+                'cells_per_second': self.cells_per_second,
+                'counters': dict(self.counters),
+                'request_latency_seconds': {route: histogram.to_dict() for route, histogram in self.latency.items()},
+                'routes': dict(self.routes),
+                'language': dict(self.language)
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        task = self.task_name.replace("\\", "\\\\").replace('"', '\\"')
+        lines = []
+        with self._lock:
+            for name, value in self.counters.items():
+                metric = f"{METRIC_PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f'{metric}{{task="{task}"}} {value}')
+
+            metric = f"{METRIC_PREFIX}_request_latency_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for route, histogram in self.latency.items():
+                labels = f'task="{task}",route="{route}"'
+                for bound, count in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+            metric = f"{METRIC_PREFIX}_route_cost_dollars"
+            lines.append(f"# TYPE {metric} gauge")
+            for route, summary in self.routes.items():
+                lines.append(f'{metric}{{task="{task}",route="{route}"}} {summary["cost"]}')
+
+        metric = f"{METRIC_PREFIX}_cells_per_second"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f'{metric}{{task="{task}"}} {self.cells_per_second}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path) -> Path:
+        """Write the metrics to path: Prometheus text for .prom files, JSON otherwise."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = self.to_prometheus() if path.suffix == ".prom" else self.to_json()
+        path.write_text(content, encoding="utf-8")
+        return path
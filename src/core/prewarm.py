@@ -0,0 +1,127 @@
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class CachePrewarmer:
+    """Translates the strings of queued tasks into the translation memory ahead of time.
+
+    Tasks are scanned one after another in the order they were added, and
+    each distinct string and target language the memory can't answer yet is
+    translated. A request is only sent while is_busy() is false and a request
+    slot and the route's rate budget are free right now. So a task that starts
+    never waits behind the prewarmer. At most `workers` prewarm requests that
+    are already in flight finish after it.
+    """
+    def __init__(self, make_translator, request_slots, is_busy=None, workers: int = 1, idle_poll: float = 0.5):
+        self.make_translator = make_translator
+        self.request_slots = request_slots
+        self.is_busy = is_busy or (lambda: False)
+        self.workers = max(1, workers)
+        self.idle_poll = idle_poll
+        self.translated = 0
+        self._tasks = OrderedDict()  # task_id -> task_data, waiting to be scanned
+        self._current = None  # (task_id, translator, candidates) being worked through
+        self._scanning = None  # (task_id, token) of the scan in progress
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def add(self, task_id, task_data):
+        """Queue a task for prewarming, replacing an earlier version of it."""
+        with self._lock:
+            self._tasks[task_id] = task_data
+            self._drop(task_id)
+
+    def discard(self, task_id):
+        """Stop prewarming a task, e.g. because it was started or removed."""
+        with self._lock:
+            self._tasks.pop(task_id, None)
+            self._drop(task_id)
+
+    def _drop(self, task_id):
+        if self._current is not None and self._current[0] == task_id:
+            self._current = None
+        if self._scanning is not None and self._scanning[0] == task_id:
+            self._scanning = None
+
+    def pending(self) -> int:
+        """Number of tasks not fully prewarmed yet."""
+        with self._lock:
+            return len(self._tasks) + (self._current is not None) + (self._scanning is not None)
+
+    def start(self):
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"cache-prewarm-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _next_item(self):
+        """Return the next (task_id, translator, candidate), scanning the next task if needed."""
+        while True:
+            with self._lock:
+                if self._current is not None:
+                    task_id, translator, candidates = self._current
+                    if candidates:
+                        return task_id, translator, candidates.pop(0)
+                    self._current = None
+                    translator.cache.flush()
+                if not self._tasks or self._scanning is not None:
+                    return None
+                task_id, task_data = self._tasks.popitem(last=False)
+                scan = self._scanning = (task_id, object())
+            # Scan outside the lock so that add() and discard() never wait for a workbook read
+            translator = self.make_translator()
+            try:
+                candidates = translator.prewarm_candidates(task_data)
+            except Exception as e:
+                logger.warning("Skipping prewarm of %s: %s", task_data.get('file'), e)
+                candidates = []
+            with self._lock:
+                # The task may have been started, removed or edited during the scan
+                if self._scanning is scan:
+                    self._scanning = None
+                    if candidates:
+                        logger.info("Prewarming %d strings of %s", len(candidates), task_data.get('file'))
+                        self._current = (task_id, translator, candidates)
+
+    def _is_current(self, task_id) -> bool:
+        with self._lock:
+            return self._current is not None and self._current[0] == task_id
+
+    def _run(self):
+        while not self._stop.is_set():
+            item = self._next_item()
+            if item is None:
+                self._stop.wait(self.idle_poll)
+                continue
+            task_id, translator, (text, target_lang, route) = item
+            # Wait for spare capacity; give the string up if its task is started or removed meanwhile
+            while not self._stop.is_set() and self._is_current(task_id):
+                if not self.is_busy() and self._try_prewarm(translator, text, target_lang, route):
+                    break
+                self._stop.wait(self.idle_poll)
+
+    def _try_prewarm(self, translator, text, target_lang, route) -> bool:
+        """Translate one string if capacity is free right now; returns False to retry later."""
+        with self.request_slots.acquire_spare() as free:
+            if not free:
+                return False
+            with route.acquire_spare() as route_free:
+                if not route_free:
+                    return False
+                try:
+                    translator.prewarm(text, target_lang, route)
+                    with self._lock:
+                        self.translated += 1
+                except Exception as e:
+                    logger.warning("Prewarm request failed: %s", e)
+                return True
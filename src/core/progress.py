@@ -0,0 +1,75 @@
+import time
+
+# Weight of the latest interval in the smoothed throughput
+RATE_SMOOTHING = 0.3
+
+class ProgressReporter:
+    """Turns per-cell work into throttled progress and throughput updates.
+
+    Work is counted in units of one cell for one target language, so skipped
+    and cached cells advance progress like translated ones. Updates are
+    emitted at most once per interval, plus a final one from finish().
+    """
+    def __init__(self, total_units: int, metrics, on_progress, on_stats=None, interval: float = 0.1):
+        self.total_units = total_units
+        self.done_units = 0
+        self.metrics = metrics
+        self.on_progress = on_progress
+        self.on_stats = on_stats
+        self.interval = interval
+        self._last_emit = 0.0
+        self._last_units = 0
+        self._last_tokens = 0
+        self._cell_rate = None
+        self._token_rate = None
+        self._last_percent = -1
+
+    def advance(self, units: int = 1):
+        self.done_units += units
+        now = time.monotonic()
+        if now - self._last_emit >= self.interval:
+            self._emit(now)
+
+    def finish(self):
+        self._emit(time.monotonic())
+
+    def _tokens(self) -> int:
+        counters = self.metrics.counters
+        return counters.get('prompt_tokens', 0) + counters.get('completion_tokens', 0)
+
+    def _smooth(self, previous, value):
+        if previous is None:
+            return value
+        return RATE_SMOOTHING * value + (1 - RATE_SMOOTHING) * previous
+
+    def _emit(self, now: float):
+        elapsed = now - self._last_emit if self._last_emit else self.metrics.elapsed
+        tokens = self._tokens()
+        if elapsed > 0:
+            self._cell_rate = self._smooth(self._cell_rate, (self.done_units - self._last_units) / elapsed)
+            self._token_rate = self._smooth(self._token_rate, (tokens - self._last_tokens) / elapsed)
+        self._last_emit = now
+        self._last_units = self.done_units
+        self._last_tokens = tokens
+
+        percent = int(self.done_units * 100 / self.total_units) if self.total_units else 100
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.on_progress(percent)
+        if self.on_stats is not None:
+            self.on_stats(self.snapshot(percent))
+
+    def snapshot(self, percent: int = None) -> dict:
+        counters = self.metrics.counters
+        lookups = counters.get('cache_hits', 0) + counters.get('cache_misses', 0)
+        remaining = self.total_units - self.done_units
+        cell_rate = self._cell_rate or 0.0
+        return {
+            'progress': percent if percent is not None else self._last_percent,
+            'done': self.done_units,
+            'total': self.total_units,
+            'cells_per_second': cell_rate,
+            'tokens_per_second': self._token_rate or 0.0,
+            'cache_hit_ratio': counters.get('cache_hits', 0) / lookups if lookups else 0.0,
+            'eta_seconds': remaining / cell_rate if cell_rate > 0 else None
+        }
@@ -0,0 +1,54 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_INSTRUCTIONS = (
+    "You are a professional translator. Your task is to translate text while preserving meaning and tone. "
+    "Keep placeholders such as ⟦0⟧ exactly as they are. "
+    "Only respond with the translated text, no explanations or additional content."
+)
+
+FALLBACK_TEMPLATE = "Please translate the following text from {current_lang} to {target_lang}:\n\n{text}"
+
+PAYLOAD_NOTE = "The user message contains only the text to translate."
+
+class PromptLayout:
+    """Chat messages for one task and language pair: a static prefix, then the cell text.
+
+    Everything that is the same for every cell (instructions, languages, field
+    context, glossary) is in the system message, and the user message carries
+    only the text. Requests therefore share an identical prefix, which lets the
+    provider's prompt caching reuse it.
+    """
+    def __init__(self, system_message: str):
+        self.system_message = system_message
+        self._prefix = {"role": "system", "content": system_message}
+
+    def messages(self, text: str) -> list:
+        return [self._prefix, {"role": "user", "content": text}]
+
+def _format_glossary(glossary: dict) -> str:
+    lines = [f"- {source} → {target}" for source, target in sorted(glossary.items())]
+    return "Always use these translations for the following terms:\n" + "\n".join(lines)
+
+def compile_prompt(config, prompt_template: str, current_lang: str, target_lang: str,
+                   field: str = "", glossary: dict = None) -> PromptLayout:
+    """Build the static prompt prefix for a task and language pair once.
+
+    The template is formatted without the text. The default template also gets
+    the field context; a custom template missing placeholders falls back to
+    FALLBACK_TEMPLATE.
+    """
+    if prompt_template == config.get_default_prompt():
+        instructions = config.format_prompt(current_lang=current_lang, target_lang=target_lang, text="", field=field)
+    else:
+        try:
+            instructions = prompt_template.format(current_lang=current_lang, target_lang=target_lang, text="")
+        except KeyError:
+            logger.warning("Prompt template missing placeholders, using fallback template")
+            instructions = FALLBACK_TEMPLATE.format(current_lang=current_lang, target_lang=target_lang, text="")
+    parts = [SYSTEM_INSTRUCTIONS, instructions.strip()]
+    if glossary:
+        parts.append(_format_glossary(glossary))
+    parts.append(PAYLOAD_NOTE)
+    return PromptLayout("\n\n".join(parts))
@@ -0,0 +1,143 @@
+import threading
+from contextlib import contextmanager
+from .task_control import TaskControl, RequestSlots, RateLimiter
+
+# Each line break counts as this many characters when scoring a cell's complexity
+LINE_BREAK_WEIGHT = 40
+
+class ModelRoute:
+    """A model together with its own concurrency and rate-limit budget."""
+    def __init__(self, name: str, model: str, max_chars: int = None, max_concurrency: int = 4,
+                 requests_per_minute: float = 0, prompt_price: float = 0.0, completion_price: float = 0.0,
+                 expected_latency: float = 2.0, cached_prompt_price: float = None):
+        self.name = name
+        self.model = model
+        self.max_chars = max_chars
+        # Prices are per 1K tokens
+        self.prompt_price = prompt_price
+        self.completion_price = completion_price
+        # Prompt tokens served from the provider's prompt cache are usually billed at a discount
+        self.cached_prompt_price = prompt_price if cached_prompt_price is None else cached_prompt_price
+        # Typical seconds per request, used for duration estimates
+        self.expected_latency = expected_latency
+        self.slots = RequestSlots(max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ModelRoute":
+        return cls(
+            name=data['name'],
+            model=data['model'],
+            max_chars=data.get('max_chars'),
+            max_concurrency=data.get('max_concurrency', 4),
+            requests_per_minute=data.get('requests_per_minute', 0),
+            prompt_price=data.get('prompt_price', 0.0),
+            completion_price=data.get('completion_price', 0.0),
+            expected_latency=data.get('expected_latency', 2.0),
+            cached_prompt_price=data.get('cached_prompt_price')
+        )
+
+    @contextmanager
+    def acquire(self, control=None, shared_slots=None):
+        """Hold one of this route's request slots, respecting its rate limit.
+
+        With shared_slots, one of those is held as well. The route slot is given
+        back while none of them is free or the task is paused, so a waiting or
+        paused task never keeps other tasks off this route.
+        """
+        rate_taken = False
+        while True:
+            with self.slots.acquire(control):
+                if not rate_taken:
+                    self.rate_limiter.acquire(control)
+                    rate_taken = True
+                if shared_slots is None:
+                    yield
+                    return
+                with shared_slots.acquire_spare(TaskControl.POLL_INTERVAL) as taken:
+                    if taken and not (control is not None and control.is_paused):
+                        yield
+                        return
+            if control is not None:
+                control.wait_if_paused()
+
+    @contextmanager
+    def acquire_spare(self):
+        """Hold a slot only if one is free and the rate budget is idle; yields whether it did."""
+        with self.slots.acquire_spare() as taken:
+            yield taken and self.rate_limiter.try_acquire()
+
+    def cost(self, prompt_tokens: int, completion_tokens: int, cached_prompt_tokens: int = 0) -> float:
+        """Price of a request; cached_prompt_tokens is the part of prompt_tokens served from the prompt cache."""
+        uncached = prompt_tokens - cached_prompt_tokens
+        return (
+            uncached * self.prompt_price + cached_prompt_tokens * self.cached_prompt_price
+            + completion_tokens * self.completion_price
+        ) / 1000
+
+class ModelRouter:
+    """Send short or simple cells to a fast model and long or high-risk cells to a stronger one.
+
+    Routes are tried in order; a cell goes to the first route whose max_chars it
+    fits. The last route takes everything else, including high-risk fields.
+    """
+    def __init__(self, routes: list, high_risk_fields=()):
+        if not routes:
+            raise ValueError("At least one model route is required")
+        self.routes = routes
+        self.high_risk_fields = {field.strip().lower() for field in high_risk_fields if field.strip()}
+
+    @classmethod
+    def from_config(cls, config) -> "ModelRouter":
+        return cls(
+            [ModelRoute.from_dict(route) for route in config.model_routes],
+            config.high_risk_fields
+        )
+
+    def _complexity(self, text: str) -> int:
+        return len(text) + LINE_BREAK_WEIGHT * text.count("\n")
+
+    def route(self, text: str, field: str = "") -> ModelRoute:
+        if field and field.strip().lower() in self.high_risk_fields:
+            return self.routes[-1]
+        complexity = self._complexity(text)
+        for route in self.routes[:-1]:
+            if route.max_chars is None or complexity <= route.max_chars:
+                return route
+        return self.routes[-1]
+
+class RouteStats:
+    """Per-task request count, latency, token usage and cost of one route."""
+    def __init__(self, route: ModelRoute):
+        self.route = route
+        self.requests = 0
+        self.total_latency = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_prompt_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0, cached_prompt_tokens: int = 0):
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cached_prompt_tokens += cached_prompt_tokens
+
+    @property
+    def cost(self) -> float:
+        return self.route.cost(self.prompt_tokens, self.completion_tokens, self.cached_prompt_tokens)
+
+    def summary(self) -> dict:
+        return {
+            'route': self.route.name,
+            'model': self.route.model,
+            'requests': self.requests,
+            'avg_latency': self.total_latency / self.requests if self.requests else 0.0,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cached_prompt_tokens': self.cached_prompt_tokens,
+            'cached_prompt_ratio': self.cached_prompt_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            'cost': self.cost
+        }
@@ -0,0 +1,236 @@
+import hmac
+import json
+import logging
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .cache import TranslationCache
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of parameters in one query, so lookups are capped per request
+MAX_LOOKUP_KEYS = 900
+# Larger request bodies are refused without being read
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+
+class SharedMemoryClient:
+    """Client of the team translation-memory service, speaking JSON over HTTP.
+
+    Any network error marks the service unavailable for retry_after seconds;
+    during that time lookups return nothing and writes stay pending, so
+    translation carries on as if there were no shared tier.
+    """
+    def __init__(self, url: str, timeout: float = 2.0, retry_after: float = 30.0, token: str = ""):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.token = token
+        self.retry_after = retry_after
+        self._retry_at = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def _post(self, path: str, payload: dict):
+        if not self.available:
+            return None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(
+            f"{self.url}{path}", data=json.dumps(payload).encode("utf-8"), headers=headers, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            self._retry_at = time.monotonic() + self.retry_after
+            logger.warning(
+                "Shared translation memory at %s unreachable (%s); retrying in %.0fs", self.url, e, self.retry_after
+            )
+            return None
+
+    def lookup(self, keys: list) -> dict:
+        """Return the entries found for the given keys; empty if the service is unavailable."""
+        result = self._post("/lookup", {'keys': keys})
+        return result.get('entries', {}) if result else {}
+
+    def store(self, entries: dict) -> bool:
+        """Store entries; returns False if they could not be delivered."""
+        return self._post("/store", {'entries': entries}) is not None
+
+class SharedTranslationCache(TranslationCache):
+    """Local LRU translation memory in front of the team's shared one.
+
+    Lookups stay local: prefetch() fetches the keys a batch of cells needs in
+    a few batched requests and keeps what the service knows. New translations
+    are buffered and sent in batches by flush(), or once batch_size entries
+    are pending.
+    """
+    def __init__(self, client: SharedMemoryClient, batch_size: int = 200,
+                 max_entries: int = 100000, max_pending: int = 10000):
+        super().__init__(max_entries)
+        self.client = client
+        self.batch_size = max(1, min(batch_size, MAX_LOOKUP_KEYS))
+        self.max_pending = max_pending
+        self.remote_hits = 0
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+    def prefetch(self, keys):
+        missing = [key for key in dict.fromkeys(keys) if key not in self]
+        for start in range(0, len(missing), self.batch_size):
+            if not self.client.available:
+                break
+            found = self.client.lookup(missing[start:start + self.batch_size])
+            for key, value in found.items():
+                super().put(key, value)
+            self.remote_hits += len(found)
+
+    def put(self, key: str, value: str):
+        super().put(key, value)
+        with self._pending_lock:
+            self._pending[key] = value
+            # While the service is down, keep only the newest entries
+            while len(self._pending) > self.max_pending:
+                self._pending.pop(next(iter(self._pending)))
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._pending_lock:
+            if not self._pending or not self.client.available:
+                return
+            entries, self._pending = self._pending, {}
+        items = list(entries.items())
+        for start in range(0, len(items), self.batch_size):
+            batch = dict(items[start:start + self.batch_size])
+            if not self.client.store(batch):
+                # Keep the undelivered entries for the next flush
+                with self._pending_lock:
+                    for key, value in items[start:]:
+                        self._pending.setdefault(key, value)
+                return
+
+def create_translation_cache(config) -> TranslationCache:
+    """Return the local translation cache, backed by the shared service when one is configured."""
+    if not config.shared_memory_url:
+        return TranslationCache()
+    client = SharedMemoryClient(
+        config.shared_memory_url, config.shared_memory_timeout, token=config.shared_memory_token
+    )
+    return SharedTranslationCache(client, config.shared_memory_batch_size)
+
+class SharedMemoryServer:
+    """The shared translation-memory service: a SQLite table served over HTTP.
+
+    POST /lookup {"keys": [...]} returns {"entries": {key: translation}} for
+    the keys it knows, POST /store {"entries": {...}} saves entries, and
+    GET /health reports the number of entries. With a token, every request
+    must carry it as "Authorization: Bearer <token>". Request bodies above
+    max_request_bytes are refused.
+    """
+    def __init__(self, db_path: str = ":memory:", host: str = "127.0.0.1", port: int = 8766,
+                 token: str = "", max_request_bytes: int = MAX_REQUEST_BYTES):
+        self.token = token
+        self.max_request_bytes = max_request_bytes
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS memory (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._lock = threading.Lock()
+        self.http_server = ThreadingHTTPServer((host, port), _memory_handler(self))
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.http_server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def lookup(self, keys: list) -> dict:
+        if not keys:
+            return {}
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT key, value FROM memory WHERE key IN ({','.join('?' * len(keys))})", keys
+            ).fetchall()
+        return dict(rows)
+
+    def store(self, entries: dict) -> int:
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO memory (key, value) VALUES (?, ?)", entries.items())
+            self._connection.commit()
+        return len(entries)
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.http_server.serve_forever, name="shared-memory", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        self.http_server.serve_forever()
+
+    def stop(self):
+        self.http_server.shutdown()
+        self.http_server.server_close()
+        with self._lock:
+            self._connection.close()
+
+def _memory_handler(server: SharedMemoryServer):
+    class MemoryHandler(BaseHTTPRequestHandler):
+        def _authorized(self) -> bool:
+            if not server.token:
+                return True
+            supplied = self.headers.get("Authorization", "")
+            if hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {server.token}".encode("utf-8")):
+                return True
+            self._send(401, {'error': "unauthorized"})
+            return False
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == "/health":
+                self._send(200, {'entries': server.size()})
+            else:
+                self._send(404, {'error': "not found"})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                if length > server.max_request_bytes:
+                    self.close_connection = True
+                    self._send(413, {'error': "request too large"})
+                    return
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/lookup":
+                    keys = [str(key) for key in payload.get('keys', [])][:MAX_LOOKUP_KEYS]
+                    self._send(200, {'entries': server.lookup(keys)})
+                elif self.path == "/store":
+                    entries = {str(key): str(value) for key, value in payload.get('entries', {}).items()}
+                    self._send(200, {'stored': server.store(entries)})
+                else:
+                    self._send(404, {'error': "not found"})
+            except (ValueError, AttributeError) as e:
+                self._send(400, {'error': str(e)})
+
+        def _send(self, code: int, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("Shared memory request: " + format, *args)
+
+    return MemoryHandler
@@ -0,0 +1,114 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class TaskCancelled(Exception):
+    """Raised inside a translation task once it has been cancelled."""
+
+class TaskControl:
+    """Pause/resume/cancel token checked by the translation loop between cells."""
+    POLL_INTERVAL = 0.1
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    def cancel(self):
+        """Request cancellation. Paused waiters are woken up so they can exit."""
+        self._cancelled.set()
+        self._resumed.set()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Raise TaskCancelled if the task has been cancelled."""
+        if self._cancelled.is_set():
+            raise TaskCancelled("Translation task was cancelled")
+
+    def wait_if_paused(self):
+        """Block while the task is paused, then raise if it was cancelled meanwhile."""
+        self._resumed.wait()
+        self.check()
+
+class RequestSlots:
+    """Limit on concurrent API requests shared by all running tasks.
+
+    Slots are only taken by tasks that are not paused, so pausing one task
+    frees capacity for the others.
+    """
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._semaphore = threading.BoundedSemaphore(self.limit)
+
+    @contextmanager
+    def acquire(self, control: TaskControl = None):
+        while True:
+            if control is not None:
+                control.wait_if_paused()
+            if self._semaphore.acquire(timeout=TaskControl.POLL_INTERVAL):
+                break
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    @contextmanager
+    def acquire_spare(self, timeout: float = 0):
+        """Take a slot only if one is free right now (or within timeout seconds); yields whether it was taken.
+
+        Used by work that must not sit waiting on a slot, such as prewarming.
+        """
+        taken = self._semaphore.acquire(timeout=timeout) if timeout > 0 else self._semaphore.acquire(blocking=False)
+        try:
+            yield taken
+        finally:
+            if taken:
+                self._semaphore.release()
+
+class RateLimiter:
+    """Spaces requests evenly to stay within a requests-per-minute budget (0 disables it)."""
+    def __init__(self, requests_per_minute: float):
+        self.requests_per_minute = requests_per_minute
+        self._interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take the next request slot in time only if it is due now, without waiting."""
+        if not self._interval:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self._next_time > now:
+                return False
+            self._next_time = now + self._interval
+            return True
+
+    def acquire(self, control: TaskControl = None):
+        """Wait for the next request slot in time, staying responsive to pause/cancel."""
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self._interval
+        while True:
+            if control is not None:
+                control.check()
+            delay = start - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(min(delay, TaskControl.POLL_INTERVAL))
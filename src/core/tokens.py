@@ -0,0 +1,36 @@
+import math
+
+try:
+    import tiktoken
+except ImportError:  # optional dependency, a character heuristic is used without it
+    tiktoken = None
+
+_encodings = {}
+
+def _get_encoding(model: str):
+    if tiktoken is None:
+        return None
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding("cl100k_base")
+    return _encodings[model]
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """Count tokens locally with tiktoken, or estimate them when it is not installed.
+
+    The estimate counts roughly four characters per token for alphabetic scripts
+    and one token per CJK character.
+    """
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    wide = sum(1 for char in text if ord(char) >= 0x2E80)
+    return math.ceil((len(text) - wide) / 4) + wide
+
+# Per-message overhead of the chat format (role markers and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+def count_message_tokens(messages: list, model: str = "gpt-3.5-turbo") -> int:
+    return sum(count_tokens(message['content'], model) + MESSAGE_OVERHEAD_TOKENS for message in messages)
@@ -0,0 +1,102 @@
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+class Tracer:
+    """Records timed spans and exports them in the Chrome trace / Perfetto JSON format."""
+    enabled = True
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._events = []
+        self._thread_names = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter(), category, args)
+
+    def add_span(self, name: str, start: float, end: float, category: str = "phase", args: dict = None):
+        """Record a span measured with perf_counter() timestamps on the current thread."""
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': self._pid,
+            'tid': thread.ident
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self._events.append(event)
+            self._thread_names.setdefault(thread.ident, thread.name)
+
+    def to_chrome_trace(self) -> dict:
+        with self._lock:
+            metadata = [{
+                'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': 0,
+                'args': {'name': self.name or 'excel-gpt-translator'}
+            }]
+            for tid, thread_name in self._thread_names.items():
+                metadata.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                    'args': {'name': thread_name}
+                })
+            return {'traceEvents': metadata + list(self._events), 'displayTimeUnit': 'ms'}
+
+    def export(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        return path
+
+class NullTracer:
+    """Tracer stand-in used when tracing is off; every call is a no-op."""
+    enabled = False
+    _NULL_SPAN = nullcontext()
+
+    def now(self) -> float:
+        return 0.0
+
+    def span(self, name: str, category: str = "phase", **args):
+        return self._NULL_SPAN
+
+    def add_span(self, name: str, start: float, end: float, category: str = "phase", args: dict = None):
+        pass
+
+NULL_TRACER = NullTracer()
+
+class TaskProfiler:
+    """cProfile session for one task, dumped to a .prof file when stopped.
+
+    Only the thread that starts the profiler is profiled, i.e. the task thread
+    doing the scan, workbook I/O and result handling; API waits show up in the trace.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self._profiler = cProfile.Profile()
+
+    def start(self):
+        self._profiler.enable()
+
+    def stop(self) -> Path:
+        self._profiler.disable()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._profiler.dump_stats(str(self.path))
+        return self.path
@@ -1,20 +1,69 @@
 import pandas as pd
-from openai import OpenAI
 from pathlib import Path
 import json
 from tqdm import tqdm
 import re
 from PyQt6.QtCore import QObject, pyqtSignal
 import os
-from openpyxl import load_workbook
+from openpyxl.comments import Comment
+from openpyxl.utils import range_boundaries, get_column_letter
+from copy import copy
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .task_control import TaskControl, TaskCancelled, RequestSlots
+from .language_detect import detect_language
+from .masking import mask_text, unmask_text, placeholders_intact, is_fully_protected
+from .routing import ModelRouter, RouteStats
+from .cache import TranslationCache
+from .shared_memory import create_translation_cache
+from .client_pool import ClientPool
+from .cassette import wrap_client
+from .writer import BackgroundWriter
+from .work_items import WorkItems
+from .formats import open_workbook, is_csv_file, output_suffix, CsvTable, CSV_CHUNK_ROWS
+from .metrics import TaskMetrics
+from .tracing import Tracer, TaskProfiler, NULL_TRACER
+from .progress import ProgressReporter
+from .prompts import compile_prompt
+from .tokens import count_tokens, count_message_tokens
+from collections import Counter
+import math
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Output modes: one workbook per target language, or every language in a single workbook
+OUTPUT_FILES = "files"
+OUTPUT_COLUMNS = "columns"
+OUTPUT_SHEETS = "sheets"
+
+# Expected completion length relative to the source text, used by dry_run
+COMPLETION_TOKEN_RATIO = 1.3
 
 class Translator(QObject):
     progress_updated = pyqtSignal(int)
+    stats_updated = pyqtSignal(dict)
     
-    def __init__(self, config):
+    def __init__(self, config, request_slots=None, router=None, cache=None, client_pool=None):
         super().__init__()
         self.config = config
-        self.client = OpenAI(api_key=config.get_api_key())
+        # Requests are balanced over the configured keys/endpoints. Without an
+        # API key the translator can still scan and plan (dry_run)
+        self.client = client_pool or ClientPool.from_config(config)
+        # Optionally record the API traffic to a cassette, or replay one offline
+        self.client = wrap_client(config, self.client)
+        # Client pool, slots, routes and cache may be shared between translators so that
+        # concurrent tasks respect one set of limits and reuse each other's results
+        self.request_slots = request_slots or RequestSlots(config.max_concurrent_requests)
+        self.router = router or ModelRouter.from_config(config)
+        self.cache = cache if cache is not None else create_translation_cache(config)
+        self.route_stats = {}
+        self.task_data = {}
+        self._prompts = {}  # (current, target, template) -> PromptLayout, compiled once per task
+        self.metrics = TaskMetrics()
+        self.tracer = NULL_TRACER
+        self.progress = None
     
     def _parse_cell_range(self, cell_range: str) -> tuple:
         """Parse the cell range (e.g., "A1:B4") into start and end cell references."""
@@ -38,90 +87,697 @@ class Translator(QObject):
         col_letter = self._get_column_letter(col_idx)
         return f"{col_letter}{row_idx + 1}"
 
-    def translate_excel(self, task_data):
-        """Translate an Excel file according to the task settings."""
+    def translate_excel(self, task_data, control=None):
+        """Translate an Excel file according to the task settings.
+        
+        The optional TaskControl is checked between cells; on cancellation the
+        cells translated so far are saved and TaskCancelled is raised.
+        """
+        control = control or TaskControl()
         self.task_data = task_data  # Store task data for use in _translate_text
+        self._prompts = {}
         file_path = task_data['file']
-        sheet_name = task_data['sheet']
+        sheet_name = task_data.get('sheet')
         cell_range = task_data.get('cell_range')
-        if not cell_range:
+        # CSV files are streamed and select columns instead of a cell range
+        csv_input = is_csv_file(file_path)
+        if not cell_range and not csv_input:
             raise ValueError("Cell range is required. Please specify a range (e.g., 'A1:B4')")
             
         current_lang = task_data['current_language']
         target_langs = task_data['target_languages']
         comparison_mode = task_data['comparison_mode']
+        output_mode = task_data.get('output_mode', OUTPUT_FILES)
+        skip_target_language = task_data.get('skip_target_language', True)
+        skip_other_languages = task_data.get('skip_other_languages', False)
         prompt_template = task_data.get('prompt', 
             "Please translate the following text from {current_lang} to {target_lang}:\n\n{text}"
         )
         
+        self.route_stats = {route.name: RouteStats(route) for route in self.router.routes}
+        self.metrics = TaskMetrics(Path(file_path).name)
+        self.language_stats = {
+            'skipped_target_language': 0,
+            'skipped_other_language': 0,
+            'calls_avoided': 0
+        }
+        self.tracer = self._create_tracer(task_data)
+        profiler = self._create_profiler(task_data)
+        if profiler:
+            profiler.start()
+        task_span = self.tracer.now()
+        
         try:
-            # Read Excel file using openpyxl to preserve formatting
-            wb = load_workbook(file_path)
-            sheet = wb[sheet_name]
+            if csv_input:
+                self._translate_csv(task_data, control, prompt_template)
+                self._log_task_summary()
+                return
             
-            # Parse the cell range to get start and end cells
-            start_cell, end_cell = self._parse_cell_range(cell_range)
+            # Validate the cell range format
+            self._parse_cell_range(cell_range)
             
-            # Get the cells to translate - only those with text content
-            cells_to_translate = []
-            for row in sheet[start_cell:end_cell]:
-                for cell in row:
-                    if self._should_translate_cell(cell):
-                        cells_to_translate.append(cell)
+            # In single-output modes every language is written into the loaded workbook.
+            # In files mode the scan streams the source and each language loads its own copy,
+            # so the source workbook is never held while translating
+            single_output = output_mode in (OUTPUT_COLUMNS, OUTPUT_SHEETS)
+            if single_output:
+                with self.tracer.span("load_workbook"):
+                    wb = open_workbook(file_path)
+                    sheet = wb[sheet_name]
+                with self.tracer.span("scan_cells", cell_range=cell_range):
+                    items = self._scan_work_items(sheet, cell_range)
+            else:
+                with self.tracer.span("load_workbook"):
+                    source_wb = open_workbook(file_path, read_only=True)
+                try:
+                    with self.tracer.span("scan_cells", cell_range=cell_range):
+                        items = self._scan_work_items(source_wb[sheet_name], cell_range)
+                finally:
+                    source_wb.close()
             
-            print(f"Found {len(cells_to_translate)} cells with text content to translate")
+            logger.info(
+                "Found %d cells with text content to translate (%d distinct strings)", len(items), len(items.texts)
+            )
             
-            # Calculate total cells for progress tracking
-            total_cells = len(cells_to_translate) * len(target_langs)
-            processed_cells = 0
+            # Detect the language of each distinct string once, locally, for all target languages
+            with self.tracer.span("detect_languages"):
+                detected_languages = None
+                if skip_target_language or skip_other_languages:
+                    detected_languages = [detect_language(text) for text in items.texts]
             
-            # Process each target language
-            for target_lang in target_langs:
-                # Create a new workbook for this translation
-                output_path = self._get_output_path(file_path, target_lang)
-                
-                # Copy the original workbook
-                wb.save(output_path)
-                new_wb = load_workbook(output_path)
-                new_sheet = new_wb[sheet_name]
-                
-                # Translate each cell
-                for cell in cells_to_translate:
+            # Progress is counted in work units: one cell for one target language
+            self.progress = ProgressReporter(
+                len(items) * len(target_langs), self.metrics,
+                self.progress_updated.emit, self.stats_updated.emit, self.config.progress_interval
+            )
+            
+            if single_output:
+                single_output_path = self._get_output_path(file_path, "translated")
+            if output_mode == OUTPUT_COLUMNS:
+                with self.tracer.span("prepare_columns"):
+                    column_offsets = self._prepare_language_columns(sheet, cell_range, target_langs)
+            
+            # Per-language workbooks are loaded, written and saved in the background while
+            # the next language is translated; a failed save stops the task
+            writer = BackgroundWriter(self.config.max_pending_writes, self.tracer, on_error=lambda e: control.cancel())
+            try:
+                # Process each target language
+                for lang_index, target_lang in enumerate(target_langs):
+                    writer.check()
+                    control.check()
+                    
+                    # Strings already in the target language (or, optionally, in neither language) are left as is
+                    lang_texts = {}  # text -> text id, for the strings to translate
+                    skipped = 0
+                    for text_id, text in enumerate(items.texts):
+                        skip_reason = None
+                        if detected_languages is not None:
+                            skip_reason = self._language_skip_reason(
+                                detected_languages[text_id], current_lang, target_lang,
+                                skip_target_language, skip_other_languages
+                            )
+                        if skip_reason:
+                            cell_count = items.cell_counts[text_id]
+                            self.language_stats[skip_reason] += cell_count
+                            self.language_stats['calls_avoided'] += cell_count
+                            skipped += cell_count
+                        else:
+                            lang_texts[text] = text_id
+                    self.metrics.inc('cells_skipped', skipped)
+                    self.progress.advance(skipped)
+                    
+                    column_offset = 0
+                    if output_mode == OUTPUT_COLUMNS:
+                        new_sheet = sheet
+                        column_offset = column_offsets[lang_index]
+                    elif output_mode == OUTPUT_SHEETS:
+                        with self.tracer.span("copy_sheet", language=target_lang):
+                            new_sheet = self._add_language_sheet(wb, sheet, target_lang)
+                    
+                    results = items.new_results()
+                    
+                    def store_result(cell_str, text_id, translated_text):
+                        results[text_id] = translated_text
+                        cell_count = items.cell_counts[text_id]
+                        self.metrics.inc('cells_translated', cell_count)
+                        self.progress.advance(cell_count)
+                    
                     try:
-                        # Get cell text
-                        cell_str = self._get_cell_text(cell)
-                        print(f"\nProcessing cell {cell.coordinate} with value: {cell_str}")
-                        
-                        # Translate the cell content
-                        translated_text = self._translate_text(
-                            cell_str, current_lang, target_lang, prompt_template
-                        )
-                        
-                        # Get the target cell in the new workbook
-                        target_cell = new_sheet[cell.coordinate]
-                        
-                        if comparison_mode:
-                            # Format with original and translated text
-                            target_cell.value = f"{cell_str}\n\n{translated_text}"
-                            target_cell.alignment = target_cell.alignment.copy(wrap_text=True)
+                        with self.tracer.span("translate_cells", language=target_lang, cells=len(items) - skipped):
+                            self._translate_groups(
+                                lang_texts, current_lang, target_lang, prompt_template, control, store_result
+                            )
+                    finally:
+                        # Write and save the translations, including partial results after a cancel or error
+                        if single_output:
+                            with self.tracer.span("write_cells", language=target_lang):
+                                self._write_results(items, results, new_sheet, column_offset, comparison_mode)
                         else:
-                            target_cell.value = translated_text
-                        
-                        # Update progress
-                        processed_cells += 1
-                        progress = int((processed_cells / total_cells) * 100)
-                        self.progress_updated.emit(progress)
-                        
+                            # Loading the language's copy of the workbook is left to the writer
+                            # too, so the next language's requests go out right away
+                            writer.submit(
+                                partial(self._write_language_file, file_path, sheet_name, items, results, comparison_mode),
+                                self._get_output_path(file_path, target_lang), language=target_lang
+                            )
+            finally:
+                # Wait for pending saves; a failed save is raised from here
+                writer.close()
+                if single_output:
+                    with self.tracer.span("save_workbook"):
+                        wb.save(single_output_path)
+                self.progress.finish()
+            
+            self._log_task_summary()
+            
+        except TaskCancelled:
+            logger.info("Translation task cancelled, partial output saved")
+            raise
+        except Exception:
+            logger.exception("Error in translate_excel")
+            raise
+        finally:
+            self.tracer.add_span("translate_excel", task_span, self.tracer.now(), args={'file': file_path})
+            if profiler:
+                logger.info("Profile written to %s", profiler.stop())
+            self._finish_metrics(file_path)
+            self._finish_trace(task_data)
+    
+    def _scan_work_items(self, sheet, cell_range) -> WorkItems:
+        """Collect the position and text of every translatable cell of the range."""
+        items = WorkItems()
+        for cell in self._iter_range(sheet, cell_range):
+            if self._should_translate_cell(cell):
+                items.add(cell.row, cell.column, self._get_cell_text(cell))
+        return items
+    
+    def _write_results(self, items, results, sheet, column_offset, comparison_mode):
+        """Write one language's translations into the output sheet; untranslated cells are left as they are."""
+        texts = items.texts
+        for row, column, text_id in items:
+            translated_text = results[text_id]
+            if translated_text is None:
+                continue
+            target_cell = sheet.cell(row=row, column=column + column_offset)
+            if comparison_mode:
+                # Format with original and translated text
+                target_cell.value = f"{texts[text_id]}\n\n{translated_text}"
+                target_cell.alignment = target_cell.alignment.copy(wrap_text=True)
+            else:
+                target_cell.value = translated_text
+    
+    def _write_language_file(self, file_path, sheet_name, items, results, comparison_mode, output_path):
+        """Write one language's translations into a fresh copy of the source workbook and save it."""
+        with self.tracer.span("copy_workbook"):
+            wb = open_workbook(file_path)
+        with self.tracer.span("write_cells"):
+            self._write_results(items, results, wb[sheet_name], 0, comparison_mode)
+        wb.save(output_path)
+    
+    def _log_task_summary(self):
+        logger.info(
+            "Language pre-pass: %d API calls avoided (%d already in target language, %d in other languages)",
+            self.language_stats['calls_avoided'], self.language_stats['skipped_target_language'],
+            self.language_stats['skipped_other_language']
+        )
+        for stats in self.route_stats.values():
+            summary = stats.summary()
+            logger.info(
+                "Route %s (%s): %d requests, avg latency %.2fs, %d+%d tokens (%d prompt tokens cached, %.0f%%), cost $%.4f",
+                summary['route'], summary['model'], summary['requests'], summary['avg_latency'],
+                summary['prompt_tokens'], summary['completion_tokens'], summary['cached_prompt_tokens'],
+                summary['cached_prompt_ratio'] * 100, summary['cost']
+            )
+    
+    def _translate_csv(self, task_data, control, prompt_template):
+        """Translate the selected columns of a CSV file, streaming it in chunks of rows.
+        
+        Memory stays constant however long the file is: each chunk is read,
+        translated for every target language and written out before the next
+        one. In files mode each language gets a copy of the file; in columns mode
+        one file gets a translated column per selected column and language.
+        """
+        file_path = task_data['file']
+        current_lang = task_data['current_language']
+        target_langs = task_data['target_languages']
+        comparison_mode = task_data['comparison_mode']
+        output_mode = task_data.get('output_mode', OUTPUT_FILES)
+        skip_target_language = task_data.get('skip_target_language', True)
+        skip_other_languages = task_data.get('skip_other_languages', False)
+        if output_mode not in (OUTPUT_FILES, OUTPUT_COLUMNS):
+            raise ValueError("CSV files can only be written as separate files or with language columns")
+        
+        table = CsvTable(file_path, task_data.get('columns'), task_data.get('has_header', True))
+        
+        # Count the work up front in a streaming pass so progress and ETA are meaningful
+        with self.tracer.span("scan_cells"):
+            total_cells = sum(1 for cell in table.cells() if self._should_translate_cell(cell))
+        logger.info("Found %d cells with text content to translate", total_cells)
+        self.progress = ProgressReporter(
+            total_cells * len(target_langs), self.metrics,
+            self.progress_updated.emit, self.stats_updated.emit, self.config.progress_interval
+        )
+        
+        outputs = []
+        try:
+            if output_mode == OUTPUT_FILES:
+                writers = {lang: table.writer(self._get_output_path(file_path, lang)) for lang in target_langs}
+                outputs = list(writers.values())
+                if table.header is not None:
+                    for _, writer in writers.values():
+                        writer.writerow(table.header)
+            else:
+                output = table.writer(self._get_output_path(file_path, "translated"))
+                outputs = [output]
+                if table.header is not None:
+                    output[1].writerow(table.header + [
+                        f"{name} ({lang})" for lang in target_langs for name in table.column_names()
+                    ])
+            
+            chunks = table.chunks(CSV_CHUNK_ROWS)
+            for rows, cells in chunks:
+                # Translations of this chunk: language -> {(row index, field index): value}
+                results = {lang: {} for lang in target_langs}
+                try:
+                    control.check()
+                    self._translate_csv_chunk(
+                        cells, results, current_lang, prompt_template, control, comparison_mode,
+                        skip_target_language, skip_other_languages
+                    )
+                except BaseException:
+                    # Write the partial results, then the rest of the file untranslated,
+                    # so a cancel or error never leaves a truncated output behind
+                    with self.tracer.span("write_rows", rows=len(rows)):
+                        self._write_csv_chunk(rows, results, table, output_mode, outputs)
+                        for rows, _ in chunks:
+                            self._write_csv_chunk(rows, {lang: {} for lang in target_langs}, table, output_mode, outputs)
+                    raise
+                with self.tracer.span("write_rows", rows=len(rows)):
+                    self._write_csv_chunk(rows, results, table, output_mode, outputs)
+        finally:
+            for f, _ in outputs:
+                f.close()
+            self.progress.finish()
+    
+    def _translate_csv_chunk(self, cells, results, current_lang, prompt_template, control, comparison_mode,
+                             skip_target_language, skip_other_languages):
+        """Translate the cells of one CSV chunk into results, which maps each target language to its values."""
+        cells = [cell for cell in cells if self._should_translate_cell(cell)]
+        with self.tracer.span("detect_languages"):
+            detected_languages = {}
+            if skip_target_language or skip_other_languages:
+                for cell in cells:
+                    text = self._get_cell_text(cell)
+                    if text not in detected_languages:
+                        detected_languages[text] = detect_language(text)
+        
+        for target_lang, lang_results in results.items():
+            lang_cells = []
+            for cell in cells:
+                skip_reason = self._language_skip_reason(
+                    detected_languages.get(self._get_cell_text(cell)), current_lang, target_lang,
+                    skip_target_language, skip_other_languages
+                )
+                if skip_reason:
+                    self.language_stats[skip_reason] += 1
+                    self.language_stats['calls_avoided'] += 1
+                else:
+                    lang_cells.append(cell)
+            self.metrics.inc('cells_skipped', len(cells) - len(lang_cells))
+            self.progress.advance(len(cells) - len(lang_cells))
+            
+            def store_result(cell, cell_str, translated_text):
+                if comparison_mode:
+                    translated_text = f"{cell_str}\n\n{translated_text}"
+                lang_results[(cell.index, cell.column - 1)] = translated_text
+                self.metrics.inc('cells_translated')
+                self.progress.advance()
+            
+            with self.tracer.span("translate_cells", language=target_lang, cells=len(lang_cells)):
+                self._translate_cells(
+                    lang_cells, current_lang, target_lang, prompt_template, control, store_result
+                )
+    
+    def _write_csv_chunk(self, rows, results, table, output_mode, outputs):
+        if output_mode == OUTPUT_FILES:
+            for (_, writer), lang_results in zip(outputs, results.values()):
+                for row_index, row in enumerate(rows):
+                    row = list(row)
+                    for column_index in table.column_indexes:
+                        if (row_index, column_index) in lang_results:
+                            row[column_index] = lang_results[(row_index, column_index)]
+                    writer.writerow(row)
+            return
+        writer = outputs[0][1]
+        width = len(table.header) if table.header is not None else 0
+        for row_index, row in enumerate(rows):
+            extra = []
+            for lang_results in results.values():
+                for column_index in table.column_indexes:
+                    original = row[column_index] if column_index < len(row) else ""
+                    extra.append(lang_results.get((row_index, column_index), original))
+            # Pad short rows so the language columns line up under their headers
+            writer.writerow(list(row) + [""] * (width - len(row)) + extra)
+    
+    def dry_run(self, task_data, control=None):
+        """Plan a task without calling the API.
+        
+        Runs the cell scan, language pre-pass, deduplication and cache lookups, and
+        estimates tokens, requests, cost and duration from the configured model
+        routes and limits. Returns the plan as a dictionary. The scan raises
+        TaskCancelled once the given control is cancelled.
+        """
+        self.task_data = task_data
+        self._prompts = {}
+        current_lang = task_data['current_language']
+        target_langs = task_data['target_languages']
+        field = task_data.get('field', '')
+        skip_target_language = task_data.get('skip_target_language', True)
+        skip_other_languages = task_data.get('skip_other_languages', False)
+        prompt_template = self._prompt_template()
+        
+        counts, detected_languages = self._scan_texts(task_data, control)
+        
+        routes = {route.name: {
+            'model': route.model, 'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0
+        } for route in self.router.routes}
+        plan = {
+            'translatable_cells': sum(counts.values()),
+            'unique_strings': len(counts),
+            'target_languages': len(target_langs),
+            'cells_skipped_by_language': 0,
+            'cache_hits': 0,
+            'requests': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'cost': 0.0,
+            'duration_seconds': 0.0,
+            'routes': routes
+        }
+        
+        for target_lang in target_langs:
+            lang_requests = {}
+            prompt = self._prompt_layout(current_lang, target_lang, prompt_template).system_message
+            self.cache.prefetch(
+                TranslationCache.make_key(
+                    self.router.route(text, field).model, current_lang, target_lang, field, prompt, text
+                ) for text in counts
+            )
+            for text, count in counts.items():
+                if self._language_skip_reason(
+                    detected_languages.get(text), current_lang, target_lang,
+                    skip_target_language, skip_other_languages
+                ):
+                    plan['cells_skipped_by_language'] += count
+                    continue
+                route = self.router.route(text, field)
+                key = TranslationCache.make_key(route.model, current_lang, target_lang, field, prompt, text)
+                if key in self.cache:
+                    plan['cache_hits'] += 1
+                    continue
+                
+                masked_text = mask_text(text).text
+                messages = self._build_messages(masked_text, current_lang, target_lang, prompt_template)
+                prompt_tokens = count_message_tokens(messages, route.model)
+                completion_tokens = math.ceil(count_tokens(masked_text, route.model) * COMPLETION_TOKEN_RATIO)
+                route_plan = routes[route.name]
+                route_plan['requests'] += 1
+                route_plan['prompt_tokens'] += prompt_tokens
+                route_plan['completion_tokens'] += completion_tokens
+                route_plan['cost'] += route.cost(prompt_tokens, completion_tokens)
+                lang_requests[route] = lang_requests.get(route, 0) + 1
+            # Target languages are processed one after another
+            plan['duration_seconds'] += self._estimate_duration(lang_requests)
+        
+        for route_plan in routes.values():
+            plan['requests'] += route_plan['requests']
+            plan['prompt_tokens'] += route_plan['prompt_tokens']
+            plan['completion_tokens'] += route_plan['completion_tokens']
+            plan['cost'] += route_plan['cost']
+        return plan
+    
+    def _scan_texts(self, task_data, control=None):
+        """Count the distinct translatable strings of a task and detect their languages if needed.
+        
+        Returns (Counter of text -> cells, dict of text -> detected language).
+        Only the distinct strings are kept, so large CSV files can be scanned too.
+        """
+        control = control or TaskControl()
+        cell_range = task_data.get('cell_range')
+        counts = Counter()
+        if is_csv_file(task_data['file']):
+            table = CsvTable(task_data['file'], task_data.get('columns'), task_data.get('has_header', True))
+            counts.update(
+                self._get_cell_text(cell) for cell in self._checked(table.cells(), control)
+                if self._should_translate_cell(cell)
+            )
+        else:
+            if not cell_range:
+                raise ValueError("Cell range is required. Please specify a range (e.g., 'A1:B4')")
+            self._parse_cell_range(cell_range)
+            wb = open_workbook(task_data['file'], read_only=True)
+            try:
+                sheet = wb[task_data['sheet']]
+                counts.update(
+                    self._get_cell_text(cell) for cell in self._checked(self._iter_range(sheet, cell_range), control)
+                    if self._should_translate_cell(cell)
+                )
+            finally:
+                wb.close()
+        
+        control.check()
+        detected_languages = {}
+        if task_data.get('skip_target_language', True) or task_data.get('skip_other_languages', False):
+            detected_languages = {text: detect_language(text) for text in counts}
+        return counts, detected_languages
+    
+    @staticmethod
+    def _checked(cells, control, every: int = 1000):
+        """Pass cells through, checking for cancellation every so many cells."""
+        for index, cell in enumerate(cells):
+            if index % every == 0:
+                control.check()
+            yield cell
+    
+    def prewarm_candidates(self, task_data) -> list:
+        """List the requests a queued task would make that the translation memory can't answer yet.
+        
+        Returns (text, target language, route) tuples, one per distinct string and
+        language, for prewarm(). The scan is the same as dry_run's.
+        """
+        if self.client is None:
+            return []
+        self.task_data = task_data
+        self._prompts = {}
+        current_lang = task_data['current_language']
+        field = task_data.get('field', '')
+        prompt_template = self._prompt_template()
+        counts, detected_languages = self._scan_texts(task_data)
+        
+        candidates = []
+        for target_lang in task_data['target_languages']:
+            prompt = self._prompt_layout(current_lang, target_lang, prompt_template).system_message
+            keys = {
+                text: TranslationCache.make_key(
+                    self.router.route(text, field).model, current_lang, target_lang, field, prompt, text
+                ) for text in counts
+            }
+            self.cache.prefetch(keys.values())
+            for text, key in keys.items():
+                if key in self.cache or self._language_skip_reason(
+                    detected_languages.get(text), current_lang, target_lang,
+                    task_data.get('skip_target_language', True), task_data.get('skip_other_languages', False)
+                ):
+                    continue
+                candidates.append((text, target_lang, self.router.route(text, field)))
+        return candidates
+    
+    def prewarm(self, text: str, target_lang: str, route):
+        """Translate one candidate from prewarm_candidates() into the translation memory.
+        
+        The caller holds the request slot and route budget.
+        """
+        current_lang = self.task_data['current_language']
+        field = self.task_data.get('field', '')
+        prompt_template = self._prompt_template()
+        prompt = self._prompt_layout(current_lang, target_lang, prompt_template).system_message
+        key = TranslationCache.make_key(route.model, current_lang, target_lang, field, prompt, text)
+        if key in self.cache:
+            return
+        self.cache.put(key, self._translate_masked(text, current_lang, target_lang, prompt_template, route))
+    
+    def _prompt_template(self) -> str:
+        return self.task_data.get('prompt', 
+            "Please translate the following text from {current_lang} to {target_lang}:\n\n{text}"
+        )
+    
+    def _estimate_duration(self, route_requests):
+        """Estimate the wall time of a batch of requests under the concurrency and rate limits."""
+        longest = 0.0
+        total_work = 0.0
+        for route, requests in route_requests.items():
+            concurrency = min(route.slots.limit, self.request_slots.limit)
+            longest = max(longest, requests * route.expected_latency / concurrency)
+            if route.rate_limiter.requests_per_minute > 0:
+                longest = max(longest, requests * 60.0 / route.rate_limiter.requests_per_minute)
+            total_work += requests * route.expected_latency
+        # All routes also share the global request slots
+        return max(longest, total_work / self.request_slots.limit)
+    
+    def _iter_range(self, sheet, cell_range):
+        """Yield the cells of a range row by row; works for regular and read-only sheets."""
+        min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+        for row in sheet.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+            yield from row
+    
+    def _prepare_language_columns(self, sheet, cell_range, target_langs):
+        """Add one block of columns per target language after the last used column of the sheet.
+        
+        Nothing existing is moved, so formulas, merged cells, conditional formatting,
+        data validations and defined names keep pointing at the right cells. Each
+        block starts as a copy of the source range (values and styles) and is
+        labelled with a comment naming its language. Returns the column offset of
+        each language's block from the source range.
+        """
+        min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+        width = max_col - min_col + 1
+        first_free = max(sheet.max_column, max_col) + 1
+        offsets = [first_free - min_col + width * lang_index for lang_index in range(len(target_langs))]
+        
+        for target_lang, offset in zip(target_langs, offsets):
+            for col in range(min_col, max_col + 1):
+                source_width = sheet.column_dimensions[get_column_letter(col)].width
+                if source_width:
+                    sheet.column_dimensions[get_column_letter(col + offset)].width = source_width
+                for row in range(min_row, max_row + 1):
+                    source = sheet.cell(row=row, column=col)
+                    target = sheet.cell(row=row, column=col + offset)
+                    target.value = source.value
+                    if source.has_style:
+                        target._style = copy(source._style)
+            sheet.cell(row=min_row, column=min_col + offset).comment = Comment(
+                f"Translation: {target_lang}", "Excel GPT Translator"
+            )
+        return offsets
+    
+    def _add_language_sheet(self, wb, sheet, target_lang):
+        """Copy the source sheet into a new sheet named after the target language."""
+        new_sheet = wb.copy_worksheet(sheet)
+        suffix = f" ({target_lang})"
+        title = sheet.title[:31 - len(suffix)] + suffix
+        # Sheet titles are limited to 31 characters and must be unique
+        counter = 2
+        while title in wb.sheetnames:
+            numbered = f" ({target_lang} {counter})"
+            title = sheet.title[:31 - len(numbered)] + numbered
+            counter += 1
+        new_sheet.title = title
+        return new_sheet
+    
+    def _translate_cells(self, cells, current_lang, target_lang, prompt_template, control, on_result):
+        """Translate cells concurrently, calling on_result(cell, text, translation) as they finish.
+        
+        Cells with the same text share one request.
+        """
+        groups = {}
+        for cell in cells:
+            groups.setdefault(self._get_cell_text(cell), []).append(cell)
+        
+        def on_group(cell_str, group, translated_text):
+            for cell in group:
+                on_result(cell, cell_str, translated_text)
+        
+        self._translate_groups(groups, current_lang, target_lang, prompt_template, control, on_group)
+    
+    def _translate_groups(self, groups, current_lang, target_lang, prompt_template, control, on_result):
+        """Translate distinct texts concurrently, calling on_result(text, item, translation) as they finish.
+        
+        groups maps each text to the caller's item for it, e.g. the cells holding
+        it. Requests run on a worker pool bounded by the shared request slots and
+        by the budget of the model route each text is sent to. When the task is
+        cancelled, queued texts are dropped and in-flight requests are given up
+        to config.cancel_deadline seconds to finish before TaskCancelled is raised.
+        """
+        field = self.task_data.get('field', '')
+        # Cache entries are keyed by the compiled prompt, which covers template, field and glossary
+        prompt = self._prompt_layout(current_lang, target_lang, prompt_template).system_message
+        
+        tracer = self.tracer
+        
+        def translate_job(cell_str, submitted):
+            if tracer.enabled:
+                tracer.add_span("queue_wait", submitted, tracer.now(), "request")
+            route = self.router.route(cell_str, field)
+            cache_key = TranslationCache.make_key(
+                route.model, current_lang, target_lang, field, prompt, cell_str
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.metrics.inc('cache_hits')
+                return cached
+            self.metrics.inc('cache_misses')
+            
+            control.wait_if_paused()
+            slot_wait = tracer.now()
+            # The route's budget is taken first, so a task waiting on a throttled
+            # route does not sit on a shared slot that other routes could use
+            with route.acquire(control, self.request_slots):
+                if tracer.enabled:
+                    tracer.add_span("slot_wait", slot_wait, tracer.now(), "request", {'route': route.name})
+                result = self._translate_masked(cell_str, current_lang, target_lang, prompt_template, route)
+            self.cache.put(cache_key, result)
+            return result
+        
+        # Fetch the shared translation memory entries for all texts in a few batched requests
+        with tracer.span("cache_prefetch", texts=len(groups)):
+            self.cache.prefetch(
+                TranslationCache.make_key(
+                    self.router.route(cell_str, field).model, current_lang, target_lang, field, prompt, cell_str
+                ) for cell_str in groups
+            )
+        
+        # Enough workers for every route to use its budget while others wait on theirs
+        executor = ThreadPoolExecutor(max_workers=sum(route.slots.limit for route in self.router.routes))
+        try:
+            pending = {}
+            for cell_str, item in groups.items():
+                pending[executor.submit(translate_job, cell_str, tracer.now())] = (item, cell_str)
+            
+            while pending:
+                done, _ = wait(pending, timeout=TaskControl.POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                if self.progress is not None and not done:
+                    # Keep throughput and ETA current while no result arrives
+                    self.progress.advance(0)
+                for future in done:
+                    item, cell_str = pending.pop(future)
+                    try:
+                        translated_text = future.result()
+                    except TaskCancelled:
+                        continue
                     except Exception as e:
-                        print(f"Error processing cell {cell.coordinate}: {str(e)}")
+                        logger.error("Error translating %r: %s", cell_str[:50], e)
                         raise
+                    on_result(cell_str, item, translated_text)
                 
-                # Save the translated workbook
-                new_wb.save(output_path)
-                
-        except Exception as e:
-            print(f"Error in translate_excel: {str(e)}")
-            raise
+                if control.is_cancelled:
+                    self._drain_cancelled(pending, on_result)
+                    control.check()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+            self.cache.flush()
+    
+    def _drain_cancelled(self, pending, on_result):
+        """Drop queued requests and keep the results of in-flight ones that finish in time."""
+        for future in list(pending):
+            if future.cancel():
+                del pending[future]
+        
+        done, _ = wait(pending, timeout=self.config.cancel_deadline)
+        for future in done:
+            item, cell_str = pending.pop(future)
+            if future.exception() is None:
+                on_result(cell_str, item, future.result())
     
     def _should_translate_cell(self, cell):
         """Determine if a cell should be translated based on its content."""
@@ -133,8 +789,8 @@ class Translator(QObject):
         if isinstance(cell.value, (int, float)):
             return False
         
-        # Skip cells with formulas (formula results are shown as values)
-        if cell.data_type == 'f':
+        # Skip cells with formulas (formula results are shown as values) and error values
+        if cell.data_type in ('f', 'e'):
             return False
         
         # Skip cells with only whitespace, numbers, or special characters
@@ -152,10 +808,24 @@ class Translator(QObject):
             if len(text) < 2:
                 return False
             
+            # Skip if only URLs, emails, paths, template variables, markup or code
+            if is_fully_protected(text):
+                return False
+            
             return True
         
         return False
     
+    def _language_skip_reason(self, detected, current_lang, target_lang, skip_target_language, skip_other_languages):
+        """Return the stats key explaining why a cell is skipped, or None to translate it."""
+        if detected is None:
+            return None
+        if skip_target_language and detected == target_lang and current_lang != target_lang:
+            return 'skipped_target_language'
+        if skip_other_languages and detected not in (current_lang, target_lang):
+            return 'skipped_other_language'
+        return None
+    
     def _get_cell_text(self, cell):
         """Extract text content from a cell."""
         if isinstance(cell.value, str):
@@ -185,16 +855,16 @@ class Translator(QObject):
 
                             if cell_str:
                                 try:
-                                    print(f"\nProcessing cell [{row_idx}, {col}] with value: {cell_str} (type: {type(cell_value)})")
+                                    logger.debug("Processing cell [%d, %s] (type: %s)", row_idx, col, type(cell_value).__name__)
                                     translated_text = self._translate_text(
                                         cell_str, current_lang, target_lang, prompt_template
                                     )
                                     translated_df.iloc[row_idx, col_idx] = translated_text
                                 except Exception as e:
-                                    print(f"Translation error for cell [{row_idx}, {col}] with value '{cell_str}': {str(e)}")
+                                    logger.error("Translation error for cell [%d, %s]: %s", row_idx, col, e)
                                     raise Exception(f"Failed to translate cell [{row_idx}, {col}] with value '{cell_str}': {str(e)}")
                     except Exception as e:
-                        print(f"Error processing cell [{row_idx}, {col}]: {str(e)}")
+                        logger.error("Error processing cell [%d, %s]: %s", row_idx, col, e)
                         raise
                     
                     # Update progress after each cell
@@ -204,82 +874,143 @@ class Translator(QObject):
             
             return translated_df
         except Exception as e:
-            print(f"Error in _translate_dataframe: {str(e)}")
+            logger.error("Error in _translate_dataframe: %s", e)
             raise
     
-    def _translate_text(self, text: str, current_lang: str, target_lang: str, prompt_template: str) -> str:
-        """Translate text using GPT API."""
+    def _translate_masked(self, text: str, current_lang: str, target_lang: str, prompt_template: str, route=None) -> str:
+        """Translate text with protected spans masked as placeholders and restored afterwards.
+        
+        The request is retried when the model drops or alters a placeholder; after
+        config.mask_retries failed attempts the unmasked text is translated instead.
+        """
+        masked = mask_text(text)
+        if not masked.spans:
+            return self._translate_text(text, current_lang, target_lang, prompt_template, route)
+        
+        for attempt in range(self.config.mask_retries + 1):
+            result = self._translate_text(masked.text, current_lang, target_lang, prompt_template, route)
+            if placeholders_intact(result, len(masked.spans)):
+                return unmask_text(result, masked.spans)
+            self.metrics.inc('retries')
+            logger.warning("Placeholders lost in translation (attempt %d), retrying", attempt + 1)
+        
+        logger.warning("Placeholders could not be preserved, translating unmasked text")
+        return self._translate_text(text, current_lang, target_lang, prompt_template, route)
+    
+    def _prompt_layout(self, current_lang: str, target_lang: str, prompt_template: str):
+        """Return the task's precompiled prompt for a language pair, compiling it on first use."""
+        key = (current_lang, target_lang, prompt_template)
+        layout = self._prompts.get(key)
+        if layout is None:
+            layout = self._prompts.setdefault(key, compile_prompt(
+                self.config, prompt_template, current_lang, target_lang,
+                self.task_data.get('field', ''), self.task_data.get('glossary')
+            ))
+        return layout
+    
+    def _build_messages(self, text: str, current_lang: str, target_lang: str, prompt_template: str) -> list:
+        """Build the chat messages for one translation request."""
+        return self._prompt_layout(current_lang, target_lang, prompt_template).messages(text)
+    
+    def _translate_text(self, text: str, current_lang: str, target_lang: str, prompt_template: str, route=None) -> str:
+        """Translate text using GPT API, with the model of the given route."""
+        field = self.task_data.get('field', '')
+        route = route or self.router.route(text, field)
         try:
-            # Create a more specific system message
-            system_message = "You are a professional translator. Your task is to translate text while preserving meaning and tone. Only respond with the translated text, no explanations or additional content."
-            
-            # Format the prompt using the Config class's format_prompt method if using default prompt
-            if prompt_template == self.config.get_default_prompt():
-                user_prompt = self.config.format_prompt(
-                    current_lang=current_lang,
-                    target_lang=target_lang,
-                    text=text,
-                    field=self.task_data.get('field', '')
-                )
-            else:
-                # Use custom prompt template
-                try:
-                    user_prompt = prompt_template.format(
-                        current_lang=current_lang,
-                        target_lang=target_lang,
-                        text=text
-                    )
-                except KeyError as e:
-                    print(f"Warning: Prompt template missing placeholders. Using fallback template.")
-                    fallback_template = "Please translate the following text from {current_lang} to {target_lang}:\n\n{text}"
-                    user_prompt = fallback_template.format(
-                        current_lang=current_lang,
-                        target_lang=target_lang,
-                        text=text
-                    )
-            
-            print("\n=== Translation Request ===")
-            print(f"Source text: '{text}'")
-            print(f"From language: {current_lang}")
-            print(f"To language: {target_lang}")
-            print(f"System message: {system_message}")
-            print(f"User prompt template: {prompt_template}")
-            print(f"Formatted user prompt: {user_prompt}")
-            print("========================\n")
+            if self.client is None:
+                raise ValueError("OpenAI API key is not configured. Please set it in Settings.")
+            messages = self._build_messages(text, current_lang, target_lang, prompt_template)
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_message
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ]
+            logger.debug(
+                "Translation request: %d chars, %s -> %s, model %s (route %s)",
+                len(text), current_lang, target_lang, route.model, route.name
             )
-            result = response.choices[0].message.content.strip()
             
-            print("\n=== Translation Result ===")
-            print(f"Original: '{text}'")
-            print(f"Translated: '{result}'")
-            print("========================\n")
+            start_time = time.monotonic()
+            with self.tracer.span("api_request", "request", model=route.model):
+                response = self.client.chat.completions.create(
+                    model=route.model,
+                    messages=messages
+                )
+            result = response.choices[0].message.content.strip()
+            latency = time.monotonic() - start_time
+            self._record_route_usage(route, latency, response)
+            logger.debug("Translation result: %d chars in %.3fs", len(result), latency)
             
             return result
         except Exception as e:
-            print("\n=== Translation Error ===")
-            print(f"Error type: {type(e).__name__}")
-            print(f"Error message: {str(e)}")
-            print(f"Input text: '{text}'")
-            print(f"Current language: {current_lang}")
-            print(f"Target language: {target_lang}")
-            print(f"Prompt template: {prompt_template}")
-            print("========================\n")
+            self.metrics.inc('request_errors')
+            logger.error(
+                "Translation error (%s -> %s, route %s): %s: %s",
+                current_lang, target_lang, route.name, type(e).__name__, e
+            )
             raise Exception(f"Translation failed: {str(e)}")
     
+    def _record_route_usage(self, route, latency, response):
+        """Add the latency and token usage of one response to the route's task stats."""
+        stats = self.route_stats.get(route.name)
+        if stats is None:
+            stats = self.route_stats.setdefault(route.name, RouteStats(route))
+        usage = getattr(response, 'usage', None)
+        prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+        completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+        # Part of the prompt the provider served from its prompt cache
+        cached_prompt_tokens = getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', 0) or 0
+        stats.record(latency, prompt_tokens, completion_tokens, cached_prompt_tokens)
+        self.metrics.observe_request(route.name, latency, prompt_tokens, completion_tokens, cached_prompt_tokens)
+    
+    def _finish_metrics(self, file_path):
+        """Fold the task statistics into the metrics and export them if configured."""
+        self.metrics.finish()
+        self.metrics.routes = {name: stats.summary() for name, stats in self.route_stats.items()}
+        self.metrics.language = dict(getattr(self, 'language_stats', {}))
+        if self.config.metrics_dir:
+            stem = Path(file_path).stem
+            for suffix in (".json", ".prom"):
+                path = Path(self.config.metrics_dir) / f"{stem}.metrics{suffix}"
+                try:
+                    self.metrics.export(path)
+                except OSError as e:
+                    logger.warning("Failed to export metrics to %s: %s", path, e)
+    
+    def _create_tracer(self, task_data):
+        """Return a Tracer when tracing is requested for the task, otherwise the no-op tracer."""
+        if task_data.get('trace') or self.config.trace_dir:
+            return Tracer(Path(task_data['file']).name)
+        return NULL_TRACER
+    
+    def _create_profiler(self, task_data):
+        if not (task_data.get('profile') or self.config.profile_tasks):
+            return None
+        return TaskProfiler(self._diagnostics_path(task_data['file'], ".prof"))
+    
+    def _diagnostics_path(self, file_path, suffix):
+        """Place trace and profile files in config.trace_dir, or next to the source file."""
+        path = Path(file_path)
+        directory = Path(self.config.trace_dir) if self.config.trace_dir else path.parent
+        return directory / f"{path.stem}{suffix}"
+    
+    def _finish_trace(self, task_data):
+        if not self.tracer.enabled:
+            return
+        path = self._diagnostics_path(task_data['file'], ".trace.json")
+        try:
+            self.tracer.export(path)
+            logger.info("Trace written to %s", path)
+        except OSError as e:
+            logger.warning("Failed to export trace to %s: %s", path, e)
+    
+    def export_metrics(self, path):
+        """Export the metrics of the last task as JSON, or Prometheus text for .prom paths."""
+        return self.metrics.export(path)
+    
+    def output_paths(self, task_data) -> list:
+        """Return the files translate_excel writes for the task."""
+        if task_data.get('output_mode', OUTPUT_FILES) == OUTPUT_FILES:
+            return [self._get_output_path(task_data['file'], lang) for lang in task_data['target_languages']]
+        return [self._get_output_path(task_data['file'], "translated")]
+    
     def _get_output_path(self, input_path, target_lang):
         """Generate output file path."""
         path = Path(input_path)
-        return path.parent / f"{path.stem}_{target_lang}{path.suffix}" 
\ No newline at end of file
+        return path.parent / f"{path.stem}_{target_lang}{output_suffix(path)}" 
\ No newline at end of file
@@ -0,0 +1,42 @@
+from array import array
+
+class WorkItems:
+    """Compact store of the cells a task translates, built once by the cell scan.
+
+    Positions are kept in integer arrays and each distinct source string only
+    once, so a scanned range costs a few bytes per cell instead of a Cell
+    object and lets the workbook it came from be released. Translations are
+    kept per distinct string, in a result list from new_results() for each
+    target language.
+    """
+    __slots__ = ('rows', 'columns', 'text_ids', 'texts', 'cell_counts', '_ids')
+
+    def __init__(self):
+        self.rows = array('I')
+        self.columns = array('I')
+        self.text_ids = array('I')  # index into texts for each cell
+        self.texts = []  # distinct source strings
+        self.cell_counts = array('I')  # number of cells holding each string
+        self._ids = {}
+
+    def add(self, row: int, column: int, text: str):
+        text_id = self._ids.get(text)
+        if text_id is None:
+            text_id = self._ids[text] = len(self.texts)
+            self.texts.append(text)
+            self.cell_counts.append(0)
+        self.cell_counts[text_id] += 1
+        self.rows.append(row)
+        self.columns.append(column)
+        self.text_ids.append(text_id)
+
+    def __len__(self):
+        return len(self.text_ids)
+
+    def __iter__(self):
+        """Yield (row, column, text id) for every cell, in scan order."""
+        return zip(self.rows, self.columns, self.text_ids)
+
+    def new_results(self) -> list:
+        """Return empty result slots, one per distinct string, for one target language."""
+        return [None] * len(self.texts)
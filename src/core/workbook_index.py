@@ -0,0 +1,129 @@
+import os
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
+from xml.etree.ElementTree import iterparse, fromstring
+from pathlib import Path
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string, get_column_letter
+from .formats import is_csv_file, is_xls_file, xls_sheet_names
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Cell types holding text: shared strings and inline strings
+TEXT_CELL_TYPES = ("s", "inlineStr")
+
+class SheetInfo:
+    """Metadata of one worksheet, read without loading its cells into memory."""
+    def __init__(self, name: str, dimension: str = None, text_cells: int = 0, text_range: str = None):
+        self.name = name
+        self.dimension = dimension  # used range as stored by Excel, e.g. "A1:D20"
+        self.text_cells = text_cells
+        self.text_range = text_range  # bounding box of the text cells, a suggested default range
+
+def _sheet_paths(archive: zipfile.ZipFile) -> list:
+    """Return (sheet name, part path) pairs in workbook order."""
+    rels = fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(f"{PACKAGE_REL_NS}Relationship"):
+        target = rel.get("Target")
+        # Targets are relative to xl/ unless absolute within the package
+        targets[rel.get("Id")] = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    workbook = fromstring(archive.read("xl/workbook.xml"))
+    return [
+        (sheet.get("name"), targets.get(sheet.get(f"{REL_NS}id")))
+        for sheet in workbook.iter(f"{MAIN_NS}sheet")
+    ]
+
+def _scan_sheet(archive: zipfile.ZipFile, name: str, path: str) -> SheetInfo:
+    info = SheetInfo(name)
+    if path is None or path not in archive.namelist():
+        return info
+    min_row = min_col = max_row = max_col = None
+    with archive.open(path) as part:
+        for _, element in iterparse(part):
+            tag = element.tag
+            if tag == f"{MAIN_NS}dimension":
+                info.dimension = element.get("ref")
+            elif tag == f"{MAIN_NS}c":
+                reference = element.get("r")
+                if element.get("t") in TEXT_CELL_TYPES and reference:
+                    info.text_cells += 1
+                    column, row = coordinate_from_string(reference)
+                    column = column_index_from_string(column)
+                    if min_row is None:
+                        min_row, max_row, min_col, max_col = row, row, column, column
+                    else:
+                        min_row, max_row = min(min_row, row), max(max_row, row)
+                        min_col, max_col = min(min_col, column), max(max_col, column)
+            elif tag == f"{MAIN_NS}row":
+                # Rows are fully handled once closed; drop them to keep memory flat
+                element.clear()
+    if min_row is not None:
+        info.text_range = f"{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{max_row}"
+    return info
+
+def read_workbook_metadata(file_path) -> list:
+    """Read sheet names, used dimensions and text cell counts straight from the xlsx parts.
+
+    A CSV file is reported as one sheet named after the file, and .xls
+    workbooks with their sheet names only.
+    """
+    if is_csv_file(file_path):
+        return [SheetInfo(Path(file_path).stem)]
+    if is_xls_file(file_path):
+        return [SheetInfo(name) for name in xls_sheet_names(file_path)]
+    with zipfile.ZipFile(file_path) as archive:
+        return [_scan_sheet(archive, name, path) for name, path in _sheet_paths(archive)]
+
+def read_sheet_names(file_path) -> list:
+    """Read only the sheet names, from workbook.xml, which is quick however large the sheets are."""
+    if is_csv_file(file_path):
+        return [Path(file_path).stem]
+    if is_xls_file(file_path):
+        return xls_sheet_names(file_path)
+    with zipfile.ZipFile(file_path) as archive:
+        return [name for name, _ in _sheet_paths(archive)]
+
+class WorkbookIndex:
+    """Thread-safe cache of workbook metadata keyed by path, modification time and size."""
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat_key(file_path):
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def peek(self, file_path):
+        """Return the cached metadata if it is still current, without reading the file."""
+        path = os.path.abspath(file_path)
+        try:
+            stat_key = self._stat_key(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stat_key:
+                return None
+            self._entries.move_to_end(path)
+            return entry[1]
+
+    def get(self, file_path) -> list:
+        """Return the workbook's sheet metadata, reading it only if the file changed."""
+        sheets = self.peek(file_path)
+        if sheets is not None:
+            return sheets
+        path = os.path.abspath(file_path)
+        stat_key = self._stat_key(path)
+        sheets = read_workbook_metadata(path)
+        with self._lock:
+            self._entries[path] = (stat_key, sheets)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return sheets
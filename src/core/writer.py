@@ -0,0 +1,69 @@
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .tracing import NULL_TRACER
+
+logger = logging.getLogger(__name__)
+
+class OutputWriteError(Exception):
+    """Raised in the task thread when a background write failed."""
+
+class BackgroundWriter:
+    """Saves finished outputs on a background thread while translation goes on.
+
+    At most max_pending writes are queued or running. submit() blocks while
+    the buffer is full, which bounds the memory held by unsaved workbooks.
+    The first write failure calls on_error and is re-raised by check(),
+    submit() and close() in the task thread. Later writes are skipped.
+    """
+    def __init__(self, max_pending: int = 2, tracer=NULL_TRACER, on_error=None):
+        self.tracer = tracer
+        self.on_error = on_error
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-writer")
+        self._futures = []
+        self._error = None
+        self._error_lock = threading.Lock()
+
+    def check(self):
+        """Raise OutputWriteError if a write has failed."""
+        with self._error_lock:
+            error = self._error
+        if error is not None:
+            raise OutputWriteError(f"Failed to write output: {error}") from error
+
+    def submit(self, save, path, **span_args):
+        """Queue save(path), waiting for buffer space first."""
+        self.check()
+        self._slots.acquire()
+        try:
+            self._futures.append(self._executor.submit(self._run, save, path, span_args))
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _run(self, save, path, span_args):
+        try:
+            if self._error is not None:
+                return
+            with self.tracer.span("save_workbook", **span_args):
+                save(path)
+            logger.debug("Wrote %s", path)
+        except Exception as e:
+            logger.error("Failed to write %s: %s", path, e)
+            with self._error_lock:
+                first = self._error is None
+                if first:
+                    self._error = e
+            if first and self.on_error is not None:
+                self.on_error(e)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Wait for every queued write, then raise if any of them failed."""
+        for future in self._futures:
+            future.result()
+        self._futures = []
+        self._executor.shutdown(wait=True)
+        self.check()
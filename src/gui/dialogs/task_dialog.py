@@ -1,14 +1,84 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QLineEdit, QComboBox, QCheckBox, QTextEdit, QFileDialog
+    QLineEdit, QComboBox, QCheckBox, QTextEdit, QFileDialog, QMessageBox,
+    QListWidget, QListWidgetItem
 )
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from core.translator import Translator
+from core.task_control import TaskControl, TaskCancelled
+from core.workbook_index import WorkbookIndex, read_sheet_names
+from core.formats import is_csv_file
 import re
-from openpyxl import load_workbook
+
+class PlanThread(QThread):
+    """Runs a dry-run plan of the task off the GUI thread."""
+    plan_ready = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, config, task_data, router=None, cache=None):
+        super().__init__()
+        self.config = config
+        self.task_data = task_data
+        self.router = router
+        self.cache = cache
+        self.control = TaskControl()
+
+    def cancel(self):
+        self.control.cancel()
+
+    def run(self):
+        try:
+            translator = Translator(self.config, router=self.router, cache=self.cache)
+            self.plan_ready.emit(translator.dry_run(self.task_data, self.control))
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            self.error.emit(str(e))
+
+class WorkbookInfoThread(QThread):
+    """Reads workbook metadata through the index off the GUI thread.
+
+    The sheet names are sent first, so a sheet can be picked while the
+    text cells of every sheet are still being counted.
+    """
+    names_ready = pyqtSignal(str, list)
+    info_ready = pyqtSignal(str, list)
+    error = pyqtSignal(str, str)
+
+    def __init__(self, workbook_index, file_path):
+        super().__init__()
+        self.workbook_index = workbook_index
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            self.names_ready.emit(self.file_path, read_sheet_names(self.file_path))
+            self.info_ready.emit(self.file_path, self.workbook_index.get(self.file_path))
+        except Exception as e:
+            self.error.emit(self.file_path, str(e))
+
+# Workbook reads still running when their dialog closed, kept until they finish
+_detached_threads = set()
+
+def _release_detached(thread):
+    # finished is emitted right before the thread ends; wait() only covers that last moment
+    thread.wait()
+    _detached_threads.discard(thread)
+    thread.deleteLater()
 
 class TaskDialog(QDialog):
-    def __init__(self, config, parent=None):
+    def __init__(self, config, parent=None, router=None, cache=None, workbook_index=None):
         super().__init__(parent)
         self.config = config
+        self.router = router
+        self.cache = cache
+        self.workbook_index = workbook_index or WorkbookIndex()
+        self.sheet_info = {}  # sheet name -> SheetInfo of the selected file
+        self.info_threads = []
+        self._pending_sheet = None
+        self._counting_file = None  # file whose text cells are still being counted
+        self.plan_thread = None
+        self._confirm_plan = False
         self.setWindowTitle("Create Translation Task")
         self.setup_ui()
     
@@ -31,14 +101,18 @@ class TaskDialog(QDialog):
         sheet_layout.addWidget(QLabel("Sheet:"))
         self.sheet_selector = QComboBox()
         self.sheet_selector.setEnabled(False)
+        self.sheet_selector.currentTextChanged.connect(self.on_sheet_changed)
         sheet_layout.addWidget(self.sheet_selector)
+        self.sheet_details = QLabel()
+        self.sheet_details.setStyleSheet("color: gray;")
+        sheet_layout.addWidget(self.sheet_details)
         layout.addLayout(sheet_layout)
         
         # Cell range
         range_layout = QHBoxLayout()
-        range_layout.addWidget(QLabel("Cell Range (required, e.g., A1:B4):"))
+        self.range_label = QLabel()
+        range_layout.addWidget(self.range_label)
         self.cell_range = QLineEdit()
-        self.cell_range.setPlaceholderText("Enter cell range (e.g., A1:B4)")
         self.cell_range.textChanged.connect(self.validate_input)
         range_layout.addWidget(self.cell_range)
         layout.addLayout(range_layout)
@@ -50,10 +124,28 @@ class TaskDialog(QDialog):
         self.current_lang.addItems(self.config.get_supported_languages())
         lang_layout.addWidget(self.current_lang)
         
-        lang_layout.addWidget(QLabel("Target Language:"))
-        self.target_langs = QComboBox()
-        self.target_langs.addItems(self.config.get_supported_languages())
+        lang_layout.addWidget(QLabel("Target Languages:"))
+        self.target_langs = QListWidget()
+        self.target_langs.setMaximumHeight(100)
+        for language in self.config.get_supported_languages():
+            item = QListWidgetItem(language)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.target_langs.addItem(item)
+        self.target_langs.item(0).setCheckState(Qt.CheckState.Checked)
+        self.target_langs.itemChanged.connect(self.validate_input)
         lang_layout.addWidget(self.target_langs)
+        layout.addLayout(lang_layout)
+        
+        # Output mode
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(QLabel("Output:"))
+        self.output_mode = QComboBox()
+        self.output_mode.addItem("Separate file per language", "files")
+        self.output_mode.addItem("Single file, language columns after the sheet content", "columns")
+        self.output_mode.addItem("Single file, one sheet per language", "sheets")
+        output_layout.addWidget(self.output_mode)
+        layout.addLayout(output_layout)
         
         # Field/Industry (Optional)
         field_layout = QHBoxLayout()
@@ -67,6 +159,13 @@ class TaskDialog(QDialog):
         self.comparison_mode = QCheckBox("Enable comparison mode")
         layout.addWidget(self.comparison_mode)
         
+        # Local language detection pre-pass
+        self.skip_target_language = QCheckBox("Skip cells already in the target language")
+        self.skip_target_language.setChecked(True)
+        layout.addWidget(self.skip_target_language)
+        self.skip_other_languages = QCheckBox("Skip cells in neither the current nor the target language")
+        layout.addWidget(self.skip_other_languages)
+        
         # Prompt
         prompt_layout = QVBoxLayout()
         prompt_header = QHBoxLayout()
@@ -99,8 +198,17 @@ class TaskDialog(QDialog):
         
         layout.addLayout(prompt_layout)
         
+        # Dry-run estimate
+        self.plan_summary = QLabel()
+        self.plan_summary.setStyleSheet("color: gray;")
+        self.plan_summary.setWordWrap(True)
+        layout.addWidget(self.plan_summary)
+        
         # Buttons
         button_layout = QHBoxLayout()
+        self.estimate_btn = QPushButton("Estimate")
+        self.estimate_btn.clicked.connect(lambda: self.start_estimate(confirm=False))
+        button_layout.addWidget(self.estimate_btn)
         self.ok_btn = QPushButton("OK")
         self.ok_btn.clicked.connect(self.validate_and_accept)
         self.cancel_btn = QPushButton("Cancel")
@@ -110,17 +218,18 @@ class TaskDialog(QDialog):
         layout.addLayout(button_layout)
         
         # Initial validation
+        self._update_range_label()
         self.validate_input()
     
     def validate_input(self):
         """Validate all required inputs."""
         is_valid = True
         
-        # Validate cell range
+        # Validate cell range (or the column list of a CSV file)
         cell_range = self.cell_range.text().strip()
         if not cell_range:
             is_valid = False
-        elif not self._is_valid_cell_range(cell_range):
+        elif not self._is_csv() and not self._is_valid_cell_range(cell_range):
             is_valid = False
         
         # Validate file selection
@@ -131,24 +240,114 @@ class TaskDialog(QDialog):
         if not self.sheet_selector.currentText():
             is_valid = False
         
+        # Validate target languages
+        if not self.get_target_languages():
+            is_valid = False
+        
         self.ok_btn.setEnabled(is_valid)
+        self.estimate_btn.setEnabled(is_valid and self.plan_thread is None)
+    
+    def _is_csv(self) -> bool:
+        return is_csv_file(self.file_path.text())
+    
+    def _update_range_label(self):
+        """CSV files are streamed by column, so they take column names instead of a range."""
+        if self._is_csv():
+            self.range_label.setText("Columns (required, header names or letters, e.g., Title, Description):")
+            self.cell_range.setPlaceholderText("Enter columns separated by commas")
+        else:
+            self.range_label.setText("Cell Range (required, e.g., A1:B4):")
+            self.cell_range.setPlaceholderText("Enter cell range (e.g., A1:B4)")
+    
+    def get_columns(self):
+        return [column.strip() for column in self.cell_range.text().split(",") if column.strip()]
     
     def _is_valid_cell_range(self, cell_range: str) -> bool:
         """Check if the cell range format is valid."""
         pattern = r'^[A-Z]+[1-9][0-9]*:[A-Z]+[1-9][0-9]*$'
         return bool(re.match(pattern, cell_range))
     
+    def get_target_languages(self):
+        """Return the checked target languages in list order."""
+        languages = []
+        for i in range(self.target_langs.count()):
+            item = self.target_langs.item(i)
+            if item.checkState() == Qt.CheckState.Checked:
+                languages.append(item.text())
+        return languages
+    
+    def set_target_languages(self, languages):
+        for i in range(self.target_langs.count()):
+            item = self.target_langs.item(i)
+            checked = item.text() in languages
+            item.setCheckState(Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+    
+    def set_output_mode(self, mode):
+        index = self.output_mode.findData(mode)
+        if index >= 0:
+            self.output_mode.setCurrentIndex(index)
+    
     def validate_and_accept(self):
         """Validate all inputs before accepting."""
         if not self.cell_range.text().strip():
-            QMessageBox.warning(self, "Validation Error", "Cell range is required.")
+            QMessageBox.warning(self, "Validation Error", "Columns are required." if self._is_csv() else "Cell range is required.")
             return
         
-        if not self._is_valid_cell_range(self.cell_range.text().strip()):
+        if not self._is_csv() and not self._is_valid_cell_range(self.cell_range.text().strip()):
             QMessageBox.warning(self, "Validation Error", "Invalid cell range format. Please use format like 'A1:B4'.")
             return
         
-        self.accept()
+        # Show the dry-run estimate and ask for confirmation before accepting
+        self.start_estimate(confirm=True)
+    
+    def start_estimate(self, confirm=False):
+        """Plan the task in the background; with confirm, ask to accept once the plan is ready."""
+        if self.plan_thread is not None:
+            return
+        self._confirm_plan = confirm
+        self.plan_summary.setText("Estimating...")
+        self.ok_btn.setEnabled(False)
+        self.estimate_btn.setEnabled(False)
+        self.plan_thread = PlanThread(self.config, self.get_task_data(), self.router, self.cache)
+        self.plan_thread.plan_ready.connect(self.on_plan_ready)
+        self.plan_thread.error.connect(self.on_plan_error)
+        self.plan_thread.finished.connect(self._on_plan_finished)
+        self.plan_thread.start()
+    
+    def on_plan_ready(self, plan):
+        summary = self.format_plan(plan)
+        self.plan_summary.setText(summary)
+        if self._confirm_plan:
+            reply = QMessageBox.question(self, "Confirm Task", f"{summary}\n\nCreate this task?")
+            if reply == QMessageBox.StandardButton.Yes:
+                self.accept()
+    
+    def on_plan_error(self, message):
+        self.plan_summary.setText(f"Estimate failed: {message}")
+        if self._confirm_plan:
+            reply = QMessageBox.question(
+                self, "Confirm Task", f"Could not estimate the task: {message}\n\nCreate it anyway?"
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                self.accept()
+    
+    def _on_plan_finished(self):
+        self.plan_thread = None
+        self.validate_prompt()
+    
+    @staticmethod
+    def format_plan(plan):
+        """Summarize a dry-run plan for display."""
+        minutes, seconds = divmod(int(round(plan['duration_seconds'])), 60)
+        hours, minutes = divmod(minutes, 60)
+        duration = f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+        return (
+            f"{plan['translatable_cells']} translatable cells, {plan['unique_strings']} unique strings, "
+            f"{plan['target_languages']} target language(s)\n"
+            f"{plan['requests']} requests (~{plan['prompt_tokens'] + plan['completion_tokens']} tokens), "
+            f"{plan['cache_hits']} cached, {plan['cells_skipped_by_language']} cells skipped by language\n"
+            f"Estimated cost ${plan['cost']:.4f}, estimated time {duration}"
+        )
     
     def reset_prompt(self):
         """Reset the prompt to default value."""
@@ -170,6 +369,7 @@ class TaskDialog(QDialog):
             self.prompt_warning.setText(f"Missing required placeholders: {', '.join(missing)}")
             self.prompt_warning.show()
             self.ok_btn.setEnabled(False)
+            self.estimate_btn.setEnabled(False)
         else:
             self.prompt_warning.hide()
             self.validate_input()  # Check other inputs as well
@@ -179,33 +379,122 @@ class TaskDialog(QDialog):
             self,
             "Select Excel File",
             "",
-            "Excel Files (*.xlsx *.xls)"
+            "Spreadsheets (*.xlsx *.xls *.csv);;Excel Files (*.xlsx *.xls);;CSV Files (*.csv)"
         )
         if file_name:
             self.file_path.setText(file_name)
+            self._update_range_label()
             self._update_sheet_selector(file_name)
             self.validate_input()
     
-    def _update_sheet_selector(self, file_path):
-        try:
-            wb = load_workbook(file_path, read_only=True)
-            self.sheet_selector.clear()
-            self.sheet_selector.addItems(wb.sheetnames)
-            self.sheet_selector.setEnabled(True)
-            self.validate_input()
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to read Excel file: {str(e)}")
-            self.sheet_selector.setEnabled(False)
-            self.validate_input()
+    def _update_sheet_selector(self, file_path, sheet=None):
+        """Fill the sheet selector from the workbook index; only uncached files are read, in the background."""
+        self._pending_sheet = sheet
+        sheets = self.workbook_index.peek(file_path)
+        if sheets is not None:
+            self._populate_sheets(sheets)
+            return
+        self.sheet_selector.clear()
+        self.sheet_selector.setEnabled(False)
+        self.sheet_details.setText("Reading workbook...")
+        self.validate_input()
+        self._counting_file = file_path
+        thread = WorkbookInfoThread(self.workbook_index, file_path)
+        thread.names_ready.connect(self.on_sheet_names)
+        thread.info_ready.connect(self.on_workbook_info)
+        thread.error.connect(self.on_workbook_error)
+        thread.finished.connect(lambda t=thread: self.info_threads.remove(t))
+        self.info_threads.append(thread)
+        thread.start()
+    
+    def on_sheet_names(self, file_path, names):
+        if file_path != self.file_path.text():
+            return
+        self.sheet_selector.blockSignals(True)
+        self.sheet_selector.clear()
+        self.sheet_selector.addItems(names)
+        if self._pending_sheet in names:
+            self.sheet_selector.setCurrentText(self._pending_sheet)
+        self.sheet_selector.blockSignals(False)
+        self.sheet_selector.setEnabled(True)
+        self.on_sheet_changed(self.sheet_selector.currentText())
+    
+    def on_workbook_info(self, file_path, sheets):
+        # Ignore results for a file that is no longer selected
+        if file_path == self.file_path.text():
+            self._counting_file = None
+            # Keep a sheet picked while the text cells were counted
+            if self.sheet_selector.count():
+                self._pending_sheet = self.sheet_selector.currentText()
+            self._populate_sheets(sheets)
+    
+    def on_workbook_error(self, file_path, message):
+        if file_path != self.file_path.text():
+            return
+        self._counting_file = None
+        self.sheet_details.clear()
+        QMessageBox.warning(self, "Error", f"Failed to read Excel file: {message}")
+        self.sheet_selector.setEnabled(False)
+        self.validate_input()
+    
+    def _populate_sheets(self, sheets):
+        self.sheet_info = {info.name: info for info in sheets}
+        self.sheet_selector.blockSignals(True)
+        self.sheet_selector.clear()
+        self.sheet_selector.addItems(list(self.sheet_info))
+        if self._pending_sheet in self.sheet_info:
+            self.sheet_selector.setCurrentText(self._pending_sheet)
+        self.sheet_selector.blockSignals(False)
+        self.sheet_selector.setEnabled(True)
+        self.on_sheet_changed(self.sheet_selector.currentText())
+    
+    def on_sheet_changed(self, sheet_name):
+        info = self.sheet_info.get(sheet_name)
+        if info is None and self._counting_file == self.file_path.text():
+            self.sheet_details.setText("Counting text cells...")
+        elif info is None:
+            self.sheet_details.clear()
+        else:
+            self.sheet_details.setText(f"Used range {info.dimension or '-'}, {info.text_cells} text cells")
+            # Suggest the text area of the sheet when no range was entered yet
+            if info.text_range and not self.cell_range.text().strip():
+                self.cell_range.setText(info.text_range)
+        self.validate_input()
+    
+    def done(self, result):
+        # Workbook reads are not waited for, which could take as long as the scan of every
+        # sheet; they finish in the background and still fill the shared index
+        for thread in self.info_threads:
+            thread.names_ready.disconnect()
+            thread.info_ready.disconnect()
+            thread.error.disconnect()
+            thread.finished.disconnect()
+            _detached_threads.add(thread)
+            thread.finished.connect(lambda t=thread: _release_detached(t))
+        self.info_threads = []
+        if self.plan_thread is not None:
+            # A running estimate is abandoned: its results no longer reach the closing dialog
+            self.plan_thread.plan_ready.disconnect(self.on_plan_ready)
+            self.plan_thread.error.disconnect(self.on_plan_error)
+            self.plan_thread.cancel()
+            self.plan_thread.wait()
+        super().done(result)
     
     def get_task_data(self):
+        if self._is_csv():
+            area = {'columns': self.get_columns(), 'has_header': True}
+        else:
+            area = {'cell_range': self.cell_range.text().strip()}
         return {
             'file': self.file_path.text(),
             'sheet': self.sheet_selector.currentText(),
-            'cell_range': self.cell_range.text().strip(),
             'current_language': self.current_lang.currentText(),
-            'target_languages': [self.target_langs.currentText()],
+            'target_languages': self.get_target_languages(),
+            'output_mode': self.output_mode.currentData(),
             'comparison_mode': self.comparison_mode.isChecked(),
+            'skip_target_language': self.skip_target_language.isChecked(),
+            'skip_other_languages': self.skip_other_languages.isChecked(),
             'prompt': self.prompt_text.toPlainText(),
-            'field': self.field_input.text().strip()
+            'field': self.field_input.text().strip(),
+            **area
         } 
\ No newline at end of file
@@ -0,0 +1,301 @@
+from PyQt6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QTimer, QRect, QSize, QEvent, pyqtSignal
+)
+from PyQt6.QtWidgets import (
+    QStyledItemDelegate, QStyle, QStyleOptionButton, QStyleOptionProgressBar, QApplication
+)
+
+class TaskListModel(QAbstractListModel):
+    """List model holding the queued translation tasks.
+
+    Rows are keyed by task id so that updates only touch the affected row.
+    Progress updates are buffered and flushed at most once per frame.
+    """
+    TaskIdRole = Qt.ItemDataRole.UserRole + 1
+    TaskDataRole = Qt.ItemDataRole.UserRole + 2
+    ProgressRole = Qt.ItemDataRole.UserRole + 3
+    StatusRole = Qt.ItemDataRole.UserRole + 4
+    StatsRole = Qt.ItemDataRole.UserRole + 5
+
+    STATUS_IDLE = "idle"
+    STATUS_RUNNING = "running"
+    STATUS_PAUSED = "paused"
+    STATUS_CANCELLING = "cancelling"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_DONE = "done"
+    STATUS_ERROR = "error"
+
+    FRAME_INTERVAL_MS = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._task_ids = []
+        self._rows = {}  # task_id -> row index
+        self._tasks = {}  # task_id -> task_data
+        self._progress = {}
+        self._status = {}
+        self._stats = {}
+        self._pending_progress = {}
+        self._pending_stats = {}
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FRAME_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_progress)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._task_ids)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._task_ids):
+            return None
+        task_id = self._task_ids[index.row()]
+        if role == self.TaskIdRole:
+            return task_id
+        if role == self.TaskDataRole:
+            return self._tasks[task_id]
+        if role == self.ProgressRole:
+            return self._progress[task_id]
+        if role == self.StatusRole:
+            return self._status[task_id]
+        if role == self.StatsRole:
+            return self._stats.get(task_id)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._tasks[task_id]['file']
+        return None
+
+    def add_task(self, task_id, task_data):
+        """Append a task to the end of the list."""
+        row = len(self._task_ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._task_ids.append(task_id)
+        self._rows[task_id] = row
+        self._tasks[task_id] = task_data
+        self._progress[task_id] = 0
+        self._status[task_id] = self.STATUS_IDLE
+        self.endInsertRows()
+
+    def update_task(self, task_id, task_data):
+        """Replace the task data of an existing row."""
+        if task_id not in self._rows:
+            return
+        self._tasks[task_id] = task_data
+        self._emit_row_changed(task_id)
+
+    def remove_task(self, task_id):
+        """Remove a task row and reindex the rows after it."""
+        row = self._rows.get(task_id)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._task_ids[row]
+        del self._rows[task_id]
+        del self._tasks[task_id]
+        del self._progress[task_id]
+        del self._status[task_id]
+        self._stats.pop(task_id, None)
+        self._pending_progress.pop(task_id, None)
+        self._pending_stats.pop(task_id, None)
+        for i in range(row, len(self._task_ids)):
+            self._rows[self._task_ids[i]] = i
+        self.endRemoveRows()
+
+    def task_ids(self):
+        return list(self._task_ids)
+
+    def status(self, task_id):
+        return self._status.get(task_id)
+
+    def set_status(self, task_id, status):
+        if task_id not in self._rows:
+            return
+        self._status[task_id] = status
+        self._emit_row_changed(task_id)
+
+    def set_progress(self, task_id, value):
+        """Queue a progress update; repeated updates within a frame are coalesced."""
+        if task_id not in self._rows:
+            return
+        self._pending_progress[task_id] = value
+        self._schedule_flush()
+
+    def set_stats(self, task_id, stats):
+        """Queue a throughput/ETA snapshot; coalesced per frame like progress."""
+        if task_id not in self._rows:
+            return
+        self._pending_stats[task_id] = stats
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_progress(self):
+        changed = set()
+        pending, self._pending_progress = self._pending_progress, {}
+        for task_id, value in pending.items():
+            if task_id in self._rows and self._progress[task_id] != value:
+                self._progress[task_id] = value
+                changed.add(task_id)
+        pending, self._pending_stats = self._pending_stats, {}
+        for task_id, stats in pending.items():
+            if task_id in self._rows:
+                self._stats[task_id] = stats
+                changed.add(task_id)
+        for task_id in changed:
+            self._emit_row_changed(task_id)
+
+    def _emit_row_changed(self, task_id):
+        index = self.index(self._rows[task_id])
+        self.dataChanged.emit(index, index)
+
+class TaskItemDelegate(QStyledItemDelegate):
+    """Paints a task row (info, progress bar, action buttons) without per-row widgets."""
+    start_clicked = pyqtSignal(str)
+    pause_clicked = pyqtSignal(str)
+    resume_clicked = pyqtSignal(str)
+    cancel_clicked = pyqtSignal(str)
+    edit_clicked = pyqtSignal(str)
+    remove_clicked = pyqtSignal(str)
+
+    MARGIN = 6
+    LINE_SPACING = 2
+    BUTTON_WIDTH = 72
+    BUTTON_HEIGHT = 22
+    PROGRESS_WIDTH = 160
+
+    ACTIONS = ("start", "pause", "edit", "remove")
+    ACTIVE_STATUSES = (
+        TaskListModel.STATUS_RUNNING, TaskListModel.STATUS_PAUSED, TaskListModel.STATUS_CANCELLING
+    )
+
+    def sizeHint(self, option, index):
+        line_height = option.fontMetrics.height() + self.LINE_SPACING
+        buttons_height = len(self.ACTIONS) * (self.BUTTON_HEIGHT + self.LINE_SPACING)
+        return QSize(0, max(4 * line_height, buttons_height) + 2 * self.MARGIN)
+
+    def _button_rects(self, rect):
+        """Return the rectangle of each action button for a row rectangle."""
+        x = rect.right() - self.MARGIN - self.BUTTON_WIDTH
+        y = rect.top() + self.MARGIN
+        rects = {}
+        for action in self.ACTIONS:
+            rects[action] = QRect(x, y, self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+            y += self.BUTTON_HEIGHT + self.LINE_SPACING
+        return rects
+
+    def _progress_rect(self, rect):
+        x = rect.right() - 2 * self.MARGIN - self.BUTTON_WIDTH - self.PROGRESS_WIDTH
+        height = self.BUTTON_HEIGHT
+        y = rect.top() + (rect.height() - height) // 2
+        return QRect(x, y, self.PROGRESS_WIDTH, height)
+
+    def _resolve_action(self, action, status):
+        """Map a button slot to the action it performs for the given task status."""
+        if action == "start" and status in self.ACTIVE_STATUSES:
+            return "cancel"
+        if action == "pause" and status == TaskListModel.STATUS_PAUSED:
+            return "resume"
+        return action
+
+    def _label(self, action):
+        return action.capitalize()
+
+    def _is_enabled(self, action, status):
+        if action == "remove":
+            return True
+        if action == "cancel":
+            return status != TaskListModel.STATUS_CANCELLING
+        if action in ("pause", "resume"):
+            return status in (TaskListModel.STATUS_RUNNING, TaskListModel.STATUS_PAUSED)
+        return status not in self.ACTIVE_STATUSES
+
+    def _format_stats(self, stats):
+        """Format throughput, cache-hit ratio and ETA for the fourth info line."""
+        eta = stats.get('eta_seconds')
+        if eta is None:
+            eta_text = "ETA --"
+        else:
+            minutes, seconds = divmod(int(eta), 60)
+            hours, minutes = divmod(minutes, 60)
+            eta_text = f"ETA {hours}:{minutes:02d}:{seconds:02d}" if hours else f"ETA {minutes}:{seconds:02d}"
+        return (
+            f"{stats['done']}/{stats['total']} cells · {stats['cells_per_second']:.1f} cells/s · "
+            f"{stats['tokens_per_second']:.0f} tok/s · cache {stats['cache_hit_ratio']:.0%} · {eta_text}"
+        )
+
+    def paint(self, painter, option, index):
+        task_data = index.data(TaskListModel.TaskDataRole)
+        progress = index.data(TaskListModel.ProgressRole)
+        status = index.data(TaskListModel.StatusRole)
+        stats = index.data(TaskListModel.StatsRole)
+        style = option.widget.style() if option.widget else QApplication.style()
+
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+
+        # Task info
+        progress_rect = self._progress_rect(option.rect)
+        text_rect = QRect(
+            option.rect.left() + self.MARGIN, option.rect.top() + self.MARGIN,
+            progress_rect.left() - option.rect.left() - 2 * self.MARGIN,
+            option.rect.height() - 2 * self.MARGIN
+        )
+        lines = [
+            f"File: {task_data['file']}",
+            f"Sheet: {task_data['sheet']}",
+            f"Target: {', '.join(task_data['target_languages'])}",
+        ]
+        if stats:
+            lines.append(self._format_stats(stats))
+        line_height = option.fontMetrics.height() + self.LINE_SPACING
+        for i, line in enumerate(lines):
+            line_rect = QRect(text_rect.left(), text_rect.top() + i * line_height, text_rect.width(), line_height)
+            elided = option.fontMetrics.elidedText(line, Qt.TextElideMode.ElideMiddle, line_rect.width())
+            painter.drawText(line_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, elided)
+
+        # Progress bar
+        bar = QStyleOptionProgressBar()
+        bar.rect = progress_rect
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = progress
+        bar.text = f"{progress}%"
+        if status not in (TaskListModel.STATUS_IDLE, TaskListModel.STATUS_RUNNING):
+            bar.text += f" ({status})"
+        bar.textVisible = True
+        bar.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Horizontal
+        style.drawControl(QStyle.ControlElement.CE_ProgressBar, bar, painter, option.widget)
+
+        # Buttons
+        for slot, rect in self._button_rects(option.rect).items():
+            action = self._resolve_action(slot, status)
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = self._label(action)
+            button.state = QStyle.StateFlag.State_Raised
+            if self._is_enabled(action, status):
+                button.state |= QStyle.StateFlag.State_Enabled
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.Type.MouseButtonRelease:
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+
+        status = index.data(TaskListModel.StatusRole)
+        task_id = index.data(TaskListModel.TaskIdRole)
+        pos = event.position().toPoint()
+        for slot, rect in self._button_rects(option.rect).items():
+            action = self._resolve_action(slot, status)
+            if rect.contains(pos) and self._is_enabled(action, status):
+                getattr(self, f"{action}_clicked").emit(task_id)
+                return True
+        return False
@@ -1,4 +1,5 @@
 import sys
+import logging
 from PyQt6.QtWidgets import QApplication
 from gui.main_window import MainWindow
 from core.config import Config
@@ -8,6 +9,10 @@ def main():
     
     # Initialize configuration
     config = Config()
+    logging.basicConfig(
+        level=config.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
     
     # Create and show the main window
     window = MainWindow(config)
@@ -0,0 +1,42 @@
+import argparse
+import logging
+from core.config import Config
+from core.shared_memory import SharedMemoryServer, MAX_REQUEST_BYTES
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a translation memory shared by the team.")
+    parser.add_argument("--db", default="translation_memory.sqlite3", help="SQLite file holding the translations")
+    parser.add_argument(
+        "--host", default="127.0.0.1",
+        help="Address to listen on; use 0.0.0.0 (together with a token) to serve other machines"
+    )
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on")
+    parser.add_argument(
+        "--token", default=None, help="Shared secret clients must send (default: SHARED_MEMORY_TOKEN)"
+    )
+    parser.add_argument(
+        "--max-request-bytes", type=int, default=MAX_REQUEST_BYTES, help="Largest request body accepted"
+    )
+    args = parser.parse_args()
+    
+    config = Config()
+    token = config.shared_memory_token if args.token is None else args.token
+    logging.basicConfig(
+        level=config.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    
+    logger = logging.getLogger(__name__)
+    if not token and args.host not in ("127.0.0.1", "localhost", "::1"):
+        logger.warning("Serving on %s without a token: anyone who can reach it can change translations", args.host)
+    server = SharedMemoryServer(args.db, args.host, args.port, token, args.max_request_bytes)
+    logger.info("Serving shared translation memory on %s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
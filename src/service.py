@@ -0,0 +1,45 @@
+import json
+import signal
+import argparse
+import logging
+from core.config import Config
+from core.job_queue import JobQueue
+from core.hot_folder import HotFolderService, WatchedFolder
+
+def main():
+    parser = argparse.ArgumentParser(description="Translate spreadsheets dropped into watched folders.")
+    parser.add_argument(
+        "folders",
+        help="JSON file with a list of folders, each with its task template, e.g. "
+             '[{"path": "/data/in", "current_language": "English", "target_languages": ["Spanish"]}]'
+    )
+    args = parser.parse_args()
+    
+    # Initialize configuration
+    config = Config()
+    logging.basicConfig(
+        level=config.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    
+    with open(args.folders, encoding="utf-8") as f:
+        folders = [WatchedFolder.from_dict(folder) for folder in json.load(f)]
+    
+    queue = JobQueue(config.service_queue_path)
+    service = HotFolderService(
+        config, folders, queue,
+        workers=config.service_workers,
+        poll_interval=config.service_poll_interval,
+        status_port=config.service_status_port or None
+    )
+    
+    # Stop cleanly on Ctrl+C / SIGTERM; interrupted jobs resume on the next start
+    signal.signal(signal.SIGINT, lambda *_: service.request_stop())
+    signal.signal(signal.SIGTERM, lambda *_: service.request_stop())
+    service.start()
+    service.wait()
+    service.stop()
+    queue.close()
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,12 @@ def ensure_directory(path: str) -> Path:
     return path
 
 def is_valid_excel_file(file_path: str) -> bool:
-    """Check if the file is a valid Excel file."""
+    """Check if the file is a spreadsheet the translator can read (xlsx, xls or csv)."""
     if not os.path.exists(file_path):
         return False
     
     ext = os.path.splitext(file_path)[1].lower()
-    return ext in ['.xlsx', '.xls']
+    return ext in ['.xlsx', '.xls', '.csv']
 
 def format_progress(completed: int, total: int) -> str:
     """Format progress as a percentage string."""
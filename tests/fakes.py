@@ -0,0 +1,25 @@
+import threading
+import time
+from types import SimpleNamespace
+
+class FakeCompletions:
+    """Stands in for client.chat.completions and records each request."""
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.models = []
+        self.lock = threading.Lock()
+
+    def create(self, model, messages):
+        with self.lock:
+            self.calls += 1
+            self.models.append(model)
+        time.sleep(self.delay)
+        text = messages[-1]["content"].rsplit("\n", 1)[-1]
+        message = SimpleNamespace(content=f"T:{text}")
+        usage = SimpleNamespace(prompt_tokens=len(messages[-1]["content"]) // 4, completion_tokens=len(text) // 4)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+def fake_client(completions):
+    """Wrap fake completions in the client.chat.completions shape used by Translator."""
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
@@ -0,0 +1,107 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from src.core.translator import Translator
+from src.core.config import Config
+from src.core.cassette import RecordingClient, ReplayClient, CassetteMiss, ReplayedAPIError, REDACTED
+from tests.fakes import FakeCompletions, fake_client
+
+class FailingCompletions:
+    def create(self, model, messages):
+        raise RuntimeError("rate limited for key sk-abcdefghijklmnop")
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.cassette = self.dir / "run.jsonl"
+        self.config = Config()
+        self.config.api_key = "test-key"
+        self.config.cassette_mode = ""
+
+        self.test_file = self.dir / "cassette.xlsx"
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        for row, text in enumerate(["Hello there", "Good morning", "Thank you", "See you soon"], start=1):
+            ws[f"A{row}"] = text
+        wb.save(self.test_file)
+        self.task_data = {
+            "file": str(self.test_file),
+            "sheet": "Sheet1",
+            "cell_range": "A1:A4",
+            "current_language": "English",
+            "target_languages": ["Spanish"],
+            "comparison_mode": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _translate(self, client):
+        translator = Translator(self.config)
+        translator.client = client
+        translator.translate_excel(self.task_data)
+        sheet = load_workbook(self.dir / "cassette_Spanish.xlsx")["Sheet1"]
+        return [sheet[f"A{row}"].value for row in range(1, 5)]
+
+    def _record(self, delay=0.0):
+        completions = FakeCompletions(delay=delay)
+        recorded = self._translate(RecordingClient(fake_client(completions), self.cassette))
+        return completions, recorded
+
+    def test_replay_reproduces_recorded_run_offline(self):
+        completions, recorded = self._record()
+        lines = self.cassette.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), completions.calls)
+        self.assertGreaterEqual(json.loads(lines[0])['latency'], 0)
+
+        self.assertEqual(self._translate(ReplayClient(self.cassette)), recorded)
+
+    def test_unrecorded_request_is_a_miss(self):
+        self._record()
+        replay = ReplayClient(self.cassette)
+        with self.assertRaises(CassetteMiss):
+            replay.create(model="gpt-3.5-turbo", messages=[{"role": "user", "content": "never sent"}])
+
+    def test_secrets_are_redacted(self):
+        client = RecordingClient(fake_client(FakeCompletions()), self.cassette, secrets=["test-key"])
+        client.create(model="m", messages=[{"role": "user", "content": "token test-key and sk-abcdefghijklmnop"}])
+        recording = RecordingClient(fake_client(FailingCompletions()), self.cassette)
+        with self.assertRaises(RuntimeError):
+            recording.create(model="m", messages=[{"role": "user", "content": "x"}])
+
+        text = self.cassette.read_text(encoding="utf-8")
+        self.assertNotIn("test-key", text)
+        self.assertNotIn("sk-abcdefghijklmnop", text)
+        self.assertIn(REDACTED, text)
+
+    def test_repeated_requests_replay_in_order_including_errors(self):
+        messages = [{"role": "user", "content": "x"}]
+        with self.assertRaises(RuntimeError):
+            RecordingClient(fake_client(FailingCompletions()), self.cassette).create(model="m", messages=messages)
+        RecordingClient(fake_client(FakeCompletions()), self.cassette).create(model="m", messages=messages)
+
+        replay = ReplayClient(self.cassette)
+        with self.assertRaises(ReplayedAPIError):
+            replay.create(model="m", messages=messages)
+        self.assertEqual(replay.create(model="m", messages=messages).choices[0].message.content, "T:x")
+        # The last recording keeps answering once the sequence is used up
+        self.assertEqual(replay.create(model="m", messages=messages).choices[0].message.content, "T:x")
+
+    def test_recorded_latencies_replay_concurrently(self):
+        self._record(delay=0.2)
+        self.config.max_concurrent_requests = 4
+        start = time.monotonic()
+        self._translate(ReplayClient(self.cassette, latency_scale=1.0))
+        elapsed = time.monotonic() - start
+        # Four 0.2s requests run side by side, not one after another
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 0.7)
+
+if __name__ == '__main__':
+    unittest.main()
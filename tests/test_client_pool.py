@@ -0,0 +1,79 @@
+import unittest
+from types import SimpleNamespace
+import openai
+from src.core.client_pool import ClientPool, PoolMember
+from tests.fakes import FakeCompletions, fake_client
+
+class FailingCompletions:
+    def __init__(self, error=None):
+        self.error = error or ConnectionError("endpoint down")
+        self.calls = 0
+
+    def create(self, model, messages):
+        self.calls += 1
+        raise self.error
+
+MESSAGES = [{"role": "user", "content": "Translate:\nHello"}]
+
+class TestClientPool(unittest.TestCase):
+    def test_balances_by_weight(self):
+        heavy, light = FakeCompletions(), FakeCompletions()
+        pool = ClientPool([
+            PoolMember("heavy", fake_client(heavy), weight=3),
+            PoolMember("light", fake_client(light), weight=1)
+        ])
+        for _ in range(8):
+            pool.chat.completions.create(model="m", messages=MESSAGES)
+        self.assertEqual((heavy.calls, light.calls), (6, 2))
+
+    def test_fails_over_and_opens_circuit(self):
+        broken, healthy = FailingCompletions(), FakeCompletions()
+        pool = ClientPool([
+            PoolMember("broken", fake_client(broken), failure_threshold=2, cooldown=60),
+            PoolMember("healthy", fake_client(healthy))
+        ])
+        for _ in range(6):
+            response = pool.chat.completions.create(model="m", messages=MESSAGES)
+            self.assertEqual(response.choices[0].message.content, "T:Hello")
+        # The broken member is skipped once its circuit is open
+        self.assertEqual(broken.calls, 2)
+        self.assertEqual(healthy.calls, 6)
+        self.assertFalse(pool.status()[0]['available'])
+
+        # After the cooldown it gets a trial request again
+        pool.members[0].open_until = 0.0
+        pool.members[0].client = fake_client(FakeCompletions())
+        for _ in range(2):
+            pool.chat.completions.create(model="m", messages=MESSAGES)
+        self.assertTrue(pool.status()[0]['available'])
+        self.assertEqual(pool.members[0].consecutive_failures, 0)
+
+    def test_invalid_request_is_not_failed_over(self):
+        response = SimpleNamespace(status_code=400, headers={}, request=None)
+        error = openai.BadRequestError("bad request", response=response, body=None)
+        first, second = FailingCompletions(error), FakeCompletions()
+        pool = ClientPool([PoolMember("first", fake_client(first)), PoolMember("second", fake_client(second))])
+        with self.assertRaises(openai.BadRequestError):
+            pool.chat.completions.create(model="m", messages=MESSAGES)
+        self.assertEqual(second.calls, 0)
+
+    def test_raises_when_every_member_fails(self):
+        pool = ClientPool([PoolMember("a", fake_client(FailingCompletions())), PoolMember("b", fake_client(FailingCompletions()))])
+        with self.assertRaises(ConnectionError):
+            pool.chat.completions.create(model="m", messages=MESSAGES)
+
+    def test_from_config(self):
+        config = SimpleNamespace(
+            api_endpoints=[], get_api_key=lambda: "", pool_failure_threshold=3, pool_cooldown=30.0
+        )
+        self.assertIsNone(ClientPool.from_config(config))
+        config.api_endpoints = [
+            {"name": "a", "api_key": "key-a", "weight": 2},
+            {"name": "b", "api_key": "key-b", "base_url": "https://example.com/v1"}
+        ]
+        pool = ClientPool.from_config(config)
+        self.assertEqual([member.name for member in pool.members], ["a", "b"])
+        self.assertEqual(pool.members[0].weight, 2)
+
+if __name__ == '__main__':
+    unittest.main()
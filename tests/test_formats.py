@@ -0,0 +1,145 @@
+import csv
+import shutil
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.core import formats
+from src.core.translator import Translator
+from src.core.config import Config
+from src.core.task_control import TaskControl, TaskCancelled
+from tests.fakes import FakeCompletions, fake_client
+
+class TestCsvTranslation(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.test_file = self.directory / "feed.csv"
+        with open(self.test_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "title", "description"])
+            writer.writerow(["1", "Red shoes", "Comfortable shoes, for walking"])
+            writer.writerow(["2", "Blue hat", ""])
+            writer.writerow(["3", "Red shoes", "42"])
+        self.config = Config()
+        self.config.api_key = "test-key"
+        self.completions = FakeCompletions()
+        self.translator = Translator(self.config)
+        self.translator.client = fake_client(self.completions)
+        self.task_data = {
+            "file": str(self.test_file),
+            "columns": ["title", "description"],
+            "current_language": "English",
+            "target_languages": ["Spanish", "German"],
+            "comparison_mode": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _read(self, name):
+        with open(self.directory / name, newline="", encoding="utf-8-sig") as f:
+            return list(csv.reader(f))
+
+    def test_files_mode_streams_in_chunks(self):
+        # Chunks of two rows: the duplicate title in the second chunk is served from the cache
+        with mock.patch("src.core.translator.CSV_CHUNK_ROWS", 2):
+            self.translator.translate_excel(self.task_data)
+
+        rows = self._read("feed_Spanish.csv")
+        self.assertEqual(rows[0], ["id", "title", "description"])
+        self.assertEqual(rows[1], ["1", "T:Red shoes", "T:Comfortable shoes, for walking"])
+        self.assertEqual(rows[2], ["2", "T:Blue hat", ""])
+        self.assertEqual(rows[3], ["3", "T:Red shoes", "42"])
+        self.assertTrue((self.directory / "feed_German.csv").exists())
+        # Excel needs the byte order mark to read UTF-8
+        self.assertTrue((self.directory / "feed_Spanish.csv").read_bytes().startswith(b"\xef\xbb\xbf"))
+        self.assertEqual(self.completions.calls, 6)
+
+    def test_cancel_keeps_every_row(self):
+        with open(self.test_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "title", "description"])
+            for row in range(50):
+                writer.writerow([str(row), f"Title {row}", ""])
+        self.task_data["target_languages"] = ["Spanish"]
+        control = TaskControl()
+        create = self.completions.create
+
+        def cancelling_create(model, messages):
+            if self.completions.calls == 14:
+                control.cancel()
+            return create(model, messages)
+
+        self.completions.create = cancelling_create
+        with mock.patch("src.core.translator.CSV_CHUNK_ROWS", 10):
+            with self.assertRaises(TaskCancelled):
+                self.translator.translate_excel(self.task_data, control)
+
+        # Rows after the cancel are written untranslated instead of being dropped
+        rows = self._read("feed_Spanish.csv")
+        self.assertEqual(len(rows), 51)
+        self.assertEqual(rows[1], ["0", "T:Title 0", ""])
+        self.assertEqual(rows[50], ["49", "Title 49", ""])
+
+    def test_columns_mode(self):
+        self.task_data["output_mode"] = "columns"
+        self.task_data["target_languages"] = ["Spanish"]
+        self.translator.translate_excel(self.task_data)
+
+        rows = self._read("feed_translated.csv")
+        self.assertEqual(rows[0], ["id", "title", "description", "title (Spanish)", "description (Spanish)"])
+        self.assertEqual(rows[3], ["3", "Red shoes", "42", "T:Red shoes", "42"])
+
+    def test_columns_by_letter_and_dry_run(self):
+        self.task_data["columns"] = ["B"]
+        plan = self.translator.dry_run(self.task_data)
+        self.assertEqual(plan["translatable_cells"], 3)
+        self.assertEqual(plan["unique_strings"], 2)
+
+    def test_unknown_column(self):
+        self.task_data["columns"] = ["price"]
+        with self.assertRaises(ValueError):
+            self.translator.translate_excel(self.task_data)
+
+    def test_xls_output_path(self):
+        self.assertEqual(self.translator._get_output_path("/data/old.xls", "Spanish").name, "old_Spanish.xlsx")
+
+    @unittest.skipIf(formats.xlrd is not None, "xlrd is installed")
+    def test_xls_requires_xlrd(self):
+        with self.assertRaises(ValueError):
+            formats.open_workbook(self.directory / "old.xls")
+
+    def test_xls_cells_keep_their_types(self):
+        # A stand-in for xlrd with one sheet: text, a whole number, a fraction, a date, a boolean, an error
+        cell = lambda ctype, value: SimpleNamespace(ctype=ctype, value=value)
+        rows = [[cell(1, "Hello there"), cell(2, 42.0), cell(2, 2.5), cell(3, 45292.0), cell(4, 1), cell(5, 7), cell(6, "")]]
+        sheet = SimpleNamespace(name="Data", nrows=1, row=lambda index: rows[index])
+        book = SimpleNamespace(
+            nsheets=1, datemode=0, sheet_by_index=lambda index: sheet,
+            unload_sheet=lambda index: None, release_resources=lambda: None
+        )
+        fake_xlrd = SimpleNamespace(
+            open_workbook=lambda path, on_demand: book,
+            XL_CELL_EMPTY=0, XL_CELL_TEXT=1, XL_CELL_NUMBER=2, XL_CELL_DATE=3,
+            XL_CELL_BOOLEAN=4, XL_CELL_ERROR=5, XL_CELL_BLANK=6,
+            xldate_as_datetime=lambda value, datemode: datetime(1899, 12, 30) + timedelta(days=value),
+            error_text_from_code={7: "#DIV/0!"}
+        )
+        with mock.patch.object(formats, "xlrd", fake_xlrd):
+            ws = formats.open_workbook(self.directory / "old.xls")["Data"]
+
+        self.assertEqual(ws["A1"].value, "Hello there")
+        self.assertEqual(ws["B1"].value, 42)
+        self.assertIsInstance(ws["B1"].value, int)
+        self.assertEqual(ws["C1"].value, 2.5)
+        self.assertEqual(ws["D1"].value, datetime(2024, 1, 1))
+        self.assertIs(ws["E1"].value, True)
+        self.assertEqual(ws["F1"].value, "#DIV/0!")
+        self.assertFalse(self.translator._should_translate_cell(ws["F1"]))
+        self.assertIsNone(ws["G1"].value)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import json
+import shutil
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from src.core.config import Config
+from src.core.job_queue import JobQueue
+from src.core.hot_folder import HotFolderService, WatchedFolder
+from tests.fakes import FakeCompletions, fake_client
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_queue_survives_restart(self):
+        queue = JobQueue(self.directory / "jobs.sqlite3")
+        first = queue.enqueue("/in/a.xlsx", "in", "1:10")
+        self.assertIsNone(queue.enqueue("/in/a.xlsx", "in", "1:10"))
+        second = queue.enqueue("/in/a.xlsx", "in", "2:12")
+        self.assertEqual(queue.claim()['id'], first)
+        queue.close()
+
+        # The job that was running is queued again after a restart
+        queue = JobQueue(self.directory / "jobs.sqlite3")
+        self.assertEqual(queue.counts()['queued'], 2)
+        job = queue.claim()
+        self.assertEqual((job['id'], job['attempts']), (first, 2))
+        queue.finish(first, ["/in/a_Spanish.xlsx"])
+        queue.fail(queue.claim()['id'], "broken")
+        self.assertIsNone(queue.claim())
+        self.assertEqual(queue.get(first)['outputs'], ["/in/a_Spanish.xlsx"])
+        self.assertEqual(queue.get(second)['error'], "broken")
+        queue.close()
+
+class TestHotFolderService(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.inbox = self.directory / "inbox"
+        self.inbox.mkdir()
+        self.config = Config()
+        self.config.api_key = "test-key"
+        folder = WatchedFolder(self.inbox, "English", ["Spanish"], field="Retail")
+        self.queue = JobQueue(self.directory / "jobs.sqlite3")
+        self.service = HotFolderService(self.config, [folder], self.queue, workers=1, poll_interval=0.05)
+        self.service.client_pool = fake_client(FakeCompletions())
+
+    def tearDown(self):
+        self.queue.close()
+        shutil.rmtree(self.directory)
+
+    def _drop(self, name):
+        wb = Workbook()
+        ws = wb.active
+        ws["B2"] = "Hello there"
+        ws["B3"] = "Good morning"
+        wb.save(self.inbox / name)
+
+    def test_scan_waits_for_stable_files_and_skips_outputs(self):
+        self._drop("report.xlsx")
+        self._drop("report_Spanish.xlsx")
+        self.assertEqual(self.service.scan(), 0)
+        self.assertEqual(self.service.scan(), 1)
+        self.assertEqual(self.service.scan(), 0)
+        self.assertEqual(self.queue.list()[0]['path'], str((self.inbox / "report.xlsx").resolve()))
+
+    def test_process_job_with_auto_range(self):
+        self._drop("report.xlsx")
+        self.service.scan()
+        self.service.scan()
+        self.service.process(self.queue.claim())
+
+        job = self.queue.list()[0]
+        self.assertEqual(job['status'], "done")
+        output = self.inbox / "report_Spanish.xlsx"
+        self.assertEqual(job['outputs'], [str(output.resolve())])
+        self.assertTrue(load_workbook(output).active["B3"].value.startswith("T:"))
+
+    def test_status_endpoint(self):
+        self.service.status_port = 0
+        self.service.start()
+        try:
+            port = self.service.http_server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/status") as response:
+                status = json.load(response)
+            self.assertEqual(status['jobs']['queued'], 0)
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/jobs?status=done") as response:
+                self.assertEqual(json.load(response), [])
+        finally:
+            self.service.stop()
+
+if __name__ == '__main__':
+    unittest.main()
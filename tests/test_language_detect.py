@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from src.core.config import Config
+from src.core.language_detect import detect_language
+from src.core.translator import Translator
+from tests.fakes import FakeCompletions, fake_client
+
+class TestLanguageDetect(unittest.TestCase):
+    def test_detects_scripts(self):
+        self.assertEqual(detect_language("こんにちは世界"), "Japanese")
+        self.assertEqual(detect_language("안녕하세요"), "Korean")
+        self.assertEqual(detect_language("Спасибо, мы уже отправили заказ"), "Russian")
+        self.assertEqual(detect_language("شكرا على طلبك من المتجر"), "Arabic")
+
+    def test_detects_latin_languages(self):
+        self.assertEqual(detect_language("Please enter the name of the customer"), "English")
+        self.assertEqual(detect_language("El informe de ventas para el año"), "Spanish")
+        self.assertEqual(detect_language("Le rapport des ventes pour la semaine"), "French")
+        self.assertEqual(detect_language("Der Bericht ist nicht fertig und wird morgen"), "German")
+        self.assertEqual(detect_language("O relatório de vendas não está pronto"), "Portuguese")
+
+    def test_short_or_ambiguous_text_is_undecided(self):
+        self.assertIsNone(detect_language("Total"))
+        self.assertIsNone(detect_language("OK"))
+        self.assertIsNone(detect_language("Customer name"))
+
+    def test_han_only_text_is_undecided(self):
+        # Chinese, or Japanese written in kanji only
+        self.assertIsNone(detect_language("你好世界"))
+        self.assertIsNone(detect_language("会社概要"))
+
+    def test_other_languages_sharing_a_script_are_undecided(self):
+        # Ukrainian and Bulgarian are not Russian
+        self.assertIsNone(detect_language("Дякуємо за ваше замовлення"))
+        self.assertIsNone(detect_language("Здравейте, как сте"))
+        # Persian and Urdu are not Arabic
+        self.assertIsNone(detect_language("از سفارش شما متشکریم"))
+        self.assertIsNone(detect_language("آپ کے آرڈر کا شکریہ"))
+        # Too little to tell which language it is
+        self.assertIsNone(detect_language("Привет мир"))
+        self.assertIsNone(detect_language("مرحبا بالعالم"))
+
+    def test_kanji_only_cells_are_translated_into_chinese(self):
+        with tempfile.TemporaryDirectory() as directory:
+            test_file = Path(directory) / "ja.xlsx"
+            wb = Workbook()
+            ws = wb.active
+            ws.title = "Sheet1"
+            ws["A1"] = "会社概要"
+            ws["A2"] = "営業部"
+            wb.save(test_file)
+            config = Config()
+            config.api_key = "test-key"
+            translator = Translator(config)
+            translator.client = fake_client(FakeCompletions())
+            translator.translate_excel({
+                "file": str(test_file),
+                "sheet": "Sheet1",
+                "cell_range": "A1:A2",
+                "current_language": "Japanese",
+                "target_languages": ["Chinese"],
+                "comparison_mode": False,
+                "skip_target_language": True,
+                "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+            })
+            sheet = load_workbook(Path(directory) / "ja_Chinese.xlsx")["Sheet1"]
+            self.assertEqual(sheet["A1"].value, "T:会社概要")
+            self.assertEqual(sheet["A2"].value, "T:営業部")
+            self.assertEqual(translator.language_stats['skipped_target_language'], 0)
+
+    def test_skip_reason(self):
+        skip_reason = Translator._language_skip_reason
+        # Arguments: detected, current language, target language, skip target, skip others
+        self.assertEqual(skip_reason(None, "English", "Chinese", "English", True, False), "skipped_target_language")
+        self.assertIsNone(skip_reason(None, "Chinese", "Chinese", "English", True, False))
+        self.assertIsNone(skip_reason(None, None, "Chinese", "English", True, True))
+        self.assertIsNone(skip_reason(None, "French", "Chinese", "English", True, False))
+        self.assertEqual(skip_reason(None, "French", "Chinese", "English", True, True), "skipped_other_language")
@@ -0,0 +1,49 @@
+import unittest
+from src.core.config import Config
+from src.core.translator import Translator
+from src.core.masking import mask_text, unmask_text, placeholders_intact, is_fully_protected
+
+class TestMasking(unittest.TestCase):
+    def test_masks_and_restores_protected_spans(self):
+        text = "Visit https://example.com/docs or mail support@example.com, see {{user_name}} in <b>bold</b>"
+        masked = mask_text(text)
+        self.assertEqual(
+            masked.spans,
+            ["https://example.com/docs", "support@example.com", "{{user_name}}", "<b>", "</b>"]
+        )
+        self.assertNotIn("example.com", masked.text)
+        self.assertEqual(unmask_text(masked.text, masked.spans), text)
+
+    def test_paths_and_code(self):
+        masked = mask_text(r"Run `make test` and open C:\Temp\report.xlsx or /var/log/app.log")
+        self.assertEqual(masked.spans, ["`make test`", r"C:\Temp\report.xlsx", "/var/log/app.log"])
+        self.assertEqual(mask_text("input and/or output").spans, [])
+
+    def test_placeholders_intact(self):
+        self.assertTrue(placeholders_intact("Visite ⟦1⟧ o ⟦0⟧", 2))
+        self.assertFalse(placeholders_intact("Visite ⟦0⟧", 2))
+        self.assertFalse(placeholders_intact("⟦0⟧ ⟦0⟧ ⟦1⟧", 2))
+
+    def test_fully_protected(self):
+        self.assertTrue(is_fully_protected("https://example.com/path"))
+        self.assertTrue(is_fully_protected("<br/> {{name}} - jane@example.com"))
+        self.assertFalse(is_fully_protected("Contact jane@example.com"))
+        self.assertFalse(is_fully_protected("Hello world"))
+
+    def test_translator_retries_lost_placeholders(self):
+        config = Config()
+        config.api_key = "test-key"
+        config.mask_retries = 2
+        translator = Translator(config)
+        requests = []
+
+        def fake_translate(text, current_lang, target_lang, prompt_template, route=None):
+            requests.append(text)
+            if len(requests) == 1:
+                return "Visite el sitio"
+            return text.replace("Visit", "Visite")
+
+        translator._translate_text = fake_translate
+        result = translator._translate_masked("Visit https://example.com", "English", "Spanish", "{text}")
+        self.assertEqual(result, "Visite https://example.com")
+        self.assertEqual(requests, ["Visit ⟦0⟧", "Visit ⟦0⟧"])
@@ -0,0 +1,57 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from openpyxl import Workbook
+from src.core.config import Config
+from src.core.translator import Translator
+from src.core.metrics import Histogram, TaskMetrics
+from tests.fakes import FakeCompletions, fake_client
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_buckets(self):
+        histogram = Histogram((0.5, 1.0))
+        for value in (0.2, 0.7, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [(0.5, 1), (1.0, 2), (float("inf"), 3)])
+        self.assertAlmostEqual(histogram.sum, 3.9)
+
+    def test_prometheus_export(self):
+        metrics = TaskMetrics("book.xlsx")
+        metrics.observe_request("fast", 0.3, prompt_tokens=10, completion_tokens=4)
+        metrics.inc('cache_hits', 2)
+        text = metrics.to_prometheus()
+        self.assertIn('excel_translator_requests_total{task="book.xlsx"} 1', text)
+        self.assertIn('excel_translator_cache_hits_total{task="book.xlsx"} 2', text)
+        self.assertIn('excel_translator_request_latency_seconds_bucket{task="book.xlsx",route="fast",le="0.5"} 1', text)
+
+    def test_translate_excel_exports_metrics(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = Config()
+            config.api_key = "test-key"
+            config.metrics_dir = tmp
+            translator = Translator(config)
+            translator.client = fake_client(FakeCompletions())
+
+            test_file = Path(tmp) / "book.xlsx"
+            wb = Workbook()
+            wb.active.title = "Sheet1"
+            wb.active["A1"] = "Hello there"
+            wb.active["A2"] = "Hello there"
+            wb.save(test_file)
+
+            translator.translate_excel({
+                "file": str(test_file),
+                "sheet": "Sheet1",
+                "cell_range": "A1:A2",
+                "current_language": "English",
+                "target_languages": ["Spanish"],
+                "comparison_mode": False,
+                "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+            })
+
+            data = json.loads((Path(tmp) / "book.metrics.json").read_text())
+            self.assertEqual(data['counters']['requests'], 1)
+            self.assertEqual(data['counters']['cells_translated'], 2)
+            self.assertGreater(data['counters']['prompt_tokens'], 0)
+            self.assertTrue((Path(tmp) / "book.metrics.prom").exists())
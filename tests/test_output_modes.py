@@ -0,0 +1,81 @@
+import unittest
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from src.core.translator import Translator
+from src.core.config import Config
+from tests.fakes import FakeCompletions, fake_client
+
+class TestOutputModes(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.config.api_key = "test-key"
+        self.translator = Translator(self.config)
+        self.translator.client = fake_client(FakeCompletions())
+
+        self.test_file = Path("test_modes.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        ws["A1"] = "Hello there"
+        ws["B1"] = "Good morning"
+        ws["A2"] = 42
+        ws["B2"] = "Thank you"
+        ws["C1"] = "Outside range"
+        wb.save(self.test_file)
+
+        self.task_data = {
+            "file": str(self.test_file),
+            "sheet": "Sheet1",
+            "cell_range": "A1:B2",
+            "current_language": "English",
+            "target_languages": ["Spanish", "French"],
+            "comparison_mode": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+
+    def tearDown(self):
+        for file in Path(".").glob("test_modes*.xlsx"):
+            file.unlink()
+
+    def test_columns_mode(self):
+        self.task_data["output_mode"] = "columns"
+        self.translator.translate_excel(self.task_data)
+
+        self.assertFalse(Path("test_modes_Spanish.xlsx").exists())
+        sheet = load_workbook("test_modes_translated.xlsx")["Sheet1"]
+        self.assertEqual(sheet["A1"].value, "Hello there")
+        # Language blocks go after the last used column, so nothing existing moves
+        self.assertEqual(sheet["C1"].value, "Outside range")
+        self.assertEqual(sheet["D1"].value, "T:Hello there")
+        self.assertEqual(sheet["E2"].value, "T:Thank you")
+        self.assertEqual(sheet["D2"].value, 42)
+        self.assertIn("Spanish", sheet["D1"].comment.text)
+        self.assertIn("French", sheet["F1"].comment.text)
+        self.assertEqual(sheet["F1"].value, "T:Hello there")
+
+    def test_columns_mode_keeps_references_right_of_range(self):
+        wb = load_workbook(self.test_file)
+        ws = wb["Sheet1"]
+        ws["D1"] = "=C1"
+        ws.merge_cells("E1:F1")
+        wb.save(self.test_file)
+        self.task_data["output_mode"] = "columns"
+        self.translator.translate_excel(self.task_data)
+
+        sheet = load_workbook("test_modes_translated.xlsx")["Sheet1"]
+        self.assertEqual(sheet["C1"].value, "Outside range")
+        self.assertEqual(sheet["D1"].value, "=C1")
+        self.assertEqual([str(merged) for merged in sheet.merged_cells.ranges], ["E1:F1"])
+        self.assertEqual(sheet["G1"].value, "T:Hello there")
+        self.assertEqual(sheet["I1"].value, "T:Hello there")
+
+    def test_sheets_mode_with_comparison(self):
+        self.task_data["output_mode"] = "sheets"
+        self.task_data["comparison_mode"] = True
+        self.translator.translate_excel(self.task_data)
+
+        wb = load_workbook("test_modes_translated.xlsx")
+        self.assertEqual(wb.sheetnames, ["Sheet1", "Sheet1 (Spanish)", "Sheet1 (French)"])
+        self.assertEqual(wb["Sheet1"]["B1"].value, "Good morning")
+        self.assertEqual(wb["Sheet1 (French)"]["B1"].value, "Good morning\n\nT:Good morning")
+        self.assertEqual(wb["Sheet1 (Spanish)"]["C1"].value, "Outside range")
@@ -0,0 +1,80 @@
+import unittest
+from pathlib import Path
+from openpyxl import Workbook
+from src.core.translator import Translator
+from src.core.config import Config
+from src.core.tokens import count_tokens
+from src.core.task_control import TaskControl, TaskCancelled
+from tests.fakes import FakeCompletions, fake_client
+
+class TestDryRun(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.config.api_key = ""
+        self.translator = Translator(self.config)
+
+        self.test_file = Path("test_plan.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        ws["A1"] = "Hello there"
+        ws["A2"] = "Hello there"
+        ws["A3"] = "Good morning"
+        ws["A4"] = 42
+        ws["A5"] = "Das ist ein sehr schönes Haus und wir wohnen gern hier"
+        wb.save(self.test_file)
+
+        self.task_data = {
+            "file": str(self.test_file),
+            "sheet": "Sheet1",
+            "cell_range": "A1:A5",
+            "current_language": "English",
+            "target_languages": ["Spanish", "German"],
+            "skip_target_language": True,
+            "skip_other_languages": True,
+            "comparison_mode": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+
+    def tearDown(self):
+        for file in Path(".").glob("test_plan*.xlsx"):
+            file.unlink()
+
+    def test_plan_counts_without_api_key(self):
+        self.assertIsNone(self.translator.client)
+        plan = self.translator.dry_run(self.task_data)
+
+        self.assertEqual(plan["translatable_cells"], 4)
+        self.assertEqual(plan["unique_strings"], 3)
+        # The German cell is skipped for both target languages
+        self.assertEqual(plan["cells_skipped_by_language"], 2)
+        self.assertEqual(plan["requests"], 4)
+        self.assertGreater(plan["prompt_tokens"], 0)
+        self.assertGreater(plan["cost"], 0)
+        self.assertGreater(plan["duration_seconds"], 0)
+        self.assertFalse(list(Path(".").glob("test_plan_*.xlsx")))
+
+    def test_cancelled_plan_stops_scanning(self):
+        control = TaskControl()
+        control.cancel()
+        with self.assertRaises(TaskCancelled):
+            self.translator.dry_run(self.task_data, control)
+
+    def test_plan_counts_cache_hits_after_run(self):
+        self.config.api_key = "test-key"
+        self.translator.client = fake_client(FakeCompletions())
+        self.translator.translate_excel(dict(self.task_data, target_languages=["Spanish"]))
+        hits = self.translator.cache.hits
+
+        plan = self.translator.dry_run(self.task_data)
+        self.assertEqual(plan["cache_hits"], 2)
+        self.assertEqual(plan["requests"], 2)
+        # Planning does not count as cache usage
+        self.assertEqual(self.translator.cache.hits, hits)
+
+    def test_token_estimate(self):
+        self.assertGreater(count_tokens("Hello there, how are you?"), 0)
+        self.assertGreaterEqual(count_tokens("你好世界"), 2)
+
+if __name__ == '__main__':
+    unittest.main()
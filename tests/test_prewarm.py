@@ -0,0 +1,106 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from openpyxl import Workbook
+from src.core.config import Config
+from src.core.translator import Translator
+from src.core.cache import TranslationCache
+from src.core.routing import ModelRouter
+from src.core.task_control import RequestSlots, RateLimiter
+from src.core.prewarm import CachePrewarmer
+from tests.fakes import FakeCompletions, fake_client
+
+class TestCachePrewarmer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = Config()
+        self.config.api_key = "test-key"
+        self.slots = RequestSlots(2)
+        self.router = ModelRouter.from_config(self.config)
+        self.cache = TranslationCache()
+        self.completions = FakeCompletions()
+
+        test_file = Path(self.tmp.name) / "queued.xlsx"
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        for row, text in enumerate(["Hello there", "Good morning", "Hello there", "Thank you"], start=1):
+            ws[f"A{row}"] = text
+        wb.save(test_file)
+        self.task_data = {
+            "file": str(test_file),
+            "sheet": "Sheet1",
+            "cell_range": "A1:A4",
+            "current_language": "English",
+            "target_languages": ["Spanish", "German"],
+            "comparison_mode": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _translator(self):
+        translator = Translator(self.config, self.slots, self.router, self.cache)
+        translator.client = fake_client(self.completions)
+        return translator
+
+    def _prewarmer(self, is_busy=None):
+        prewarmer = CachePrewarmer(self._translator, self.slots, is_busy, idle_poll=0.01)
+        prewarmer.start()
+        self.addCleanup(prewarmer.stop, 1.0)
+        return prewarmer
+
+    def _wait_until(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_queued_task_runs_from_cache_after_prewarm(self):
+        prewarmer = self._prewarmer()
+        prewarmer.add("task", self.task_data)
+        self._wait_until(lambda: prewarmer.translated == 6)
+        # Three distinct strings into two languages
+        self.assertEqual(prewarmer.translated, 6)
+        self.assertEqual(self.completions.calls, 6)
+
+        self.task_data["output_mode"] = "files"
+        self._translator().translate_excel(self.task_data)
+        self.assertEqual(self.completions.calls, 6)
+
+    def test_yields_while_tasks_run(self):
+        busy = [True]
+        prewarmer = self._prewarmer(lambda: busy[0])
+        prewarmer.add("task", self.task_data)
+        time.sleep(0.2)
+        self.assertEqual(self.completions.calls, 0)
+
+        busy[0] = False
+        self._wait_until(lambda: prewarmer.translated == 6)
+        self.assertEqual(self.completions.calls, 6)
+
+    def test_never_waits_for_a_request_slot(self):
+        prewarmer = self._prewarmer()
+        with self.slots.acquire(), self.slots.acquire():
+            prewarmer.add("task", self.task_data)
+            time.sleep(0.2)
+            self.assertEqual(self.completions.calls, 0)
+        self._wait_until(lambda: prewarmer.translated == 6)
+        self.assertEqual(self.completions.calls, 6)
+
+    def test_discarded_task_is_dropped(self):
+        prewarmer = self._prewarmer(lambda: True)
+        prewarmer.add("task", self.task_data)
+        self._wait_until(lambda: prewarmer.pending() == 1 and prewarmer._current is not None)
+        prewarmer.discard("task")
+        self.assertEqual(prewarmer.pending(), 0)
+        self.assertEqual(self.completions.calls, 0)
+
+    def test_rate_limiter_try_acquire_does_not_wait(self):
+        limiter = RateLimiter(60)
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+
+if __name__ == '__main__':
+    unittest.main()
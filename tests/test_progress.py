@@ -0,0 +1,27 @@
+import unittest
+from src.core.metrics import TaskMetrics
+from src.core.progress import ProgressReporter
+
+class TestProgressReporter(unittest.TestCase):
+    def test_updates_are_throttled(self):
+        progress = []
+        reporter = ProgressReporter(1000, TaskMetrics(), progress.append, interval=60)
+        for _ in range(1000):
+            reporter.advance()
+        reporter.finish()
+        # One update for the first unit, then only the final one
+        self.assertEqual(progress, [0, 100])
+
+    def test_stats_snapshot(self):
+        metrics = TaskMetrics()
+        metrics.inc('cache_hits', 3)
+        metrics.inc('cache_misses', 1)
+        snapshots = []
+        reporter = ProgressReporter(10, metrics, lambda percent: None, snapshots.append, interval=0)
+        reporter.advance(5)
+        stats = snapshots[-1]
+        self.assertEqual(stats['progress'], 50)
+        self.assertEqual((stats['done'], stats['total']), (5, 10))
+        self.assertEqual(stats['cache_hit_ratio'], 0.75)
+        self.assertGreater(stats['cells_per_second'], 0)
+        self.assertIsNotNone(stats['eta_seconds'])
@@ -0,0 +1,68 @@
+import unittest
+from types import SimpleNamespace
+from src.core.config import Config
+from src.core.prompts import compile_prompt
+from src.core.routing import ModelRoute
+from src.core.translator import Translator
+from tests.fakes import FakeCompletions, fake_client
+
+class CachingCompletions(FakeCompletions):
+    """Reports part of every prompt as served from the provider's prompt cache."""
+    def __init__(self):
+        super().__init__()
+        self.prefixes = set()
+
+    def create(self, model, messages):
+        response = super().create(model, messages)
+        self.prefixes.add(messages[0]["content"])
+        response.usage = SimpleNamespace(
+            prompt_tokens=100, completion_tokens=5, prompt_tokens_details=SimpleNamespace(cached_tokens=80)
+        )
+        return response
+
+class TestPromptLayout(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.config.api_key = "test-key"
+
+    def test_static_prefix_and_text_payload(self):
+        layout = compile_prompt(
+            self.config, self.config.get_default_prompt(), "English", "Spanish",
+            field="Medical", glossary={"stent": "stent"}
+        )
+        first, second = layout.messages("Hello there"), layout.messages("Good morning")
+        self.assertIs(first[0], second[0])
+        self.assertEqual(first[1], {"role": "user", "content": "Hello there"})
+        prefix = first[0]["content"]
+        self.assertIn("from English to Spanish", prefix)
+        self.assertIn("Medical", prefix)
+        self.assertIn("- stent → stent", prefix)
+        self.assertNotIn("{text}", prefix)
+
+    def test_custom_template_fallback(self):
+        layout = compile_prompt(self.config, "Translate {source} please:\n{text}", "English", "German")
+        self.assertIn("from English to German", layout.system_message)
+
+    def test_cached_tokens_are_reported_per_task(self):
+        translator = Translator(self.config)
+        completions = CachingCompletions()
+        translator.client = fake_client(completions)
+        translator.task_data = {"field": ""}
+        translator._prompts = {}
+        template = self.config.get_default_prompt()
+        for text in ("Hello there", "Good morning", "Thank you"):
+            translator._translate_text(text, "English", "Spanish", template)
+
+        self.assertEqual(len(completions.prefixes), 1)
+        self.assertEqual(translator.metrics.counters["cached_prompt_tokens"], 240)
+        summary = translator.route_stats["fast"].summary()
+        self.assertEqual(summary["cached_prompt_tokens"], 240)
+        self.assertAlmostEqual(summary["cached_prompt_ratio"], 0.8)
+
+    def test_cached_tokens_are_discounted(self):
+        route = ModelRoute("strong", "gpt-4o", prompt_price=0.002, completion_price=0.0, cached_prompt_price=0.001)
+        self.assertAlmostEqual(route.cost(1000, 0), 0.002)
+        self.assertAlmostEqual(route.cost(1000, 0, cached_prompt_tokens=1000), 0.001)
+
+if __name__ == '__main__':
+    unittest.main()
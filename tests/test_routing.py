@@ -0,0 +1,151 @@
+import threading
+import time
+import unittest
+from pathlib import Path
+from openpyxl import Workbook
+from src.core.config import Config
+from src.core.translator import Translator
+from src.core.routing import ModelRouter, ModelRoute
+from src.core.cache import TranslationCache
+from src.core.task_control import RequestSlots, TaskControl
+from tests.fakes import FakeCompletions, fake_client
+
+class TestRouting(unittest.TestCase):
+    def setUp(self):
+        self.router = ModelRouter(
+            [ModelRoute("fast", "small-model", max_chars=20), ModelRoute("strong", "large-model", prompt_price=1.0)],
+            high_risk_fields=["Legal"]
+        )
+
+    def test_routes_by_length_and_field(self):
+        self.assertEqual(self.router.route("Short label").name, "fast")
+        self.assertEqual(self.router.route("A considerably longer sentence to translate").name, "strong")
+        self.assertEqual(self.router.route("two\nlines").name, "strong")
+        self.assertEqual(self.router.route("Short label", field="legal").name, "strong")
+
+    def test_cache_key_includes_model(self):
+        key_a = TranslationCache.make_key("small-model", "English", "Spanish", "", "{text}", "Hello")
+        key_b = TranslationCache.make_key("large-model", "English", "Spanish", "", "{text}", "Hello")
+        self.assertNotEqual(key_a, key_b)
+
+    def test_translate_excel_routes_dedups_and_caches(self):
+        config = Config()
+        config.api_key = "test-key"
+        completions = FakeCompletions()
+        translator = Translator(config, router=self.router)
+        translator.client = fake_client(completions)
+
+        test_file = Path("test_routing.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        ws["A1"] = "Short label"
+        ws["A2"] = "Short label"
+        ws["A3"] = "A considerably longer sentence to translate"
+        wb.save(test_file)
+        task_data = {
+            "file": str(test_file),
+            "sheet": "Sheet1",
+            "cell_range": "A1:A3",
+            "current_language": "English",
+            "target_languages": ["Spanish"],
+            "comparison_mode": False,
+            "skip_target_language": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+        try:
+            translator.translate_excel(task_data)
+            self.assertEqual(sorted(completions.models), ["large-model", "small-model"])
+            self.assertEqual(translator.route_stats["fast"].requests, 1)
+            self.assertGreater(translator.route_stats["strong"].cost, 0)
+
+            # A second run is served entirely from the cache
+            translator.translate_excel(task_data)
+            self.assertEqual(completions.calls, 2)
+        finally:
+            for file in Path(".").glob("test_routing*.xlsx"):
+                file.unlink()
+
+    def test_throttled_route_does_not_hold_shared_slots(self):
+        config = Config()
+        config.api_key = "test-key"
+        router = ModelRouter([
+            ModelRoute("fast", "small-model", max_chars=20),
+            ModelRoute("slow", "large-model", requests_per_minute=120)
+        ])
+        completions = FakeCompletions()
+        finished = {}
+        create = completions.create
+
+        def timed_create(model, messages):
+            response = create(model, messages)
+            finished.setdefault(model, []).append(time.monotonic())
+            return response
+
+        completions.create = timed_create
+        translator = Translator(config, request_slots=RequestSlots(1), router=router)
+        translator.client = fake_client(completions)
+
+        test_file = Path("test_routing_throttled.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        for row in range(1, 4):
+            ws[f"A{row}"] = f"A considerably longer sentence number {row}"
+            ws[f"B{row}"] = f"Label {row}"
+        wb.save(test_file)
+        try:
+            start = time.monotonic()
+            translator.translate_excel({
+                "file": str(test_file),
+                "sheet": "Sheet1",
+                "cell_range": "A1:B3",
+                "current_language": "English",
+                "target_languages": ["Spanish"],
+                "comparison_mode": False,
+                "skip_target_language": False,
+                "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+            })
+            # The slow route spaces its three requests 0.5s apart; the fast
+            # route's requests go out in between instead of waiting behind them
+            self.assertGreaterEqual(max(finished["large-model"]) - start, 0.9)
+            self.assertLess(max(finished["small-model"]) - start, 0.4)
+        finally:
+            for file in Path(".").glob("test_routing*.xlsx"):
+                file.unlink()
+
+    def test_paused_task_gives_route_slots_to_other_tasks(self):
+        route = ModelRoute("fast", "small-model", max_concurrency=2)
+        shared = RequestSlots(1)
+        paused = TaskControl()
+        sent = []
+
+        def paused_task_request():
+            with route.acquire(paused, shared):
+                sent.append(True)
+
+        workers = [threading.Thread(target=paused_task_request, daemon=True) for _ in range(2)]
+        try:
+            with shared.acquire():
+                # The paused task's requests wait for the busy shared slot
+                for worker in workers:
+                    worker.start()
+                time.sleep(0.2)
+                paused.pause()
+                time.sleep(0.3)
+
+                # Another task still gets every slot of the route
+                with route.slots.acquire_spare(1.0) as first, route.slots.acquire_spare(1.0) as second:
+                    self.assertTrue(first and second)
+            time.sleep(0.3)
+            self.assertEqual(sent, [])
+
+            paused.resume()
+            for worker in workers:
+                worker.join(2.0)
+            self.assertEqual(len(sent), 2)
+        finally:
+            paused.cancel()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import unittest
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+from src.core.translator import Translator
+from src.core.config import Config
+from src.core.task_control import TaskControl
+from src.core.shared_memory import SharedMemoryServer, SharedMemoryClient, SharedTranslationCache
+from tests.fakes import FakeCompletions, fake_client
+
+class TestSharedTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.server = SharedMemoryServer(port=0)
+        self.server.start()
+        self.config = Config()
+        self.config.api_key = "test-key"
+        self.task_data = {
+            "file": "unused.xlsx",
+            "current_language": "English",
+            "target_languages": ["Spanish"],
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _translator(self, cache, completions):
+        translator = Translator(self.config, cache=cache)
+        translator.client = fake_client(completions)
+        translator.task_data = self.task_data
+        return translator
+
+    def _translate(self, translator, texts):
+        results = {}
+        cells = [SimpleNamespace(value=text, coordinate="A1") for text in texts]
+        translator._translate_cells(
+            cells, "English", "Spanish", self.task_data["prompt"], TaskControl(),
+            lambda cell, text, translation: results.__setitem__(text, translation)
+        )
+        return results
+
+    def test_translation_is_shared_between_machines(self):
+        first = SharedTranslationCache(SharedMemoryClient(self.server.url), batch_size=2)
+        first_completions = FakeCompletions()
+        self._translate(self._translator(first, first_completions), ["Hello there", "Good morning", "Thank you"])
+        self.assertEqual(first_completions.calls, 3)
+        self.assertEqual(self.server.size(), 3)
+
+        # Another analyst gets every string from the shared tier in one batched lookup
+        second = SharedTranslationCache(SharedMemoryClient(self.server.url))
+        second_completions = FakeCompletions()
+        results = self._translate(self._translator(second, second_completions), ["Hello there", "Thank you"])
+        self.assertEqual(second_completions.calls, 0)
+        self.assertEqual(second.remote_hits, 2)
+        self.assertEqual(results["Thank you"], "T:Thank you")
+
+    def test_unreachable_service_falls_back(self):
+        cache = SharedTranslationCache(SharedMemoryClient("http://127.0.0.1:9", timeout=0.5), batch_size=1)
+        completions = FakeCompletions()
+        results = self._translate(self._translator(cache, completions), ["Hello there"])
+        self.assertEqual(results["Hello there"], "T:Hello there")
+        self.assertFalse(cache.client.available)
+        # Undelivered writes wait for the service to come back
+        self.assertEqual(len(cache._pending), 1)
+        cache.client = SharedMemoryClient(self.server.url)
+        cache.flush()
+        self.assertEqual(self.server.size(), 1)
+
+class TestSharedMemoryServerAccess(unittest.TestCase):
+    def setUp(self):
+        self.server = SharedMemoryServer(port=0, token="team-secret", max_request_bytes=1024)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_token_is_required(self):
+        self.assertFalse(SharedMemoryClient(self.server.url).store({'key': "forged"}))
+        self.assertEqual(self.server.size(), 0)
+
+        client = SharedMemoryClient(self.server.url, token="team-secret")
+        self.assertTrue(client.store({'key': "value"}))
+        self.assertEqual(client.lookup(['key']), {'key': "value"})
+
+    def test_large_requests_are_refused(self):
+        body = json.dumps({'entries': {'key': "x" * 2048}}).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.server.url}/store", data=body, method="POST",
+            headers={"Content-Type": "application/json", "Authorization": "Bearer team-secret"}
+        )
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(request, timeout=2)
+        self.assertEqual(raised.exception.code, 413)
+        self.assertEqual(self.server.size(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import unittest
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from src.core.translator import Translator
+from src.core.config import Config
+from src.core.task_control import TaskControl, TaskCancelled, RequestSlots
+from tests.fakes import FakeCompletions, fake_client
+
+class TestTaskControl(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.config.api_key = "test-key"
+        self.config.max_concurrent_requests = 2
+        self.config.cancel_deadline = 5
+        self.translator = Translator(self.config)
+        self.completions = FakeCompletions(delay=0.02)
+        self.translator.client = fake_client(self.completions)
+
+        self.test_file = Path("test_control.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        for row in range(1, 41):
+            ws.cell(row=row, column=1, value=f"Row text {row}")
+        wb.save(self.test_file)
+
+        self.task_data = {
+            "file": str(self.test_file),
+            "sheet": "Sheet1",
+            "cell_range": "A1:A40",
+            "current_language": "English",
+            "target_languages": ["Spanish"],
+            "comparison_mode": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+
+    def tearDown(self):
+        for file in Path(".").glob("test_control*.xlsx"):
+            file.unlink()
+
+    def test_cancel_saves_partial_output(self):
+        control = TaskControl()
+        self.translator.progress_updated.connect(lambda value: value >= 20 and control.cancel())
+
+        with self.assertRaises(TaskCancelled):
+            self.translator.translate_excel(self.task_data, control)
+
+        self.assertLess(self.completions.calls, 40)
+        sheet = load_workbook("test_control_Spanish.xlsx")["Sheet1"]
+        values = [sheet.cell(row=row, column=1).value for row in range(1, 41)]
+        translated = [value for value in values if value.startswith("T:")]
+        self.assertTrue(translated)
+        self.assertLess(len(translated), 40)
+
+    def test_paused_task_does_not_hold_slots(self):
+        slots = RequestSlots(1)
+        paused = TaskControl()
+        paused.pause()
+        acquired = threading.Event()
+
+        def paused_worker():
+            try:
+                with slots.acquire(paused):
+                    acquired.set()
+            except TaskCancelled:
+                pass
+
+        worker = threading.Thread(target=paused_worker)
+        worker.start()
+        with slots.acquire(TaskControl()):
+            self.assertFalse(acquired.is_set())
+        paused.cancel()
+        worker.join(timeout=2)
+        self.assertFalse(worker.is_alive())
@@ -0,0 +1,55 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from openpyxl import Workbook
+from src.core.config import Config
+from src.core.translator import Translator
+from src.core.tracing import NULL_TRACER
+from tests.fakes import FakeCompletions, fake_client
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.config.api_key = "test-key"
+        self.config.trace_dir = ""
+        self.config.profile_tasks = False
+        self.translator = Translator(self.config)
+        self.translator.client = fake_client(FakeCompletions())
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.test_file = Path(self.tmp.name) / "book.xlsx"
+        wb = Workbook()
+        wb.active.title = "Sheet1"
+        wb.active["A1"] = "Hello there"
+        wb.active["A2"] = "Good morning"
+        wb.save(self.test_file)
+        self.task_data = {
+            "file": str(self.test_file),
+            "sheet": "Sheet1",
+            "cell_range": "A1:A2",
+            "current_language": "English",
+            "target_languages": ["Spanish"],
+            "comparison_mode": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_tracing_disabled_by_default(self):
+        self.translator.translate_excel(self.task_data)
+        self.assertIs(self.translator.tracer, NULL_TRACER)
+        self.assertFalse((Path(self.tmp.name) / "book.trace.json").exists())
+
+    def test_trace_and_profile_export(self):
+        self.task_data["trace"] = True
+        self.task_data["profile"] = True
+        self.translator.translate_excel(self.task_data)
+
+        trace = json.loads((Path(self.tmp.name) / "book.trace.json").read_text())
+        names = {event["name"] for event in trace["traceEvents"] if event["ph"] == "X"}
+        for expected in ("translate_excel", "load_workbook", "scan_cells", "translate_cells",
+                         "save_workbook", "queue_wait", "slot_wait", "api_request"):
+            self.assertIn(expected, names)
+        self.assertTrue((Path(self.tmp.name) / "book.prof").exists())
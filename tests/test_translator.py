@@ -3,11 +3,20 @@ from pathlib import Path
 import pandas as pd
 from src.core.translator import Translator
 from src.core.config import Config
+from src.core.cassette import MODE_REPLAY
+from src.core.routing import ModelRouter, ModelRoute
+
+# Recorded API traffic of these tests, so they run offline and give the same answers every time
+CASSETTE = Path(__file__).parent / "cassettes" / "translator.jsonl"
 
 class TestTranslator(unittest.TestCase):
     def setUp(self):
         self.config = Config()
-        self.translator = Translator(self.config)
+        self.config.cassette_mode = MODE_REPLAY
+        self.config.cassette_path = str(CASSETTE)
+        self.config.cassette_latency_scale = 0.0
+        # A fixed route, so the recorded requests match whatever MODEL_ROUTES is configured locally
+        self.translator = Translator(self.config, router=ModelRouter([ModelRoute("default", "gpt-3.5-turbo")]))
         
         # Create a test Excel file
         self.test_file = Path("test.xlsx")
@@ -41,10 +50,12 @@ class TestTranslator(unittest.TestCase):
         output_file = Path("test_Spanish.xlsx")
         self.assertTrue(output_file.exists())
         
-        # Check if the file can be read and has the correct number of rows
+        # The whole sheet is kept; only the cells in the range (header and first row) are translated
         df = pd.read_excel(output_file)
-        self.assertEqual(len(df), 2)  # Should only have 2 rows due to cell range
-        self.assertEqual(len(df.columns), 2)
+        self.assertEqual(list(df.columns), ["Columna1", "Columna2"])
+        self.assertEqual(len(df), 4)
+        self.assertEqual(list(df.iloc[0]), ["Hola", "Prueba"])
+        self.assertEqual(list(df.iloc[1]), ["World", "Data"])
     
     def test_invalid_cell_range(self):
         task_data = {
@@ -57,12 +68,7 @@ class TestTranslator(unittest.TestCase):
             "prompt": "You are a professional translator. Translate the following text from {current_lang} to {target_lang}. Maintain the original meaning and tone."
         }
         
-        # Should not raise an exception
-        self.translator.translate_excel(task_data)
-        
-        # Check if output file was created with all rows
-        output_file = Path("test_Spanish.xlsx")
-        self.assertTrue(output_file.exists())
-        
-        df = pd.read_excel(output_file)
-        self.assertEqual(len(df), 4)  # Should have all rows due to invalid range 
\ No newline at end of file
+        # An invalid range is rejected before anything is translated or written
+        with self.assertRaises(ValueError):
+            self.translator.translate_excel(task_data)
+        self.assertFalse(Path("test_Spanish.xlsx").exists())
@@ -0,0 +1,102 @@
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from src.core.config import Config
+from src.core.translator import Translator
+from src.core.work_items import WorkItems
+from tests.fakes import FakeCompletions, fake_client
+
+ROWS = 2000
+COLUMNS = 4
+
+class TestWorkItems(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.test_file = Path(cls.tmp.name) / "large.xlsx"
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        for row in range(1, ROWS + 1):
+            ws.append([f"Product name {row % 500}", f"Description line {row % 700}", row, f"Status {row % 3}"])
+        wb.save(cls.test_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        config = Config()
+        config.api_key = "test-key"
+        self.translator = Translator(config)
+        self.completions = FakeCompletions()
+        self.translator.client = fake_client(self.completions)
+
+    def test_store_deduplicates_strings(self):
+        items = WorkItems()
+        items.add(1, 1, "Hello")
+        items.add(2, 1, "World")
+        items.add(3, 2, "Hello")
+        self.assertEqual(len(items), 3)
+        self.assertEqual(items.texts, ["Hello", "World"])
+        self.assertEqual(list(items.cell_counts), [2, 1])
+        self.assertEqual(list(items), [(1, 1, 0), (2, 1, 1), (3, 2, 0)])
+        self.assertEqual(items.new_results(), [None, None])
+
+    def test_translate_excel_writes_every_cell_of_a_string(self):
+        self.translator.translate_excel({
+            "file": str(self.test_file),
+            "sheet": "Sheet1",
+            "cell_range": "A1:D20",
+            "current_language": "English",
+            "target_languages": ["Spanish"],
+            "comparison_mode": False,
+            "skip_target_language": False,
+            "prompt": "Translate from {current_lang} to {target_lang}:\n{text}"
+        })
+        sheet = load_workbook(Path(self.tmp.name) / "large_Spanish.xlsx")["Sheet1"]
+        self.assertEqual(sheet["A1"].value, "T:Product name 1")
+        self.assertEqual(sheet["D1"].value, sheet["D4"].value)
+        self.assertEqual(sheet["C1"].value, 1)
+        # Names and descriptions are distinct within 20 rows; there are only three statuses
+        self.assertEqual(self.completions.calls, 20 + 20 + 3)
+
+    def _peak_memory(self, scan):
+        tracemalloc.start()
+        try:
+            kept = scan()
+            _, peak = tracemalloc.get_traced_memory()
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del kept
+        return current, peak
+
+    def test_memory_against_cell_list(self):
+        cell_range = f"A1:D{ROWS}"
+
+        def cell_list():
+            # What the scan used to keep: the loaded workbook and a list of its cells
+            sheet = load_workbook(self.test_file)["Sheet1"]
+            return [
+                cell for cell in self.translator._iter_range(sheet, cell_range)
+                if self.translator._should_translate_cell(cell)
+            ]
+
+        def work_items():
+            wb = load_workbook(self.test_file, read_only=True)
+            try:
+                return self.translator._scan_work_items(wb["Sheet1"], cell_range)
+            finally:
+                wb.close()
+
+        cells_kept, cells_peak = self._peak_memory(cell_list)
+        items_kept, items_peak = self._peak_memory(work_items)
+        # The store keeps a small fraction of what the cells pin, and the scan peaks lower too
+        self.assertLess(items_kept * 5, cells_kept)
+        self.assertLess(items_peak * 2, cells_peak)
+
+if __name__ == '__main__':
+    unittest.main()
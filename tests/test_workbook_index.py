@@ -0,0 +1,51 @@
+import os
+import unittest
+from pathlib import Path
+from openpyxl import Workbook
+from src.core.workbook_index import WorkbookIndex, read_workbook_metadata, read_sheet_names
+
+class TestWorkbookIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_file = Path("test_index.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Texts"
+        ws["B2"] = "Hello"
+        ws["C5"] = "World"
+        ws["D1"] = 42
+        empty = wb.create_sheet("Empty")
+        empty["A1"] = 1.5
+        wb.save(self.test_file)
+
+    def tearDown(self):
+        self.test_file.unlink()
+
+    def test_reads_sheet_metadata(self):
+        texts, empty = read_workbook_metadata(self.test_file)
+        self.assertEqual(texts.name, "Texts")
+        self.assertEqual(texts.dimension, "B1:D5")
+        self.assertEqual(texts.text_cells, 2)
+        self.assertEqual(texts.text_range, "B2:C5")
+        self.assertEqual(empty.name, "Empty")
+        self.assertEqual(empty.text_cells, 0)
+        self.assertIsNone(empty.text_range)
+
+    def test_reads_sheet_names_only(self):
+        self.assertEqual(read_sheet_names(self.test_file), ["Texts", "Empty"])
+
+    def test_cache_is_keyed_by_mtime_and_size(self):
+        index = WorkbookIndex()
+        self.assertIsNone(index.peek(self.test_file))
+        sheets = index.get(self.test_file)
+        self.assertIs(index.get(self.test_file), sheets)
+
+        wb = Workbook()
+        wb.active.title = "Changed"
+        wb.save(self.test_file)
+        stat = os.stat(self.test_file)
+        os.utime(self.test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNone(index.peek(self.test_file))
+        self.assertEqual([info.name for info in index.get(self.test_file)], ["Changed"])
+
+if __name__ == '__main__':
+    unittest.main()
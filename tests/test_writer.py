@@ -0,0 +1,115 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+from openpyxl import Workbook, load_workbook
+from src.core import formats
+from src.core.config import Config
+from src.core.translator import Translator
+from src.core.writer import BackgroundWriter, OutputWriteError
+from tests.fakes import FakeCompletions, fake_client
+
+class TestBackgroundWriter(unittest.TestCase):
+    def test_writes_overlap_with_caller(self):
+        release = threading.Event()
+        written = []
+
+        def slow_save(path):
+            release.wait(2)
+            written.append(path)
+
+        writer = BackgroundWriter(max_pending=2)
+        start = time.monotonic()
+        writer.submit(slow_save, "a.xlsx")
+        writer.submit(slow_save, "b.xlsx")
+        # Both writes are buffered without waiting for the first one
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(written, [])
+        release.set()
+        writer.close()
+        self.assertEqual(written, ["a.xlsx", "b.xlsx"])
+
+    def test_buffer_is_bounded(self):
+        release = threading.Event()
+        writer = BackgroundWriter(max_pending=1)
+        writer.submit(lambda path: release.wait(2), "a.xlsx")
+        blocked = threading.Thread(target=writer.submit, args=(lambda path: None, "b.xlsx"))
+        blocked.start()
+        blocked.join(0.2)
+        self.assertTrue(blocked.is_alive())
+        release.set()
+        blocked.join(2)
+        self.assertFalse(blocked.is_alive())
+        writer.close()
+
+    def test_error_is_propagated(self):
+        errors = []
+        skipped = []
+
+        def failing_save(path):
+            raise OSError("disk full")
+
+        writer = BackgroundWriter(max_pending=2, on_error=errors.append)
+        writer.submit(failing_save, "a.xlsx")
+        writer.submit(skipped.append, "b.xlsx")
+        with self.assertRaises(OutputWriteError) as context:
+            writer.close()
+        self.assertIn("disk full", str(context.exception))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(skipped, [])
+        with self.assertRaises(OutputWriteError):
+            writer.submit(skipped.append, "c.xlsx")
+
+class TestBackgroundLanguageFiles(unittest.TestCase):
+    def test_language_copies_load_while_next_language_translates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            test_file = Path(directory) / "slow.xlsx"
+            wb = Workbook()
+            ws = wb.active
+            ws.title = "Sheet1"
+            ws["A1"] = "Hello there"
+            wb.save(test_file)
+
+            config = Config()
+            config.api_key = "test-key"
+            completions = FakeCompletions()
+            translator = Translator(config)
+            translator.client = fake_client(completions)
+            events = []
+
+            def slow_open_workbook(file_path, read_only=False):
+                if read_only:
+                    return formats.open_workbook(file_path, read_only)
+                # Loading a language's copy of a large workbook
+                time.sleep(0.3)
+                events.append(("loaded", threading.current_thread() is threading.main_thread()))
+                return formats.open_workbook(file_path)
+
+            create = completions.create
+
+            def recording_create(model, messages):
+                events.append(("request", "German" if "German" in str(messages) else "Spanish"))
+                return create(model, messages)
+
+            completions.create = recording_create
+            with mock.patch("src.core.translator.open_workbook", slow_open_workbook):
+                translator.translate_excel({
+                    "file": str(test_file),
+                    "sheet": "Sheet1",
+                    "cell_range": "A1:A1",
+                    "current_language": "English",
+                    "target_languages": ["Spanish", "German"],
+                    "comparison_mode": False,
+                    "skip_target_language": False,
+                    "prompt": "Translate to {target_lang}:\n{text}"
+                })
+
+            # Both copies load on the writer thread, and German is requested before Spanish's copy is ready
+            self.assertEqual(events[:2], [("request", "Spanish"), ("request", "German")])
+            self.assertEqual(events[2:], [("loaded", False), ("loaded", False)])
+            self.assertEqual(load_workbook(Path(directory) / "slow_German.xlsx")["Sheet1"]["A1"].value, "T:Hello there")
+
+if __name__ == '__main__':
+    unittest.main()